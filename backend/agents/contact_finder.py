@@ -4,9 +4,36 @@ Multi-user compatible Agentic CRM Contact Finder
 -------------------------------------------------
 - Runs under users/<user_id>/ directory
 - Logs to users/<user_id>/logs/contact_finder.log
-- Uses up to 3 Verifalia accounts sequentially
+- Uses up to 3 Verifalia accounts: sequentially in the sync verifier; the
+  async engine spreads jobs over all of them in parallel, tracking credits
+  and rate limits per account (utils/verifalia_accounts.py). A job or
+  address rejected for limits is retried on another account, not dropped
 - Keeps full core logic unchanged
 - Adds MongoDB persistence (collection: contact_finder)
+- Batch mode: candidates from many companies go out as multi-entry
+  validation jobs in rounds (batch_wave candidates per company per round);
+  a company stops at its first deliverable address, as in the serial mode
+- Async engine (utils/verifalia_async.py, needs httpx): each round's jobs run
+  concurrently with server-side long-poll; VERIFALIA_API_BASE can point at
+  the local stand-in (utils/verifalia_stub_server.py)
+- Verification cache (backend/cache/verification_cache.json, shared across
+  tenants): addresses verified within their class TTL are not re-verified;
+  hits and credits saved are logged per run
+- Email pattern model (backend/cache/email_patterns.json): verification
+  outcomes teach each domain's address pattern; later candidates for that
+  domain are reordered / pruned, dead domains skipped, catch-all domains
+  get a single guess
+- Domain pre-check: the mail domain comes from the enrichment website when
+  known; each domain gets a DNS MX check and one probe address (one batch
+  job for all) before any permutations; dead domains are marked
+  invalid_domain and catch-all domains get an unverified best guess
+- Credit-aware plan (utils/verification_planner.py): before spending, lead
+  scores from scored_companies.json and per-company cost estimates order
+  the work by expected value per credit within the remaining balance; the
+  plan is logged and written to outputs/verification_plan.json, and
+  companies beyond the budget are only verified with what is left. The
+  planned tier gets a DNS-only domain pre-check; the deferred tier gets
+  DNS + probe before it is verified
 """
 
 import time
@@ -16,13 +43,18 @@ import json
 import os
 import re
 import uuid
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 import requests
 from dotenv import load_dotenv
 from datetime import datetime
 from backend.db.mongo import save_user_output
+from backend.utils.domain_precheck import DomainPrecheck, domain_from_website, probe_address
+from backend.utils.email_patterns import EmailPatternModel
+from backend.utils.verification_cache import VerificationCache
+from backend.utils.verification_planner import VerificationPlanner, mailbox_prior
+from backend.utils.verifalia_async import AsyncVerifaliaEngine, default_result, httpx, parse_entry
 
 # =====================
 # Load env (keeps original behavior but we will also load backend/.env in the agent)
@@ -34,7 +66,11 @@ load_dotenv()
 # =====================
 MAX_RETRIES = 3
 RETRY_BACKOFF = 2
-API_BASE = "https://api.verifalia.com/v2.7"
+API_BASE = os.getenv("VERIFALIA_API_BASE", "https://api.verifalia.com/v2.7")
+BATCH_MAX_ENTRIES = 500   # entries per validation job in batch mode
+BATCH_WAVE = 1            # candidates per company per batch round (more = fewer rounds, more credits)
+POLL_WAIT_MS = 20000      # server-side wait per status poll
+POLL_BACKOFF_MAX = 8.0
 
 # =====================
 # Data Model
@@ -57,8 +93,12 @@ class Employee:
 # =====================
 class EmailPermutationGenerator:
     @staticmethod
-    def generate(name: str, company: str) -> List[str]:
-        """Generate common business email patterns, sorted by likelihood of correctness."""
+    def domain_for(company: str) -> str:
+        return re.sub(r"[^a-z0-9]", "", company.lower()) + ".com"
+
+    @staticmethod
+    def generate_labeled(name: str, company: str, domain: str = None) -> List[Tuple[str, str, float]]:
+        """(pattern, email, prior) for common business email patterns, most likely first (domain defaults to <company>.com)."""
         if not name or not company:
             return []
 
@@ -68,42 +108,52 @@ class EmailPermutationGenerator:
 
         first = parts[0]
         last = parts[-1] if len(parts) > 1 else ""
-        domain = re.sub(r"[^a-z0-9]", "", company.lower()) + ".com"
+        domain = domain or EmailPermutationGenerator.domain_for(company)
 
         if last:
             candidates = [
-                (f"{first}.{last}@{domain}", 0.36),
-                (f"{first}@{domain}", 0.26),
-                (f"{first}{last}@{domain}", 0.14),
-                (f"{first[0]}{last}@{domain}", 0.10),
-                (f"{first}_{last}@{domain}", 0.06),
-                (f"{first[0]}.{last}@{domain}", 0.04),
-                (f"{last}.{first}@{domain}", 0.02),
-                (f"{first}.{last[0]}@{domain}", 0.02),
+                ("first.last", f"{first}.{last}@{domain}", 0.36),
+                ("first", f"{first}@{domain}", 0.26),
+                ("firstlast", f"{first}{last}@{domain}", 0.14),
+                ("flast", f"{first[0]}{last}@{domain}", 0.10),
+                ("first_last", f"{first}_{last}@{domain}", 0.06),
+                ("f.last", f"{first[0]}.{last}@{domain}", 0.04),
+                ("last.first", f"{last}.{first}@{domain}", 0.02),
+                ("first.l", f"{first}.{last[0]}@{domain}", 0.02),
             ]
         else:
             candidates = [
-                (f"{first}@{domain}", 0.5),
-                (f"{first[0]}@{domain}", 0.2),
-                (f"{first}1@{domain}", 0.1),
-                (f"{first}.{first[0]}@{domain}", 0.05),
+                ("first", f"{first}@{domain}", 0.5),
+                ("f", f"{first[0]}@{domain}", 0.2),
+                ("first1", f"{first}1@{domain}", 0.1),
+                ("first.f", f"{first}.{first[0]}@{domain}", 0.05),
             ]
 
-        sorted_candidates = sorted(candidates, key=lambda x: -x[1])
-        patterns = list(dict.fromkeys([c[0] for c in sorted_candidates]))
-        return patterns
+        sorted_candidates = sorted(candidates, key=lambda x: -x[2])
+        seen, labeled = set(), []
+        for pattern, email, prior in sorted_candidates:
+            if email not in seen:
+                seen.add(email)
+                labeled.append((pattern, email, prior))
+        return labeled
+
+    @staticmethod
+    def generate(name: str, company: str) -> List[str]:
+        """Generate common business email patterns, sorted by likelihood of correctness."""
+        return [email for _, email, _ in EmailPermutationGenerator.generate_labeled(name, company)]
 
 
 # =====================
 # Verifalia Verifier
 # =====================
 class VerifaliaVerifier:
-    def __init__(self, accounts: List[Dict[str, str]], logger: logging.Logger):
+    def __init__(self, accounts: List[Dict[str, str]], logger: logging.Logger, cache: VerificationCache = None):
         self.accounts = accounts
         self.current_idx = 0
         self.session = requests.Session()
         self.out_of_credits = False
         self.logger = logger
+        self.cache = cache
         self._set_auth_header()
 
     def _set_auth_header(self):
@@ -126,12 +176,38 @@ class VerifaliaVerifier:
             self.logger.error("❌ All Verifalia accounts exhausted. Stopping verification.")
             self.out_of_credits = True
 
+    def remaining_credits(self) -> Optional[float]:
+        """Credits left on the current and later accounts (None if no balance could be read)."""
+        known = []
+        for idx in range(self.current_idx, len(self.accounts)):
+            creds = self.accounts[idx]
+            try:
+                r = requests.get(f"{API_BASE}/credits/balance", auth=(creds["user"], creds["pass"]), timeout=10)
+                if r.status_code == 200:
+                    data = r.json()
+                    known.append(float(data.get("creditPacks") or 0) + float(data.get("freeCredits") or 0))
+            except Exception as e:
+                self.logger.warning(f"Balance check failed for account #{idx+1}: {e}")
+        return sum(known) if known else None
+
     def verify_email(self, email: str) -> Dict:
+        if self.cache is not None:
+            cached = self.cache.get(email)
+            if cached is not None:
+                return cached
+        result = self._verify_email_live(email)
+        if self.cache is not None:
+            self.cache.put(result)
+        return result
+
+    def _verify_email_live(self, email: str) -> Dict:
         if self.out_of_credits:
             return self._default_result(email, "all_accounts_exhausted")
 
         payload = {"entries": [{"inputData": email}], "quality": "Standard"}
-        for attempt in range(1, MAX_RETRIES + 1):
+        attempt = 0
+        while attempt < MAX_RETRIES and not self.out_of_credits:
+            attempt += 1
             try:
                 r = self.session.post(f"{API_BASE}/email-validations", json=payload, timeout=20)
 
@@ -143,64 +219,141 @@ class VerifaliaVerifier:
                 elif r.status_code in (401, 402, 429):
                     self.logger.warning(f"⚠️ Account #{self.current_idx+1} hit limit ({r.status_code}).")
                     self._rotate_account()
-                    return self._default_result(email, "rotated_account")
+                    attempt = 0  # same address, next account
                 else:
                     self.logger.warning(f"Unexpected response {r.status_code}: {r.text}")
                     time.sleep(RETRY_BACKOFF)
             except Exception as e:
                 self.logger.error(f"Error verifying {email}: {e}")
                 time.sleep(RETRY_BACKOFF)
-        return self._default_result(email, "api_error")
+        return self._default_result(email, "all_accounts_exhausted" if self.out_of_credits else "api_error")
+
+    def verify_batch(self, emails: List[str]) -> Dict[str, Dict]:
+        """
+        Verify many addresses with multi-entry jobs (up to BATCH_MAX_ENTRIES each).
+        Returns {lowercased email: result}; a job rejected for limits/credits is
+        resubmitted on the next account instead of being dropped.
+        """
+        emails = list(dict.fromkeys(e for e in emails if e))
+        results: Dict[str, Dict] = {}
+        if self.cache is not None:
+            results, emails = self.cache.split(emails)
+        for start in range(0, len(emails), BATCH_MAX_ENTRIES):
+            chunk = emails[start:start + BATCH_MAX_ENTRIES]
+            fresh = self._verify_job(chunk)
+            if self.cache is not None:
+                self.cache.put_many(fresh)
+            results.update(fresh)
+        return results
+
+    def _verify_job(self, emails: List[str]) -> Dict[str, Dict]:
+        payload = {"entries": [{"inputData": e} for e in emails], "quality": "Standard"}
+        attempt = 0
+        while attempt < MAX_RETRIES and not self.out_of_credits:
+            attempt += 1
+            try:
+                r = self.session.post(f"{API_BASE}/email-validations", json=payload, timeout=30)
 
-    def _poll_for_results(self, job_id: str, max_wait: int = 10) -> Dict:
+                if r.status_code == 202:
+                    job_id = r.json().get("overview", {}).get("id")
+                    data = self._poll_job(job_id, max_wait=10 + len(emails) // 10)
+                    if data is not None:
+                        return self._map_results(emails, self._parse_entries(data, job_id), "no_entries")
+                    return self._map_results(emails, [], "timeout")
+                elif r.status_code == 200:
+                    return self._map_results(emails, self._parse_entries(r.json()), "no_entries")
+                elif r.status_code in (401, 402, 429):
+                    self.logger.warning(f"⚠️ Account #{self.current_idx+1} hit limit ({r.status_code}) on a {len(emails)}-entry job.")
+                    self._rotate_account()
+                    attempt = 0  # same job, next account
+                else:
+                    self.logger.warning(f"Unexpected response {r.status_code}: {r.text}")
+                    time.sleep(RETRY_BACKOFF)
+            except Exception as e:
+                self.logger.error(f"Error verifying batch of {len(emails)}: {e}")
+                time.sleep(RETRY_BACKOFF)
+        reason = "all_accounts_exhausted" if self.out_of_credits else "api_error"
+        return self._map_results(emails, [], reason)
+
+    def _map_results(self, emails: List[str], parsed: List[Dict], missing_reason: str) -> Dict[str, Dict]:
+        by_email = {res["email"].lower(): res for res in parsed if res.get("email")}
+        return {e.lower(): by_email.get(e.lower()) or self._default_result(e, missing_reason) for e in emails}
+
+    def _poll_job(self, job_id: str, max_wait: int = 10) -> Dict | None:
+        """Completed job snapshot, or None after max_wait polls (long-poll, else exponential backoff)."""
+        delay = 0.5
         for _ in range(max_wait):
+            started = time.monotonic()
             try:
-                r = self.session.get(f"{API_BASE}/email-validations/{job_id}", timeout=15)
+                r = self.session.get(f"{API_BASE}/email-validations/{job_id}", params={"waitTime": POLL_WAIT_MS},
+                                     timeout=POLL_WAIT_MS / 1000 + 15)
                 if r.status_code == 200:
                     data = r.json()
                     if data.get("overview", {}).get("status") == "Completed":
-                        return self._parse_result(data)
-                time.sleep(2)
+                        return data
             except Exception as e:
                 self.logger.warning(f"Polling failed for {job_id}: {e}")
-        return self._default_result("", "timeout")
+            if time.monotonic() - started < 1.0:
+                time.sleep(delay)
+                delay = min(delay * 2, POLL_BACKOFF_MAX)
+        return None
+
+    def _poll_for_results(self, job_id: str, max_wait: int = 10) -> Dict:
+        data = self._poll_job(job_id, max_wait)
+        if data is None:
+            return self._default_result("", "timeout")
+        return self._parse_result(data)
+
+    def _parse_entry(self, entry: Dict) -> Dict:
+        return parse_entry(entry)
+
+    def _parse_entries(self, data: Dict, job_id: str | None = None) -> List[Dict]:
+        """All entries of a completed job, following the entries cursor when the listing is truncated."""
+        try:
+            page = data.get("entries", {}) or {}
+            entries = list(page.get("data", []))
+            while job_id and (page.get("meta") or {}).get("isTruncated"):
+                r = self.session.get(f"{API_BASE}/email-validations/{job_id}/entries",
+                                     params={"cursor": page["meta"].get("cursor")}, timeout=15)
+                if r.status_code != 200:
+                    break
+                page = r.json()
+                entries.extend(page.get("data", []))
+            return [self._parse_entry(e) for e in entries]
+        except Exception as e:
+            self.logger.error(f"Parse error: {e}")
+            return []
 
     def _parse_result(self, data: Dict) -> Dict:
         try:
             entries = data.get("entries", {}).get("data", [])
             if not entries:
                 return self._default_result("", "no_entries")
-            entry = entries[0]
-            email = entry.get("inputData", "")
-            classification = entry.get("classification", "Unknown")
-            conf_map = {"Deliverable": 0.95, "Risky": 0.5, "Unknown": 0.2, "Undeliverable": 0.0}
-            return {
-                "email": email,
-                "is_valid": classification == "Deliverable",
-                "classification": classification,
-                "confidence": conf_map.get(classification, 0.1),
-                "verified": True
-            }
+            return self._parse_entry(entries[0])
         except Exception as e:
             self.logger.error(f"Parse error: {e}")
             return self._default_result("", "parse_error")
 
     def _default_result(self, email: str, reason: str) -> Dict:
-        return {
-            "email": email,
-            "is_valid": False,
-            "classification": "Unknown",
-            "confidence": 0.0,
-            "verified": False,
-            "error": reason
-        }
+        return default_result(email, reason)
 
 
 # =====================
 # Main Runner
 # =====================
 class ContactFinderAgent:
-    def __init__(self, user_root: str = None):
+    def __init__(self, user_root: str = None, batch: bool = True, batch_wave: int = BATCH_WAVE,
+                 async_engine: bool = True, use_cache: bool = True, learn_patterns: bool = True,
+                 precheck_domains: bool = True, plan_credits: bool = True):
+        """
+        batch → verify candidates across companies in multi-entry jobs (False = one job per address)
+        batch_wave → candidates per company submitted in each batch round
+        async_engine → in batch mode, run each round's jobs concurrently (httpx); falls back to the sync verifier
+        use_cache → answer addresses verified recently from the shared verification cache
+        learn_patterns → order / prune candidates with the per-domain email pattern model
+        precheck_domains → DNS + probe-address check per domain before trying permutations
+        plan_credits → order companies by lead score per expected credit within the remaining balance
+        """
         # ensure backend .env is loaded (robust when cwd changes)
         project_root = Path(__file__).resolve().parents[1]
         try:
@@ -220,6 +373,16 @@ class ContactFinderAgent:
 
         self.log_file = self.logs_dir / "contact_finder.log"
         self.logger = self._setup_logging()
+        self.batch = batch
+        self.batch_wave = max(1, int(batch_wave))
+        self.async_engine = async_engine
+        self.cache = VerificationCache() if use_cache else None
+        self.patterns = EmailPatternModel() if learn_patterns else None
+        self.attempts = {"people": 0, "candidates": 0}
+        self.precheck = DomainPrecheck(self.patterns, logger=self.logger) if precheck_domains else None
+        self.planner = VerificationPlanner(self.cache) if plan_credits else None
+        self._domains: Dict[str, str] = {}        # company → mail domain
+        self._domain_states: Dict[str, str] = {}  # domain → ok / catch_all / dead
 
     def _setup_logging(self) -> logging.Logger:
         import sys
@@ -274,8 +437,88 @@ class ContactFinderAgent:
             self.logger.error("❌ No Verifalia credentials found in environment variables.")
             return
 
-        verifier = VerifaliaVerifier(accounts, self.logger)
+        if self.batch and self.async_engine and httpx is not None:
+            self.logger.info(f"⚡ Async verification engine (concurrent jobs, long-poll, {len(accounts)} account(s))")
+            verifier = AsyncVerifaliaEngine(accounts, self.logger, api_base=API_BASE, cache=self.cache)
+        else:
+            verifier = VerifaliaVerifier(accounts, self.logger, cache=self.cache)
+
+        self._domains = self._load_domains(data)
+        companies = [c for c in data if c.get("employees")]
+        tiers, tier_costs = [companies], [None]
+        if self.planner is not None:
+            plan = self.planner.plan(self._plan_inputs(companies), verifier.remaining_credits())
+            self._report_plan(plan)
+            tiers = [[companies[i] for i in tier] for tier in plan["tiers"]]
+            costs = [e["expected_credits"] for e in plan["entries"]]  # planned, then deferred, in tier order
+            tier_costs = [costs[:plan["planned"]], costs[plan["planned"]:]]
+
+        verified_count = skipped_count = 0
+        for n, tier in enumerate(tiers):
+            if self.precheck is not None and tier:
+                if self.planner is None:
+                    self._precheck(tier, verifier, probe=True)
+                elif n == 0:
+                    # planned tier: DNS only, the plan's budget has no probes in it
+                    self._precheck(tier, verifier, probe=False)
+                else:
+                    # deferred tier: probe the companies the leftover credits can cover (plan order)
+                    # so their dead / catch-all domains don't fan out; DNS only for the rest
+                    affordable = self._affordable(tier, tier_costs[n], verifier.remaining_credits())
+                    self._precheck(tier[:affordable], verifier, probe=True)
+                    self._precheck(tier[affordable:], verifier, probe=False)
+            if self.batch:
+                verified, skipped = self._verify_batched(tier, verifier)
+            else:
+                verified, skipped = self._verify_serial(tier, verifier)
+            verified_count += verified
+            skipped_count += skipped
+
+        scheduler = getattr(verifier, "scheduler", None)
+        if scheduler is not None:
+            for acc in scheduler.summary():
+                self.logger.info(f"💳 Account #{acc['account']}: {acc['jobs']} jobs, {acc['entries']} entries, "
+                                 f"{acc['remaining'] if acc['remaining'] is not None else '?'} credits left"
+                                 f"{' (exhausted)' if acc['exhausted'] else ''}")
+
+        if self.cache is not None:
+            stats = self.cache.stats
+            self.logger.info(f"📦 Verification cache: {stats['hits']} hits, {stats['misses']} misses, "
+                             f"{stats['credits_saved']} credits saved")
+            try:
+                self.cache.save()
+            except Exception as e:
+                self.logger.warning(f"Failed to save verification cache: {e}")
+        if self.patterns is not None:
+            per_person = self.attempts["candidates"] / max(self.attempts["people"], 1)
+            self.logger.info(f"📐 Email patterns: {self.patterns.stats}, {per_person:.2f} candidates checked per person")
+            try:
+                self.patterns.save()
+            except Exception as e:
+                self.logger.warning(f"Failed to save email pattern model: {e}")
 
+        with open(output_json, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+        self.logger.info(f"✅ Email verification complete. Saved to {output_json}")
+        print(f"✅ Email verification complete. {verified_count} verified, {skipped_count} skipped.")
+        print(f"Results saved to {output_json}")
+
+        # after writing output_json
+        try:
+            user_id = self.user_root.name if self.user_root else "unknown"
+            save_user_output(
+                user_id=user_id, 
+                agent="contact_finder", 
+                output_type="employees_email", 
+                data={"results": data}
+            )
+            self.logger.info("Saved contact_finder results to user_outputs (mongo)")
+        except Exception:
+            self.logger.exception("Failed to save contact_finder results to user_outputs")
+
+    def _verify_serial(self, data: List[Dict], verifier: VerifaliaVerifier):
+        """One job per candidate address, company by company (original mode)."""
         verified_count = 0
         skipped_count = 0
 
@@ -286,6 +529,8 @@ class ContactFinderAgent:
                 continue
 
             employees_sorted = sorted(employees, key=lambda e: e.get("confidence", 0), reverse=True)
+            if self._short_circuit_domain(company, employees_sorted):
+                continue
             found_valid = False
             verified_emp = None
 
@@ -296,11 +541,14 @@ class ContactFinderAgent:
                     break
 
                 full_name = emp.get("name", "")
-                email_candidates = EmailPermutationGenerator.generate(full_name, company_name)
+                email_candidates = self._candidates(full_name, company_name)
                 self.logger.info(f"🔍 Checking {full_name} from {company_name}...")
+                if email_candidates:
+                    self.attempts["people"] += 1
 
-                for candidate in email_candidates:
+                for pattern, candidate in email_candidates:
                     result = verifier.verify_email(candidate)
+                    self._observe(pattern, candidate, result)
                     emp["verified_email"] = candidate
                     emp["email_verified"] = result["is_valid"]
                     emp["email_classification"] = result["classification"]
@@ -319,7 +567,8 @@ class ContactFinderAgent:
                         skipped_count += 1
                         break
 
-                    time.sleep(1.0)
+                    if not result.get("cached"):
+                        time.sleep(1.0)
 
                 if found_valid or verifier.out_of_credits:
                     break
@@ -338,25 +587,236 @@ class ContactFinderAgent:
 
             company["employees"] = [verified_emp]
 
-        with open(output_json, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        return verified_count, skipped_count
 
-        self.logger.info(f"✅ Email verification complete. Saved to {output_json}")
-        print(f"✅ Email verification complete. {verified_count} verified, {skipped_count} skipped.")
-        print(f"Results saved to {output_json}")
+    def _verify_batched(self, data: List[Dict], verifier):
+        """
+        Rounds of multi-entry jobs: each round takes the next batch_wave candidates of
+        every unresolved company (employees by confidence, each employee's permutations
+        in likelihood order). A company is resolved by its first deliverable candidate
+        in that order, or when it runs out of candidates.
+        """
+        work = []
+        for company in data:
+            employees = company.get("employees", [])
+            if not employees:
+                continue
+            employees_sorted = sorted(employees, key=lambda e: e.get("confidence", 0), reverse=True)
+            if self._short_circuit_domain(company, employees_sorted):
+                continue
+            work.append({"company": company, "company_name": company.get("company", ""),
+                         "employees": employees_sorted, "tried": set(), "people": set(), "found": None})
+
+        pending = work
+        rounds = 0
+        while pending and not verifier.out_of_credits:
+            # candidates are re-ranked every round, so outcomes so far reorder / prune the rest
+            for w in pending:
+                w["chunk"] = self._next_candidates(w, self.batch_wave)
+            pending = [w for w in pending if w["chunk"]]
+            if not pending:
+                break
+            rounds += 1
+            emails = []
+            for w in pending:
+                for emp, _, candidate in w["chunk"]:
+                    w["tried"].add(candidate)
+                    if id(emp) not in w["people"]:
+                        w["people"].add(id(emp))
+                        self.attempts["people"] += 1
+                    emails.append(candidate)
+            self.logger.info(f"📦 Batch round {rounds}: {len(emails)} candidates for {len(pending)} companies")
+            results = verifier.verify_batch(emails)
+
+            for w in pending:
+                for emp, pattern, candidate in w["chunk"]:
+                    result = results.get(candidate.lower()) or default_result(candidate, "missing")
+                    self._observe(pattern, candidate, result)
+                    emp["verified_email"] = candidate
+                    emp["email_verified"] = result["is_valid"]
+                    emp["email_classification"] = result["classification"]
+                    emp["confidence_score"] = result["confidence"]
+                    if result.get("error") == "all_accounts_exhausted":
+                        w["starved"] = True
+                    if result["is_valid"]:
+                        w["found"] = emp
+                        self.logger.info(f"✅ Valid email found for {emp.get('name', '')}: {candidate}")
+                        break
+            pending = [w for w in pending if w["found"] is None]
 
-        # after writing output_json
+        verified_count = 0
+        skipped_count = 0
+        for w in work:
+            company = w["company"]
+            verified_emp = w["found"]
+            if verified_emp is not None:
+                verified_count += 1
+                company["verification_status"] = "verified"
+            else:
+                verified_emp = w["employees"][0]
+                verified_emp.update({
+                    "verified_email": "",
+                    "email_verified": False,
+                    "email_classification": "Unknown",
+                    "confidence_score": 0.0
+                })
+                if w.get("starved") or (verifier.out_of_credits and self._next_candidates(w, 1)):
+                    company["verification_status"] = "skipped_out_of_credit"
+                    skipped_count += 1
+                else:
+                    company["verification_status"] = "unverified"
+            company["employees"] = [verified_emp]
+
+        return verified_count, skipped_count
+
+    def _load_scores(self) -> Dict[str, float]:
+        """company → lead score from scored_companies.json (empty if scoring hasn't run)."""
         try:
-            user_id = self.user_root.name if self.user_root else "unknown"
-            save_user_output(
-                user_id=user_id, 
-                agent="contact_finder", 
-                output_type="employees_email", 
-                data={"results": data}
-            )
-            self.logger.info("Saved contact_finder results to user_outputs (mongo)")
+            with open(self.outputs_dir / "scored_companies.json", "r", encoding="utf-8") as f:
+                scored = json.load(f)
         except Exception:
-            self.logger.exception("Failed to save contact_finder results to user_outputs")
+            return {}
+        scores = {}
+        for c in scored:
+            name = c.get("company") or c.get("company_name") or ""
+            if name and name not in scores:
+                scores[name] = float(c.get("score", 0) or 0)
+        return scores
+
+    def _plan_inputs(self, companies: List[Dict]) -> List[Dict]:
+        """Planner input per company: lead score, ranked candidates per employee, domain priors."""
+        scores = self._load_scores()
+        if not scores:
+            self.logger.warning("⚠️ No lead scores found; planning by expected verifications per credit only.")
+        inputs = []
+        for company in companies:
+            name = company.get("company", "")
+            domain = self._domain(name)
+            state = self.patterns.domain_state(domain) if self.patterns is not None else None
+            employees = sorted(company.get("employees", []), key=lambda e: e.get("confidence", 0), reverse=True)
+            people = [[(email, share) for _, email, share in self._ranked(e.get("name", ""), name)] for e in employees]
+            # the deferred tier's pre-check spends one probe on domains it knows nothing about
+            probe = (self.precheck is not None and self.precheck.probe and state is None
+                     and not (self.patterns is not None and self.patterns.confirmed_pattern(domain))
+                     and not (self.cache is not None and self.cache.peek(probe_address(domain))))
+            inputs.append({
+                "company": name,
+                "score": scores.get(name, 0.0) if scores else 1.0,
+                "people": people,
+                "p_mailbox": mailbox_prior(self.patterns, domain),
+                "probe_cost": 1.0 if probe else 0.0,
+                "skip": state in ("dead", "catch_all"),
+            })
+        return inputs
+
+    def _precheck(self, companies: List[Dict], verifier, probe: bool):
+        if not companies:
+            return
+        targets = [self._domains[c.get("company", "")] for c in companies]
+        self._domain_states.update(self.precheck.run(targets, verifier, probe=probe))
+        self.logger.info(f"🧪 Domain pre-check of {len(targets)} domains "
+                         f"({'DNS + probe' if probe else 'DNS only'}): {self.precheck.stats}")
+
+    @staticmethod
+    def _affordable(tier: List[Dict], costs: List[float], credits: Optional[float]) -> int:
+        """How many companies, in plan order, the remaining credits are expected to cover."""
+        if credits is None:
+            return len(tier)
+        spend = 0.0
+        for n, cost in enumerate(costs):
+            spend += cost
+            if spend > credits:
+                return n
+        return len(tier)
+
+    def _report_plan(self, plan: Dict):
+        budget = plan["budget"]
+        self.logger.info(
+            f"🧭 Verification plan: {plan['planned']} companies planned, {plan['deferred']} deferred; "
+            f"~{plan['expected_credits']} credits of {budget if budget is not None else 'unknown'} budget, "
+            f"~{plan['expected_verified']} expected verified (score-weighted {plan['expected_score_verified']})"
+        )
+        for e in plan["entries"][:10]:
+            self.logger.info(f"   #{e['rank']} {e['company']} [{e['tier']}] score={e['score']} "
+                             f"~{e['expected_credits']} credits, p={e['p_verified']}")
+        report = {k: v for k, v in plan.items() if k != "tiers"}
+        report["created_at"] = datetime.utcnow().isoformat()
+        try:
+            with open(self.outputs_dir / "verification_plan.json", "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            self.logger.warning(f"Failed to write verification plan: {e}")
+
+    def _load_domains(self, data: List[Dict]) -> Dict[str, str]:
+        """company → mail domain: the enrichment website's host when known, else <company>.com."""
+        websites = {}
+        try:
+            with open(self.outputs_dir / "enriched_companies.json", "r", encoding="utf-8") as f:
+                websites = {c.get("company"): c.get("website") for c in json.load(f) if c.get("website")}
+        except Exception:
+            pass
+        domains = {}
+        for company in data:
+            name = company.get("company", "")
+            domains[name] = domain_from_website(websites.get(name)) or EmailPermutationGenerator.domain_for(name)
+        return domains
+
+    def _domain(self, company_name: str) -> str:
+        return self._domains.get(company_name) or EmailPermutationGenerator.domain_for(company_name)
+
+    def _short_circuit_domain(self, company: Dict, employees_sorted: List[Dict]) -> bool:
+        """Resolve a company without permutations when its domain is dead or catch-all."""
+        domain = self._domain(company.get("company", ""))
+        state = self._domain_states.get(domain)
+        if state not in ("dead", "catch_all"):
+            return False
+        emp = employees_sorted[0]
+        guess = ""
+        if state == "catch_all":
+            labeled = EmailPermutationGenerator.generate_labeled(emp.get("name", ""), company.get("company", ""), domain)
+            if self.patterns is not None:
+                labeled = self.patterns.rank(domain, labeled)
+            guess = labeled[0][1] if labeled else ""
+        emp.update({
+            "verified_email": guess,
+            "email_verified": False,
+            "email_classification": "Risky" if state == "catch_all" else "Undeliverable",
+            "confidence_score": 0.5 if guess else 0.0
+        })
+        company["verification_status"] = "catch_all" if state == "catch_all" else "invalid_domain"
+        company["mail_domain"] = domain
+        company["employees"] = [emp]
+        self.logger.info(f"🧪 {company.get('company', '')}: {domain} is {state.replace('_', '-')}, skipping permutations")
+        return True
+
+    def _ranked(self, full_name: str, company_name: str) -> List[Tuple[str, str, float]]:
+        """(pattern, email, share) for a person, ranked by the domain's pattern model when enabled."""
+        domain = self._domain(company_name)
+        labeled = EmailPermutationGenerator.generate_labeled(full_name, company_name, domain)
+        if self.patterns is not None:
+            labeled = self.patterns.rank(domain, labeled)
+        return labeled
+
+    def _candidates(self, full_name: str, company_name: str) -> List[Tuple[str, str]]:
+        """(pattern, email) to try for a person, in ranked order."""
+        return [(pattern, email) for pattern, email, _ in self._ranked(full_name, company_name)]
+
+    def _next_candidates(self, w: Dict, n: int) -> List[Tuple[Dict, str, str]]:
+        """Next n untried (employee, pattern, email) of a batch work item, in priority order."""
+        out = []
+        for emp in w["employees"]:
+            for pattern, email in self._candidates(emp.get("name", ""), w["company_name"]):
+                if email not in w["tried"]:
+                    out.append((emp, pattern, email))
+                    if len(out) >= n:
+                        return out
+        return out
+
+    def _observe(self, pattern: str, email: str, result: Dict):
+        if not result.get("cached"):
+            self.attempts["candidates"] += 1
+        if self.patterns is not None:
+            self.patterns.observe(email.rsplit("@", 1)[-1], pattern, result)
 
 
 
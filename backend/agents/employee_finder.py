@@ -7,6 +7,23 @@ Multi-user compatible SalesEmployeeFinder
 - Reads customer_requirements.json for top % configuration
 - Saves results both locally (JSON) and to MongoDB
 - Core logic unchanged
+- Concurrent mode (max_workers > 1): several companies are searched at once;
+  a shared DDGS rate limiter replaces the per-query sleeps
+- Speculative mode: a company's India and global queries are fired together
+  (within a query budget) and resolved India-first; queries still pending
+  (queued or waiting on the rate limiter) are cancelled and refunded once
+  max_employees India hits are in hand
+- Query compiler: the role terms go out as one OR query per region (larger
+  max_results), split locally; per-keyword queries are the fallback
+- Employee directory (backend/cache/employee_directory.json): companies searched
+  within the TTL are served from cache; stale ones are re-searched and merged
+- Run query budget: a total number of searches split across companies by lead
+  score (with a per-company minimum); unused queries flow back to a shared pool
+- Template ordering: hits per query template are tracked by region and company
+  size band (backend/cache/query_template_stats.json, shared across tenants);
+  within a query stage the templates run in UCB1 order, productive ones first
+- Searches go through a shared pool of long-lived DDGS clients (also used by
+  enrichment_agent) instead of a new client per query
 """
 
 import time
@@ -15,15 +32,41 @@ import random
 import logging
 import json
 import os
-from typing import List, Dict, Set
-from dataclasses import dataclass
+import threading
+from typing import List, Dict, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from ddgs import DDGS
-import requests
 from datetime import datetime
 
 # Import MongoDB helper (backend integration)
 from backend.db.mongo import save_user_output
+from backend.utils.rate_limiter import shared_limiter
+from backend.utils.search_client_pool import shared_search_pool
+from backend.utils.employee_directory import TTL_DAYS, EmployeeDirectory, company_key
+from backend.utils.query_budget import QueryBudget
+from backend.utils.template_stats import TemplateStats, size_band
+
+# Concurrent mode defaults
+MAX_WORKERS = 4            # companies searched at once
+# DDGS queries per second, shared by all workers. The default matches the serial
+# mode's pacing (search_delay 3s + up to 1.2s jitter); higher rates are opt-in via
+# the ddgs_rate argument or the DDGS_RATE env var.
+DDGS_RATE = float(os.getenv("DDGS_RATE", "0.35"))
+DDGS_BURST = 1
+DDGS_JITTER = 0.4          # seconds of random extra delay per query
+QUERY_BUDGET = 6           # max DDGS queries fired per company in speculative mode
+
+# Query compiler: role terms folded into one OR query per region
+ROLE_TERMS = ["sales", "business development", "account executive"]
+COMPILED_TEMPLATE = "compiled"
+COMPILED_MAX_RESULTS = 30
+PER_KEYWORD_MAX_RESULTS = 12
+
+# Run-level query budget (overridable in customer_requirements.json:
+# employee_search_query_budget / employee_search_min_queries)
+RUN_QUERIES_PER_COMPANY = 4   # default total budget = this x companies in the slice
+MIN_QUERIES_PER_COMPANY = 2   # one compiled query per region
 
 
 # =====================
@@ -52,10 +95,25 @@ class SalesEmployeeFinder:
         search_delay: float = 3.0,
         request_timeout: int = 12,
         ddgs_retries: int = 2,
-        india_first: bool = True
+        india_first: bool = True,
+        max_workers: int = MAX_WORKERS,
+        ddgs_rate: float = DDGS_RATE,
+        speculative: bool = True,
+        query_budget: int = QUERY_BUDGET,
+        compile_queries: bool = True,
+        use_directory: bool = True,
+        directory_ttl_days: float = TTL_DAYS,
+        adaptive_templates: bool = True
     ):
         """
         user_root → path to the user's workspace (e.g. users/user_demo)
+        max_workers → companies searched concurrently (1 = original serial mode with per-query sleeps)
+        ddgs_rate → global DDGS queries/second in concurrent/speculative mode (default ~ serial pacing)
+        speculative → fire a company's India + global queries at once instead of one by one
+        query_budget → max queries fired per company in speculative mode
+        compile_queries → one OR query per region (per-keyword queries only as a fallback)
+        use_directory → serve companies searched within directory_ttl_days from the shared employee directory
+        adaptive_templates → order per-keyword templates by their recorded hit rate (fixed order when False)
         """
         self.project_root = Path(__file__).resolve().parents[1]
         self.user_root = Path(user_root) if user_root else self.project_root
@@ -77,11 +135,20 @@ class SalesEmployeeFinder:
         self.request_timeout = request_timeout
         self.ddgs_retries = ddgs_retries
         self.india_first = india_first
-
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
-        })
+        self.max_workers = max(1, int(max_workers))
+        self.speculative = speculative
+        self.query_budget = max(1, int(query_budget))
+        self.compile_queries = compile_queries
+        self.directory = EmployeeDirectory(ttl_days=directory_ttl_days) if use_directory else None
+        self.budget: Optional[QueryBudget] = None  # set per run() from lead scores
+        self._budget_exhausted: Set[str] = set()
+        self._query_pool: Optional[ThreadPoolExecutor] = None
+        self.template_stats = TemplateStats(hit_cap=max_employees_per_company) if adaptive_templates else None
+        self._size_bands: Dict[str, str] = {}  # company → size band, from enriched_companies.json
+        # concurrent/speculative mode: one process-wide limiter replaces the per-query sleeps
+        paced_by_limiter = self.max_workers > 1 or self.speculative
+        self.rate_limiter = shared_limiter("ddgs", ddgs_rate, burst=DDGS_BURST, jitter=DDGS_JITTER) if paced_by_limiter else None
+        self.search_pool = shared_search_pool("ddgs")
 
         # --- Regex & keywords ---
         self.title_separator_re = re.compile(r"\s*[-–—|]\s*")
@@ -111,93 +178,268 @@ class SalesEmployeeFinder:
     # -------------------------
     # MAIN EMPLOYEE SEARCH LOGIC
     # -------------------------
-    def search_company_employees(self, company_name: str) -> List[Employee]:
-        employees: List[Employee] = []
-        seen_urls: Set[str] = set()
-
+    def _region_queries(self, company_name: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Per-keyword queries for each region, keyed by template (role term)."""
         # India-focused queries
-        india_queries = [
-            f'"sales" "at {company_name}" "India" site:linkedin.com/in',
-            f'"business development" "at {company_name}" "India" site:linkedin.com/in',
-            f'"account executive" "at {company_name}" "India" site:linkedin.com/in',
-        ]
+        india_queries = {
+            role: f'"{role}" "at {company_name}" "India" site:linkedin.com/in' for role in ROLE_TERMS
+        }
 
         # Global queries
-        global_queries = [
-            f'"sales" "at {company_name}" site:linkedin.com/in',
-            f'"business development" "at {company_name}" site:linkedin.com/in',
-            f'"account executive" "at {company_name}" site:linkedin.com/in',
-        ]
+        global_queries = {
+            role: f'"{role}" "at {company_name}" site:linkedin.com/in' for role in ROLE_TERMS
+        }
+        return india_queries, global_queries
+
+    def _compile_query(self, company_name: str, india: bool) -> str:
+        """Fold the role terms into one OR query for a region (results are split locally)."""
+        roles = " OR ".join(f'"{role}"' for role in ROLE_TERMS)
+        region = ' "India"' if india else ""
+        return f'({roles}) "at {company_name}"{region} site:linkedin.com/in'
+
+    def _search_plan(self, company_name: str) -> List[Dict]:
+        """
+        Regions in priority order. Each region has query stages: the compiled OR query
+        first, then the per-keyword queries as a fallback when it returns fewer than
+        max_employees hits (or only the per-keyword queries with compile_queries=False).
+        Stage entries are (template, query, max_results); per-keyword templates are
+        ordered by their hit statistics for this region and company size band.
+        """
+        india_queries, global_queries = self._region_queries(company_name)
+        regions = [("India", True, india_queries), ("global", False, global_queries)]
+        if not self.india_first:
+            regions = regions[1:]
+        band = self._size_bands.get(company_name, "unknown")
+        plan = []
+        for label, india, per_keyword in regions:
+            order = ROLE_TERMS
+            if self.template_stats is not None:
+                order = self.template_stats.order(label, band, ROLE_TERMS)
+            stages = [[(role, per_keyword[role], PER_KEYWORD_MAX_RESULTS) for role in order]]
+            if self.compile_queries:
+                stages.insert(0, [(COMPILED_TEMPLATE, self._compile_query(company_name, india), COMPILED_MAX_RESULTS)])
+            plan.append({"label": label, "india_only": india, "band": band, "stages": stages})
+        return plan
+
+    def _record_template(self, region: Dict, template: str, found: List[Employee]):
+        if self.template_stats is not None:
+            self.template_stats.record(region["label"], region["band"], template, len(found))
+
+    def _add_unique(self, employees: List[Employee], seen_urls: Set[str], found: List[Employee]):
+        for e in found:
+            if len(employees) >= self.max_employees:
+                break
+            if e.linkedin_url not in seen_urls:
+                employees.append(e)
+                seen_urls.add(e.linkedin_url)
+
+    def search_company_employees(self, company_name: str, domain: Optional[str] = None) -> List[Employee]:
+        if self.directory is None:
+            return self._search_live(company_name)[0]
+
+        key = company_key(company_name, domain)
+        entry, fresh = self.directory.lookup(key)
+        if fresh:
+            logging.info(f"📇 Employee directory hit for {company_name} ({len(entry['employees'])} known)")
+            records = entry["employees"]
+        else:
+            # a real zero-hit search gets the empty TTL; a budget-starved one is recorded as
+            # partial (empty TTL, earlier employees not downgraded) so it isn't re-searched every
+            # run; a failed one leaves the directory untouched
+            found, outcome = self._search_live(company_name)
+            if outcome != "failed":
+                records = self.directory.record(key, company_name, [asdict(e) for e in found],
+                                                partial=outcome == "starved")
+            elif entry is not None and not found:
+                # nothing was searched properly: keep the stale entry as it is (no new searched_at)
+                logging.info(f"📇 Failed search for {company_name}; serving the stale directory entry")
+                records = entry["employees"]
+            else:
+                records = [asdict(e) for e in found]
+        return [self._employee_from_record(r, company_name) for r in records[: self.max_employees]]
+
+    def _employee_from_record(self, record: Dict, company_name: str) -> Employee:
+        return Employee(
+            name=record.get("name", ""),
+            title=record.get("title", ""),
+            email=record.get("email", ""),
+            company=company_name,
+            linkedin_url=record.get("linkedin_url", ""),
+            source=record.get("source", ""),
+            confidence_score=record.get("confidence_score", 0.0),
+            likely_current=record.get("likely_current", True),
+        )
+
+    @staticmethod
+    def _outcome(starved: bool, failed: bool) -> str:
+        return "failed" if failed else "starved" if starved else "complete"
+
+    def _search_live(self, company_name: str) -> Tuple[List[Employee], str]:
+        """
+        (employees, outcome): "complete"; "starved" when the run's query budget cut the
+        search short; "failed" when a query failed outright (every DDGS attempt errored).
+        """
+        if self.speculative:
+            return self._search_speculative(company_name)
 
+        plan = self._search_plan(company_name)
         if self.india_first:
             logging.info(f"🔍 Searching (India-first) employees for: {company_name}")
+        else:
+            logging.info(f"🌐 Searching (Global-only) employees for: {company_name}")
 
-            # Phase 1: India-first
-            for query in india_queries:
-                if len(employees) >= self.max_employees:
+        starved = failed = False
+        for i, region in enumerate(plan):
+            employees: List[Employee] = []
+            seen_urls: Set[str] = set()
+            for stage_no, stage in enumerate(region["stages"]):
+                if len(employees) >= self.max_employees or starved:
                     break
-                results = self._perform_web_search_with_retries(query)
-                found = self._extract_employee_info(results, company_name, india_only=True)
-                for e in found:
-                    if e.linkedin_url not in seen_urls:
-                        employees.append(e)
-                        seen_urls.add(e.linkedin_url)
+                if stage_no:
+                    logging.info(f"OR query found {len(employees)} {region['label']} hits for {company_name}; running per-keyword queries")
+                for template, query, max_results in stage:
                     if len(employees) >= self.max_employees:
                         break
-                time.sleep(self.search_delay + random.uniform(0, 1.2))
-
-            # Phase 2: fallback
-            if not employees:
+                    if not self._take_query(company_name):
+                        starved = True
+                        break
+                    results = self._perform_web_search_with_retries(query, max_results=max_results)
+                    failed = failed or results.get("failed", False)
+                    found = self._extract_employee_info(results, company_name, india_only=region["india_only"])
+                    self._record_template(region, template, found)
+                    self._add_unique(employees, seen_urls, found)
+                    self._pace()
+            if employees:
+                return employees[: self.max_employees], self._outcome(starved, failed)
+            if i + 1 < len(plan):
                 logging.info(f"No India-based results for {company_name}. Falling back to global search.")
-                for query in global_queries:
+        return [], self._outcome(starved, failed)
+
+    # -------------------------
+    # SPECULATIVE SEARCH (all regions in flight, resolved in priority order)
+    # -------------------------
+    def _take_query(self, company_name: str) -> bool:
+        """Spend one query from the run budget (always allowed outside run())."""
+        if self.budget is None or self.budget.take(company_name):
+            return True
+        if company_name not in self._budget_exhausted:
+            self._budget_exhausted.add(company_name)
+            logging.info(f"💸 Query budget exhausted for {company_name}")
+        return False
+
+    def _get_query_pool(self) -> ThreadPoolExecutor:
+        if self._query_pool is None:
+            self._query_pool = ThreadPoolExecutor(max_workers=self.max_workers * self.query_budget)
+        return self._query_pool
+
+    def _speculative_query(self, template: str, query: str, max_results: int, company_name: str, region: Dict,
+                           cancel: threading.Event) -> Tuple[List[Employee], bool]:
+        """(employees, failed) for one query; a query cancelled before it was sent is refunded."""
+        results = self._perform_web_search_with_retries(query, cancel, max_results=max_results)
+        if results.get("cancelled"):
+            if self.budget is not None:
+                self.budget.refund(1)
+            return [], False
+        if results.get("failed"):
+            return [], True
+        found = self._extract_employee_info(results, company_name, india_only=region["india_only"])
+        self._record_template(region, template, found)
+        return found, False
+
+    def _search_speculative(self, company_name: str) -> Tuple[List[Employee], str]:
+        """
+        Same priority rules as the serial search (India hits first, global only if there
+        are none, capped at max_employees), but the first query stage of every region is
+        in flight at once (within query_budget), so the common case costs one round trip.
+        Fallback stages are only fired when a region's earlier stage came up short.
+        """
+        plan = self._search_plan(company_name)
+        logging.info(f"⚡ Searching ({'India-first' if self.india_first else 'Global-only'}, speculative) employees for: {company_name}")
+        cancel = threading.Event()
+        pool = self._get_query_pool()
+        submitted = []
+        starved = failed = False
+
+        def fire(region, stage):
+            """Submit a stage's queries, held to the per-company query_budget and the run budget."""
+            nonlocal starved
+            futs = []
+            for t, q, n in stage:
+                if len(submitted) + len(futs) >= self.query_budget:
+                    break
+                if not self._take_query(company_name):
+                    starved = True
+                    break
+                futs.append(pool.submit(self._speculative_query, t, q, n, company_name, region, cancel))
+            submitted.extend(futs)
+            return futs
+
+        # speculative first stages, in priority order, only when the whole stage fits the per-company budget
+        first = []
+        for region in plan:
+            stage = region["stages"][0]
+            first.append(fire(region, stage) if len(submitted) + len(stage) <= self.query_budget else None)
+
+        try:
+            for i, region in enumerate(plan):
+                employees: List[Employee] = []
+                seen_urls: Set[str] = set()
+                for stage_no, stage in enumerate(region["stages"]):
                     if len(employees) >= self.max_employees:
                         break
-                    results = self._perform_web_search_with_retries(query)
-                    found = self._extract_employee_info(results, company_name, india_only=False)
-                    for e in found:
-                        if e.linkedin_url not in seen_urls:
-                            employees.append(e)
-                            seen_urls.add(e.linkedin_url)
+                    if stage_no:
+                        logging.info(f"OR query found {len(employees)} {region['label']} hits for {company_name}; running per-keyword queries")
+                    futs = first[i] if stage_no == 0 and first[i] is not None else fire(region, stage)
+                    for fut in futs:
                         if len(employees) >= self.max_employees:
                             break
-                    time.sleep(self.search_delay + random.uniform(0, 1.2))
-        else:
-            logging.info(f"🌐 Searching (Global-only) employees for: {company_name}")
-            for query in global_queries:
-                if len(employees) >= self.max_employees:
-                    break
-                results = self._perform_web_search_with_retries(query)
-                found = self._extract_employee_info(results, company_name, india_only=False)
-                for e in found:
-                    if e.linkedin_url not in seen_urls:
-                        employees.append(e)
-                        seen_urls.add(e.linkedin_url)
-                    if len(employees) >= self.max_employees:
-                        break
-                time.sleep(self.search_delay + random.uniform(0, 1.2))
-
-        return employees[: self.max_employees]
+                        found, query_failed = fut.result()
+                        failed = failed or query_failed
+                        self._add_unique(employees, seen_urls, found)
+                if employees:
+                    return employees[: self.max_employees], self._outcome(starved, failed)
+                if i + 1 < len(plan):
+                    logging.info(f"No India-based results for {company_name}. Using global results.")
+            return [], self._outcome(starved, failed)
+        finally:
+            # drop whatever is still queued; queries waiting on the rate limiter hand their slot
+            # back and refund themselves in _speculative_query
+            cancel.set()
+            never_sent = sum(fut.cancel() for fut in submitted)
+            if never_sent and self.budget is not None:
+                self.budget.refund(never_sent)
 
     # -------------------------
     # DDGS WEB SEARCH
     # -------------------------
-    def _perform_web_search_with_retries(self, query: str) -> Dict:
+    def _pace(self):
+        """Delay after a query in serial mode (concurrent mode is paced by the rate limiter)."""
+        if self.rate_limiter is None:
+            time.sleep(self.search_delay + random.uniform(0, 1.2))
+
+    def _perform_web_search_with_retries(self, query: str, cancel: Optional[threading.Event] = None,
+                                         max_results: int = PER_KEYWORD_MAX_RESULTS) -> Dict:
         backoff = 1.0
         for attempt in range(1, self.ddgs_retries + 2):
+            # cancelled queries must not spend shared limiter slots: a cancel during the
+            # wait hands the reserved slot back ('cancelled' = nothing was sent)
+            if cancel is not None and cancel.is_set():
+                return {'results': [], 'cancelled': attempt == 1}
+            if self.rate_limiter is not None and self.rate_limiter.acquire(cancel) is None:
+                return {'results': [], 'cancelled': attempt == 1}
             try:
-                with DDGS() as ddgs:
-                    results = list(ddgs.text(query, max_results=12))
-                    parsed = [
-                        {'title': r.get('title', ''), 'href': r.get('href', ''), 'body': r.get('body', '')}
-                        for r in results
-                    ]
-                    return {'results': parsed}
+                results = self.search_pool.text(query, max_results=max_results)
+                parsed = [
+                    {'title': r.get('title', ''), 'href': r.get('href', ''), 'body': r.get('body', '')}
+                    for r in results
+                ]
+                return {'results': parsed}
             except Exception as e:
                 logging.warning(f"DDGS attempt {attempt} failed for query '{query}': {e}")
                 time.sleep(backoff + random.uniform(0, 0.5))
                 backoff *= 2
         logging.error(f"DDGS completely failed for query: {query}")
-        return {'results': []}
+        return {'results': [], 'failed': True}
 
     # -------------------------
     # PARSING HELPERS
@@ -276,6 +518,50 @@ class SalesEmployeeFinder:
     # -------------------------
     # RUNNER
     # -------------------------
+    def _company_result(self, company_name: str, domain: Optional[str] = None) -> Dict:
+        logging.info(f"Finding employees for {company_name} ...")
+        try:
+            employees = self.search_company_employees(company_name, domain)
+        except Exception as e:
+            logging.error(f"Error searching for {company_name}: {e}")
+            employees = []
+        finally:
+            if self.budget is not None:
+                self.budget.finish(company_name)  # leftover queries go back to the shared pool
+
+        return {
+            "company": company_name,
+            "num_found": len(employees),
+            "employees": [
+                {
+                    "name": e.name,
+                    "title": e.title,
+                    "linkedin_url": e.linkedin_url,
+                    "email_guess": e.email,
+                    "confidence": e.confidence_score
+                } for e in employees
+            ]
+        }
+
+    def _load_enriched(self) -> List[Dict]:
+        enriched_file = self.outputs_dir / "enriched_companies.json"
+        try:
+            with open(enriched_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return []
+
+    def _load_websites(self, enriched: List[Dict]) -> Dict[str, str]:
+        """company → website from enriched_companies.json (directory keys prefer the domain)."""
+        return {c.get("company"): c.get("website") for c in enriched if c.get("website")}
+
+    def _load_size_bands(self, enriched: List[Dict]) -> Dict[str, str]:
+        """company → size band from the enriched employees_count (template stats are kept per band)."""
+        return {
+            c.get("company"): size_band((c.get("structured_info") or {}).get("employees_count"))
+            for c in enriched if c.get("company")
+        }
+
     def run(self):
         logging.info("🚀 Starting employee finder...")
 
@@ -292,6 +578,7 @@ class SalesEmployeeFinder:
                 customer_reqs = json.load(f)
             pct_default = float(customer_reqs.get("employee_search_top_percent", 0.15))
         except Exception:
+            customer_reqs = {}
             pct_default = 0.15
 
         with open(scored_companies_file, "r", encoding="utf-8") as f:
@@ -306,31 +593,48 @@ class SalesEmployeeFinder:
         logging.info(f"Configured to search top {pct_default*100:.0f}% ({top_count} of {total}) companies.")
         logging.info(f"Search mode: {'India-first with fallback' if self.india_first else 'Global only'}")
 
-        results = []
+        company_names = [
+            comp.get("company") or comp.get("company_name") or "" for comp in scored_companies[:top_count]
+        ]
+        company_names = [name for name in company_names if name]
+
+        # score-weighted query budget across the slice
+        scores = {}
         for comp in scored_companies[:top_count]:
-            company_name = comp.get("company") or comp.get("company_name") or ""
-            if not company_name:
-                continue
-            logging.info(f"Finding employees for {company_name} ...")
+            name = comp.get("company") or comp.get("company_name") or ""
+            if name and name not in scores:
+                scores[name] = comp.get("score", 0)
+        total_budget = int(customer_reqs.get("employee_search_query_budget") or RUN_QUERIES_PER_COMPANY * len(scores))
+        min_queries = int(customer_reqs.get("employee_search_min_queries", MIN_QUERIES_PER_COMPANY))
+        self.budget = QueryBudget(total_budget, scores, min_per_company=min_queries)
+        logging.info(f"Query budget: {total_budget} searches, allocation {self.budget.allocation}")
+
+        enriched = self._load_enriched()
+        websites = self._load_websites(enriched)
+        self._size_bands = self._load_size_bands(enriched)
+        domains = [websites.get(name) for name in company_names]
+        if self.max_workers > 1:
+            logging.info(f"Concurrent mode: {self.max_workers} workers, shared DDGS limit {self.rate_limiter.rate}/s")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(self._company_result, company_names, domains))  # keeps score order
+        else:
+            results = [self._company_result(name, domain) for name, domain in zip(company_names, domains)]
+        if self._query_pool is not None:
+            self._query_pool.shutdown(wait=False, cancel_futures=True)
+            self._query_pool = None
+        logging.info(f"Query budget used: {self.budget.spent}/{self.budget.total}")
+        self.budget = None
+        if self.directory is not None:
+            logging.info(f"📇 Employee directory: {self.directory.stats}")
             try:
-                employees = self.search_company_employees(company_name)
+                self.directory.save()
             except Exception as e:
-                logging.error(f"Error searching for {company_name}: {e}")
-                employees = []
-
-            results.append({
-                "company": company_name,
-                "num_found": len(employees),
-                "employees": [
-                    {
-                        "name": e.name,
-                        "title": e.title,
-                        "linkedin_url": e.linkedin_url,
-                        "email_guess": e.email,
-                        "confidence": e.confidence_score
-                    } for e in employees
-                ]
-            })
+                logging.warning(f"Failed to save employee directory: {e}")
+        if self.template_stats is not None:
+            try:
+                self.template_stats.save()
+            except Exception as e:
+                logging.warning(f"Failed to save query template stats: {e}")
 
         # --- Save to local JSON
         with open(employees_output_file, "w", encoding="utf-8") as f:
@@ -1,7 +1,6 @@
 # backend/agents/enrichment_agent.py
 import requests
 from bs4 import BeautifulSoup
-from ddgs import DDGS
 import json
 import re
 import os
@@ -15,6 +14,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 from datetime import datetime
 from backend.db.mongo import save_user_output
+from backend.utils.search_client_pool import shared_search_pool
 
 # -----------------------------
 # Configuration (unchanged behaviour)
@@ -140,11 +140,14 @@ class EnrichmentAgent:
 
         # logging per-user
         self.log_file = self.logs_dir / "enrichment_agent.log"
+        self.stream_file = self.outputs_dir / "enriched_stream.jsonl"
         self._setup_logging()
 
         # model and concurrency
         self.model = model
         self.MAX_WORKERS = max_workers
+        # long-lived DDGS clients, shared with employee_finder
+        self.search_pool = shared_search_pool("ddgs")
 
         # city regex (same as before)
         self.city_regex = re.compile(
@@ -255,8 +258,7 @@ class EnrichmentAgent:
     def _throttled_ddg_text(self, query, max_results=3):
         try:
             time.sleep(0.5 + random.random())
-            with DDGS() as ddgs:
-                return list(ddgs.text(query, max_results=max_results))
+            return self.search_pool.text(query, max_results=max_results)
         except Exception as e:
             logging.warning(f"[DDGS] query failed: {query[:40]}... ({e})")
             return []
@@ -404,6 +406,26 @@ class EnrichmentAgent:
         except Exception as e:
             logging.exception(f"Failed to write canonical output to {canonical_file}: {e}")
 
+    # -----------------------------
+    # Live stream (consumed by live_leaderboard while the run is in progress)
+    # -----------------------------
+    def _stream_event(self, record: dict, truncate: bool = False):
+        """Append one JSON line to outputs/enriched_stream.jsonl (best effort)."""
+        try:
+            with self.stream_file.open("w" if truncate else "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        except Exception as e:
+            logging.warning(f"Failed to append to enrichment stream: {e}")
+
+    def _finalize_record(self, r: dict):
+        """LLM structuring + cleaning for one prefetched company; streams the cleaned record."""
+        info = self.extract_structured_info(r.get("company"), r.get("description"), r.get("snippets"))
+        r["structured_info"] = info
+        r.pop("snippets", None)
+        record = clean_company_record(r)  # <-- safe cleaning step
+        self._stream_event(record)
+        return record
+
     # -----------------------------
     # High-level run method (keeps original behaviour)
     # -----------------------------
@@ -424,31 +446,30 @@ class EnrichmentAgent:
             logging.error(f"Failed to load companies from {inputs_file}: {e}")
             return
 
-        raw_results = []
+        # generate correlation id for this run
+        correlation_id = str(uuid.uuid4())
+        self._stream_event({"_start": correlation_id, "started_at": datetime.utcnow().isoformat()}, truncate=True)
+
+        # LLM structuring runs on the main thread as soon as each prefetch lands,
+        # so records reach the live leaderboard while other prefetches are in flight.
+        final_results = []
         with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
             futures = {executor.submit(self.enrich_lead_prefetch, c.get("name"), c.get("website")): c for c in companies}
             for future in as_completed(futures):
                 c = futures[future]
                 try:
-                    result = future.result()
-                    raw_results.append(result)
+                    r = future.result()
                     logging.info(f"✅ Prefetched: {c.get('name')}")
                 except Exception as e:
                     logging.error(f"❌ Prefetch failed for {c.get('name')}: {e}")
-
-        final_results = []
-        for r in sorted(raw_results, key=lambda x: x.get("company", "")):
-            try:
-                info = self.extract_structured_info(r.get("company"), r.get("description"), r.get("snippets"))
-                r["structured_info"] = info
-                r.pop("snippets", None)
-                final_results.append(clean_company_record(r))  # <-- safe cleaning step
-                logging.info(f"✅ LLM enriched & cleaned: {r.get('company')}")
-            except Exception as e:
-                logging.error(f"❌ LLM enrich failed for {r.get('company')}: {e}")
-
-        # generate correlation id for this run
-        correlation_id = str(uuid.uuid4())
+                    continue
+                try:
+                    final_results.append(self._finalize_record(r))
+                    logging.info(f"✅ LLM enriched & cleaned: {r.get('company')}")
+                except Exception as e:
+                    logging.error(f"❌ LLM enrich failed for {r.get('company')}: {e}")
+        final_results.sort(key=lambda x: x.get("company", ""))
+        self._stream_event({"_done": correlation_id, "count": len(final_results)})
 
         # Persist results (Mongo + JSON backup) via helper
         try:
@@ -0,0 +1,231 @@
+# agents/live_leaderboard.py
+"""
+Live lead leaderboard while enrichment is still running
+---------------------------------------------------------
+- enrichment_agent appends each finished record to outputs/enriched_stream.jsonl
+  (a {"_start": ...} line opens a run, a {"_done": ...} line closes it).
+- A background thread per user tails that file, scores new records in batches
+  with the warm OnlineScorer and keeps a bounded top-N heap.
+- After every batch a snapshot is written atomically to outputs/leaderboard.json,
+  including when the first qualified lead (score >= 45) appeared.
+- start_live_scoring / stop_live_scoring / live_scoring_status mirror the
+  email_sender auto-reply helpers.
+"""
+
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from backend.agents.online_scorer import get_online_scorer
+
+STREAM_FILE = "enriched_stream.jsonl"
+SNAPSHOT_FILE = "leaderboard.json"
+QUALIFIED_SCORE = 45       # "Moderate Match" and above
+POLL_INTERVAL = 0.5        # seconds between stream polls
+WAIT_TIMEOUT = 3600        # give up if no enrichment run shows up / progresses for this long
+
+_LIVE_THREADS: Dict[str, Dict] = {}
+_LIVE_LOCK = threading.Lock()
+
+
+class LiveLeaderboard:
+    def __init__(self, user_root: str, top_n: int = 50):
+        self.user_root = Path(user_root)
+        self.outputs_dir = self.user_root / "outputs"
+        self.stream_file = self.outputs_dir / STREAM_FILE
+        self.snapshot_file = self.outputs_dir / SNAPSHOT_FILE
+        self.top_n = top_n
+        self.launched_at = datetime.utcnow().isoformat()
+        self._stop = threading.Event()
+        self._reset_run(None)
+
+    def _reset_run(self, start: Optional[Dict]):
+        self.run_id = (start or {}).get("_start")
+        self.run_started_at = (start or {}).get("started_at")
+        self._t0 = time.time()
+        if self.run_started_at:
+            try:  # measure from the enrichment run start, even when catching up mid-run
+                behind = (datetime.utcnow() - datetime.fromisoformat(self.run_started_at)).total_seconds()
+                self._t0 -= max(0.0, behind)
+            except ValueError:
+                pass
+        self._heap: List = []   # (score, seq, result) min-heap of the best top_n
+        self._seq = 0
+        self.scored = 0
+        self.qualified = 0
+        self.first_qualified_s: Optional[float] = None
+        self.done = False
+
+    # -----------------------------
+    # Scoring + snapshot
+    # -----------------------------
+    def _push(self, results: List[Dict]):
+        for r in results:
+            self.scored += 1
+            if r["score"] >= QUALIFIED_SCORE:
+                self.qualified += 1
+                if self.first_qualified_s is None:
+                    self.first_qualified_s = round(time.time() - self._t0, 2)
+                    logging.info(f"🎯 First qualified lead: {r['company']} ({r['score']}) after {self.first_qualified_s}s")
+            # negative seq: on equal scores the earlier record ranks first (like sorted())
+            item = (r["score"], -self._seq, r)
+            self._seq += 1
+            if len(self._heap) < self.top_n:
+                heapq.heappush(self._heap, item)
+            elif item[:2] > self._heap[0][:2]:
+                heapq.heapreplace(self._heap, item)
+
+    def snapshot(self) -> Dict:
+        ranked = [item[2] for item in sorted(self._heap, key=lambda x: x[:2], reverse=True)]
+        return {
+            "run_id": self.run_id,
+            "run_started_at": self.run_started_at,
+            "updated_at": datetime.utcnow().isoformat(),
+            "done": self.done,
+            "scored": self.scored,
+            "qualified": self.qualified,
+            "time_to_first_qualified_s": self.first_qualified_s,
+            "top_n": self.top_n,
+            "results": ranked,
+        }
+
+    def _publish(self):
+        tmp = self.snapshot_file.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.snapshot_file)
+
+    # -----------------------------
+    # Tail loop
+    # -----------------------------
+    def stop(self):
+        self._stop.set()
+
+    def _stream_head(self) -> Optional[bytes]:
+        try:
+            with open(self.stream_file, "rb") as f:
+                return f.readline()
+        except OSError:
+            return None
+
+    def run(self):
+        scorer = get_online_scorer(self.user_root)
+        offset, catching_up, last_progress = 0, True, time.time()
+        stale_run = None  # run that had already finished before we started
+        logging.info(f"📡 Live leaderboard following {self.stream_file}")
+
+        head = None  # first line of the stream ({"_start": ...}); changes when a new run rewrites the file
+        while not self._stop.is_set():
+            current = self._stream_head()
+            if current != head:
+                head, offset = current, 0
+            records, markers = [], []
+            if self.stream_file.exists():
+                with open(self.stream_file, "rb") as f:
+                    f.seek(offset)
+                    for line in iter(f.readline, b""):
+                        if not line.endswith(b"\n"):
+                            break  # partially written line; re-read next poll
+                        offset += len(line)
+                        try:
+                            rec = json.loads(line.decode("utf-8"))
+                        except (UnicodeDecodeError, json.JSONDecodeError):
+                            continue
+                        if "_start" in rec or "_done" in rec:
+                            markers.append((len(records), rec))
+                        else:
+                            records.append(rec)
+
+            # score in segments split by run markers
+            pos = 0
+            for idx, marker in markers + [(len(records), None)]:
+                if idx > pos:
+                    self._push(scorer.score(records[pos:idx]))
+                    pos = idx
+                if marker is None:
+                    break
+                if "_start" in marker:
+                    self._reset_run(marker)
+                else:
+                    self.done = True
+
+            if records or markers:
+                last_progress = time.time()
+                self._publish()
+
+            if self.done and catching_up and (self.run_started_at or "") < self.launched_at:
+                stale_run = self.run_id  # publish it, but keep waiting for the next run
+            if self.done and self.run_id != stale_run:
+                logging.info(f"🏁 Live leaderboard final: {self.scored} scored, {self.qualified} qualified")
+                return
+            catching_up = False
+            if time.time() - last_progress > WAIT_TIMEOUT:
+                logging.info("⌛ Live leaderboard idle timeout reached")
+                return
+            self._stop.wait(POLL_INTERVAL)
+
+
+def read_snapshot(user_root: str) -> Optional[Dict]:
+    path = Path(user_root) / "outputs" / SNAPSHOT_FILE
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# -------------------------
+# Module-level helpers (one background thread per user)
+# -------------------------
+def _thread_key(user_root: str) -> str:
+    return str(Path(user_root).resolve())
+
+
+def start_live_scoring(user_root: str, top_n: int = 50):
+    """
+    Start following the enrichment stream for the given user_root.
+    Idempotent: if a thread is already running it returns started=False.
+    """
+    key = _thread_key(user_root)
+    with _LIVE_LOCK:
+        entry = _LIVE_THREADS.get(key)
+        if entry and entry["thread"].is_alive():
+            return {"ok": True, "started": False, "message": "Live scoring already running"}
+        inst = LiveLeaderboard(user_root, top_n=top_n)
+        thr = threading.Thread(target=_live_thread_target, args=(inst,), daemon=True)
+        _LIVE_THREADS[key] = {"thread": thr, "instance": inst}
+        thr.start()
+        return {"ok": True, "started": True, "message": "Live scoring started in background"}
+
+
+def _live_thread_target(instance: LiveLeaderboard):
+    try:
+        instance.run()
+    except Exception:
+        logging.exception("Live leaderboard thread crashed")
+    finally:
+        with _LIVE_LOCK:
+            entry = _LIVE_THREADS.get(_thread_key(instance.user_root))
+            if entry and entry["instance"] is instance:
+                _LIVE_THREADS.pop(_thread_key(instance.user_root), None)
+
+
+def stop_live_scoring(user_root: str):
+    with _LIVE_LOCK:
+        entry = _LIVE_THREADS.get(_thread_key(user_root))
+    if entry:
+        entry["instance"].stop()
+        return {"ok": True, "message": "Stop requested"}
+    return {"ok": True, "message": "Live scoring not running"}
+
+
+def live_scoring_status(user_root: str):
+    with _LIVE_LOCK:
+        entry = _LIVE_THREADS.get(_thread_key(user_root))
+    running = bool(entry and entry["thread"].is_alive())
+    return {"ok": True, "running": running}
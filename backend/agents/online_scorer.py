@@ -0,0 +1,125 @@
+# agents/online_scorer.py
+"""
+Warm per-user scorer for synchronous (online) lead scoring
+------------------------------------------------------------
+- One OnlineScorer per user: model loaded and requirement profile compiled once,
+  then reused across API requests.
+- Requests are micro-batched: a worker thread collects requests arriving within
+  a few milliseconds and scores them with one batched encode
+  (extract_features_multi), then hands each caller its own results.
+- Scores are identical to scoring_agent (same features, same score_features math).
+- The scorer is rebuilt automatically when customer_requirements.json changes.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List
+
+from backend.agents.scoring_agent import (
+    MODEL_NAME, extract_features_multi, load_model, load_requirement_profile,
+)
+from backend.utils.lead_scoring import DEFAULT_WEIGHTS, score_features
+
+MAX_BATCH = 64          # max company records scored in one micro-batch
+MAX_WAIT_MS = 5         # how long the worker waits for more requests to join a batch
+REQUEST_TIMEOUT = 30    # seconds a caller waits for its results
+
+_SCORERS: Dict[str, "OnlineScorer"] = {}
+_SCORERS_LOCK = threading.Lock()
+
+
+class OnlineScorer:
+    def __init__(self, user_root: Path, max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS):
+        self.user_root = Path(user_root)
+        self.requirements_file = self.user_root / "inputs" / "customer_requirements.json"
+        self.requirements_mtime = self.requirements_file.stat().st_mtime
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+
+        self.profile = load_requirement_profile(self.user_root)
+        self.requirements = self.profile.requirements
+        self.weights = dict(DEFAULT_WEIGHTS)
+        self.model = load_model(MODEL_NAME)
+        self.model.encode(["warmup"])  # first encode pays one-off allocation costs
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._stopped = False
+        self._worker = threading.Thread(target=self._run, daemon=True, name=f"online-scorer-{self.user_root.name}")
+        self._worker.start()
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+    def score(self, companies: List[Dict], timeout: float = REQUEST_TIMEOUT) -> List[Dict]:
+        """Score enriched company records (same order as given)."""
+        if not companies:
+            return []
+        fut: Future = Future()
+        self._queue.put((companies, fut))
+        return fut.result(timeout=timeout)
+
+    def stop(self):
+        self._stopped = True
+        self._queue.put(None)
+
+    # -----------------------------
+    # Micro-batching worker
+    # -----------------------------
+    def _collect(self, first) -> List:
+        batch, size = [first], len(first[0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._stopped = True
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while not self._stopped:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = self._collect(first)
+            companies = [c for comps, _ in batch for c in comps]
+            try:
+                features = extract_features_multi(companies, [self.profile], model=self.model)[0]
+                results = [score_features(f, self.requirements, self.weights) for f in features]
+            except Exception as e:
+                logging.error(f"❌ Online scoring batch failed for {self.user_root.name}: {e}")
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            pos = 0
+            for comps, fut in batch:
+                fut.set_result(results[pos:pos + len(comps)])
+                pos += len(comps)
+
+
+def get_online_scorer(user_root: Path) -> OnlineScorer:
+    """Return the warm scorer for a user, (re)building it if requirements changed."""
+    user_root = Path(user_root)
+    key = str(user_root.resolve())
+    mtime = (user_root / "inputs" / "customer_requirements.json").stat().st_mtime
+    with _SCORERS_LOCK:
+        scorer = _SCORERS.get(key)
+        if scorer is not None and scorer.requirements_mtime == mtime:
+            return scorer
+        if scorer is not None:
+            scorer.stop()
+        scorer = OnlineScorer(user_root)
+        _SCORERS[key] = scorer
+        logging.info(f"🔥 Warm scorer ready for {user_root.name}")
+        return scorer
@@ -3,9 +3,22 @@
 Multi-user compatible Scoring Agent with MongoDB integration
 ------------------------------------------------------------
 - Reads inputs/outputs per user under /users/<user_id>/.
-- Keeps the original scoring logic unchanged.
-- Saves top-N scored companies to MongoDB (collection: lead_scores).
-- Writes JSON backups under /users/<user_id>/outputs/.
+- Requirement profile: customer_requirements.json is normalized, keyword-
+  expanded and embedded once, then cached under <user>/cache/ by content hash.
+- Candidates: for large corpora a lexical prefilter (utils/lexical_prefilter.py)
+  drops off-target companies without any encode, then an IVF ANN index
+  (utils/ann_index.py) keeps the companies nearest to the requirements.
+- Scoring: extract_features() computes raw similarity / fit features per
+  company and utils/lead_scoring.score_features() turns them into the score
+  (pure math, so /scoring can re-rank saved features with new weights).
+- Incremental: a per-user lead index (utils/lead_index.py) reuses features and
+  scores of unchanged companies and keeps the ranking for top-N.
+- Multi-profile: rank_variants() / rank_profiles() rank the corpus against
+  several ICP variants in one batched pass; score_all_users() scores every
+  tenant, encoding shared companies once.
+- Writes scored_companies.json, scoring_features.json and a timestamped JSON
+  backup under /users/<user_id>/outputs/, and the results to MongoDB
+  (user_outputs, via save_user_output).
 - Loads backend/.env automatically for MongoDB connection.
 """
 
@@ -13,9 +26,13 @@ import json
 import os
 import re
 import math
+import hashlib
 import logging
+import threading
+import time
 import uuid
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence
+from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
@@ -23,11 +40,54 @@ from sentence_transformers import SentenceTransformer, util
 import numpy as np
 from difflib import SequenceMatcher
 from backend.db.mongo import save_user_output
+from backend.utils.lead_scoring import DEFAULT_WEIGHTS, THRESHOLD_KEYS, score_features
+from backend.utils.lead_index import LeadIndex, company_keys, enrichment_hash
+from backend.utils.ann_index import IVFIndex
+from backend.utils.embedding_store import DEFAULT_CODEC, EmbeddingCodec, score_drift
+from backend.utils.lexical_prefilter import LexicalPrefilter, prefilter_recall
+from backend.utils.hq_matcher import HQMatcher
 
 # -----------------------------
 # Constants
 # -----------------------------
 MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+PROFILE_CACHE_DIRNAME = "cache"
+PROFILE_META_FILE = "requirement_profile.json"
+PROFILE_EMB_FILE = "requirement_profile.npz"
+FEATURES_VERSION = 2       # bump when feature extraction changes (invalidates lead indexes)
+
+# ANN candidate generation (only used for large corpora)
+ANN_MIN_CORPUS = 20000     # corpus size at which scoring switches to ANN candidates
+ANN_CANDIDATES = 3000      # nearest companies re-ranked with the full score_company logic
+PREFILTER_MIN_CORPUS = 2000  # corpus size at which the lexical prefilter discards off-target companies
+EMBEDDING_CODEC = os.getenv("SCORING_EMBEDDING_CODEC", DEFAULT_CODEC)  # ANN vector storage: float32 | float16 | pca128
+
+KEYWORD_EXPANSION_MAP = {
+    "payment": ["payments", "transaction", "gateway", "upi", "wallet", "billing", "checkout"],
+    "digital": ["online", "virtual", "cloud", "internet", "mobile", "web"],
+    "loan": ["credit", "financing", "borrow", "microloan", "debt", "lending"],
+    "credit": ["card", "debit", "score", "lending", "creditcard"],
+    "finance": ["financial", "fintech", "payments"],
+    "food": ["restaurant", "snack", "cafe", "tea", "beverage", "coffee", "delivery"],
+    "technology": ["tech", "software", "digital", "platform", "saas"],
+    "delivery": ["logistics", "shipping", "lastmile"],
+}
+
+GENERIC_INDUSTRY_TERMS = {
+    "technology", "tech", "information technology", "it", "software", "digital", "platform",
+    "internet", "online", "saas", "cloud", "it services"
+}
+
+DOMAIN_KEYWORD_HINTS = {
+    "food": {"food", "restaurant", "cafe", "tea", "coffee", "beverage", "snack", "dine"},
+    "finance": {"finance", "financial", "fintech", "payment", "payments", "loan", "credit", "wallet"},
+    "education": {"education", "edtech", "learning", "school", "tutor"},
+    "health": {"health", "healthcare", "med", "telehealth"},
+}
+
+# Process-wide model cache so repeated agent constructions don't reload weights
+_MODELS: Dict[str, SentenceTransformer] = {}
+_MODEL_LOCK = threading.Lock()
 
 # -----------------------------
 # Mongo setup
@@ -93,14 +153,6 @@ def parse_employees(emp_raw) -> int:
     return 0
 
 
-def logistic(x, k=5, x0=0.5):
-    """Smooth logistic weighting (boosts values >0.5)."""
-    try:
-        return 1.0 / (1.0 + math.exp(-k * (x - x0)))
-    except Exception:
-        return 0.0
-
-
 def cos_sim(a, b):
     """Compute cosine similarity between two vectors or tensors."""
     if a is None or b is None:
@@ -125,26 +177,259 @@ def cos_sim(a, b):
             return 0.0
 
 
+def load_model(model_name: str = MODEL_NAME) -> SentenceTransformer:
+    """Return a shared SentenceTransformer instance, loading it on first use."""
+    with _MODEL_LOCK:
+        model = _MODELS.get(model_name)
+        if model is None:
+            model = SentenceTransformer(model_name)
+            _MODELS[model_name] = model
+        return model
+
+
+def expand_keywords(keywords: List[str]) -> List[str]:
+    """Normalize preferred keywords and add their domain synonyms."""
+    kws = set()
+    for k in keywords or []:
+        nk = normalize(k)
+        kws.add(nk)
+        for ex in KEYWORD_EXPANSION_MAP.get(nk, []):
+            kws.add(normalize(ex))
+    return sorted(kws)
+
+
 # -----------------------------
-# Scoring Agent
+# Compiled requirement profile
 # -----------------------------
-class ScoringAgent:
-    GENERIC_INDUSTRY_TERMS = {
-        "technology", "tech", "information technology", "it", "software", "digital", "platform",
-        "internet", "online", "saas", "cloud", "it services"
+@dataclass
+class RequirementProfile:
+    """Normalized + embedded view of customer_requirements.json used by the scorer."""
+    requirements: Dict
+    industries: List[str]
+    keywords: List[str]
+    hq_text: str
+    domain_tokens: set = field(default_factory=set)
+    ind_embs: Optional[np.ndarray] = None
+    kw_emb: Optional[np.ndarray] = None
+    hq_emb: Optional[np.ndarray] = None
+    profile_hash: str = ""
+
+
+def requirements_hash(requirements_file: Path, model_name: str = MODEL_NAME) -> str:
+    """Content hash of the requirements file + model name (cache key for compiled profiles)."""
+    h = hashlib.sha256()
+    h.update(model_name.encode("utf-8"))
+    h.update(b"\0")
+    h.update(Path(requirements_file).read_bytes())
+    return h.hexdigest()
+
+
+def compile_requirement_profile(requirements: Dict, model: SentenceTransformer, profile_hash: str = "") -> RequirementProfile:
+    """Run keyword expansion + requirement encodes once and return the compiled profile."""
+    industries = [normalize(x) for x in requirements.get("industry", [])]
+    keywords = expand_keywords(requirements.get("preferred_keywords", []))
+    hq_text = " ".join(requirements.get("headquarters", []))
+
+    domain_tokens = set()
+    for ind in industries:
+        domain_tokens.update(re.findall(r"\b[a-z]{3,30}\b", ind))
+
+    return RequirementProfile(
+        requirements=requirements,
+        industries=industries,
+        keywords=keywords,
+        hq_text=hq_text,
+        domain_tokens=domain_tokens,
+        ind_embs=model.encode(industries) if industries else None,
+        kw_emb=model.encode(" ".join(keywords)) if keywords else None,
+        hq_emb=model.encode(hq_text) if hq_text else None,
+        profile_hash=profile_hash,
+    )
+
+
+def _profile_paths(user_root: Path):
+    cache_dir = Path(user_root) / PROFILE_CACHE_DIRNAME
+    return cache_dir, cache_dir / PROFILE_META_FILE, cache_dir / PROFILE_EMB_FILE
+
+
+def save_requirement_profile(profile: RequirementProfile, user_root: Path, model_name: str = MODEL_NAME):
+    """Persist a compiled profile under <user_root>/cache/ (embeddings first, metadata last)."""
+    cache_dir, meta_path, emb_path = _profile_paths(user_root)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    arrays = {}
+    for key in ("ind_embs", "kw_emb", "hq_emb"):
+        val = getattr(profile, key)
+        if val is not None:
+            arrays[key] = np.asarray(val, dtype=np.float32)
+    tmp_emb = emb_path.with_suffix(".tmp.npz")
+    np.savez(tmp_emb, **arrays)
+    os.replace(tmp_emb, emb_path)
+
+    meta = {
+        "profile_hash": profile.profile_hash,
+        "model": model_name,
+        "industries": profile.industries,
+        "keywords": profile.keywords,
+        "hq_text": profile.hq_text,
+        "domain_tokens": sorted(profile.domain_tokens),
+        "compiled_at": datetime.utcnow().isoformat(),
     }
+    tmp_meta = meta_path.with_suffix(".tmp")
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_meta, meta_path)
+
 
-    DOMAIN_KEYWORD_HINTS = {
-        "food": {"food", "restaurant", "cafe", "tea", "coffee", "beverage", "snack", "dine"},
-        "finance": {"finance", "financial", "fintech", "payment", "payments", "loan", "credit", "wallet"},
-        "education": {"education", "edtech", "learning", "school", "tutor"},
-        "health": {"health", "healthcare", "med", "telehealth"},
+def _load_cached_profile(user_root: Path, requirements: Dict, profile_hash: str) -> Optional[RequirementProfile]:
+    _, meta_path, emb_path = _profile_paths(user_root)
+    if not meta_path.exists() or not emb_path.exists():
+        return None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("profile_hash") != profile_hash:
+            return None
+        with np.load(emb_path) as npz:
+            arrays = {k: npz[k] for k in npz.files}
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable requirement profile cache: {e}")
+        return None
+
+    return RequirementProfile(
+        requirements=requirements,
+        industries=meta.get("industries", []),
+        keywords=meta.get("keywords", []),
+        hq_text=meta.get("hq_text", ""),
+        domain_tokens=set(meta.get("domain_tokens", [])),
+        ind_embs=arrays.get("ind_embs"),
+        kw_emb=arrays.get("kw_emb"),
+        hq_emb=arrays.get("hq_emb"),
+        profile_hash=profile_hash,
+    )
+
+
+def load_requirement_profile(user_root: Path, model_name: str = MODEL_NAME, force: bool = False) -> RequirementProfile:
+    """
+    Return the compiled requirement profile for a user.
+    Loads <user_root>/cache/requirement_profile.* when its hash matches the current
+    requirements file + model; otherwise compiles it (one model pass) and caches it.
+    """
+    requirements_file = Path(user_root) / "inputs" / "customer_requirements.json"
+    with open(requirements_file, "r", encoding="utf-8") as f:
+        requirements = json.load(f)
+    profile_hash = requirements_hash(requirements_file, model_name)
+
+    if not force:
+        cached = _load_cached_profile(user_root, requirements, profile_hash)
+        if cached is not None:
+            logging.info(f"Loaded compiled requirement profile ({profile_hash[:12]})")
+            return cached
+
+    logging.info(f"Compiling requirement profile ({profile_hash[:12]}) with {model_name}")
+    profile = compile_requirement_profile(requirements, load_model(model_name), profile_hash)
+    try:
+        save_requirement_profile(profile, user_root, model_name)
+    except Exception as e:
+        logging.warning(f"Failed to cache requirement profile: {e}")
+    return profile
+
+
+# -----------------------------
+# Company-side feature helpers (shared by single- and multi-profile scoring)
+# -----------------------------
+def extract_keywords(company: Dict) -> List[str]:
+    s = company.get("structured_info", {}) or {}
+    parts = [
+        s.get("description", "") or "",
+        " ".join(map(str, s.get("products", []) or [])),
+        " ".join(map(str, s.get("services", []) or [])),
+        company.get("description", "") or "",
+    ]
+    text = " ".join(parts).lower()
+    tokens = re.findall(r"\b[a-z]{3,30}\b", text)
+    return sorted({normalize(t) for t in tokens if len(t) >= 3})
+
+
+def detect_domain_hint(industry_text: str, req_domain_tokens: set) -> str:
+    it = industry_text.lower()
+    for domain, hintset in DOMAIN_KEYWORD_HINTS.items():
+        if any(h in it for h in hintset):
+            return domain
+    for token in req_domain_tokens:
+        for domain, hintset in DOMAIN_KEYWORD_HINTS.items():
+            if token in hintset and token in it:
+                return domain
+    return ""
+
+
+def assemble_features(company: Dict, profile: RequirementProfile, ind_text: str, ind_sim: float,
+                      company_kw: List[str], kw_sem_sim: float, hq_sim: float) -> Dict:
+    """Combine similarity values with the non-semantic company fields into a feature dict."""
+    s = company.get("structured_info", {}) or {}
+    ind_text_norm = normalize(ind_text)
+
+    # Apply generic-technology downweight and domain+tech boost
+    low_generic_penalty = 0.75  # multiply ind_sim by this if industry is generic-tech only
+    hybrid_boost = 1.2        # multiply if we detect domain + tech hybrid (e.g., Food + Tech)
+    # detect if company industry contains generic tech terms
+    industry_tokens = set(re.findall(r"\b[a-z]{3,30}\b", ind_text_norm))
+    has_generic_term = bool(industry_tokens & GENERIC_INDUSTRY_TERMS)
+    # detect domain hint; a generic-tech industry with a clear domain token is a hybrid
+    domain_hint = detect_domain_hint(ind_text_norm, profile.domain_tokens)
+    is_hybrid = bool(has_generic_term and domain_hint)
+
+    adj_ind_sim = ind_sim
+    if has_generic_term and not is_hybrid:
+        adj_ind_sim = adj_ind_sim * low_generic_penalty
+    if is_hybrid:
+        adj_ind_sim = min(1.0, adj_ind_sim * hybrid_boost)
+
+    exact_overlap = sorted(list(set(company_kw) & set(profile.keywords)))
+
+    # Founded year (None when missing / unparseable)
+    founded_year = None
+    try:
+        fy_raw = s.get("founded_year", None)
+        if fy_raw:
+            founded_year = int(str(fy_raw)[:4])
+    except Exception:
+        founded_year = None
+
+    return {
+        "company": company.get("company"),
+        "industry_text": ind_text,
+        "industry_sim": float(ind_sim),
+        "industry_sim_adj": float(adj_ind_sim),
+        "keyword_sem_sim": float(kw_sem_sim),
+        "keyword_overlap": exact_overlap,
+        "keyword_overlap_frac": len(exact_overlap) / max(1, len(profile.keywords)),
+        "hq_sim": float(hq_sim),
+        "funding_signal": float(company.get("funding_signal", 0) or 0),
+        "expansion_signal": float(company.get("expansion_signal", 0) or 0),
+        "negative_signal": float(company.get("negative_signal", 0) or 0),
+        "hiring": bool(company.get("hiring")),
+        "founded_year": founded_year,
+        "employees": parse_employees(s.get("employees_count", "") or ""),
     }
 
-    def __init__(self, user_root: str = None):
+
+# -----------------------------
+# Scoring Agent
+# -----------------------------
+class ScoringAgent:
+    GENERIC_INDUSTRY_TERMS = GENERIC_INDUSTRY_TERMS
+    DOMAIN_KEYWORD_HINTS = DOMAIN_KEYWORD_HINTS
+
+    def __init__(self, user_root: str = None, ann_min_corpus: int = ANN_MIN_CORPUS,
+                 ann_candidates: int = ANN_CANDIDATES, prefilter_min_corpus: int = PREFILTER_MIN_CORPUS,
+                 embedding_codec: str = EMBEDDING_CODEC):
         """
         user_root: Path to user's folder (e.g., users/user_demo).
         If None, defaults to backend/ for backward compatibility.
+        ann_min_corpus: corpus size from which only ANN candidates are fully scored (0 disables).
+        ann_candidates: number of ANN candidates re-ranked by score_company.
+        prefilter_min_corpus: corpus size from which the lexical prefilter runs first (0 disables).
         """
         self.project_root = Path(__file__).resolve().parents[1]
         if user_root:
@@ -171,6 +456,13 @@ class ScoringAgent:
         self.requirements_file = self.inputs_dir / "customer_requirements.json"
         self.companies_file = self.outputs_dir / "enriched_companies.json"
         self.output_file = self.outputs_dir / "scored_companies.json"
+        self.features_file = self.outputs_dir / "scoring_features.json"
+        self.lead_index_file = self.user_root / PROFILE_CACHE_DIRNAME / "lead_index.json"
+        self.ann_index_dir = self.user_root / PROFILE_CACHE_DIRNAME / "ann_index"
+        self.ann_min_corpus = ann_min_corpus
+        self.ann_candidates = ann_candidates
+        self.prefilter_min_corpus = prefilter_min_corpus
+        self.embedding_codec = embedding_codec
 
         # Load inputs
         if not self.requirements_file.exists() or not self.companies_file.exists():
@@ -183,37 +475,25 @@ class ScoringAgent:
             self.companies = json.load(f)
 
         # Weights (kept same)
-        self.weights = {
-            "industry": 38, "keywords": 32, "hq": 10,
-            "funding": 7, "expansion": 6, "negative": -8,
-            "momentum": 4, "hiring": 6, "founded_year": 3, "employees": 3,
-        }
-
-        # Sentence-transformers model
-        self.model = SentenceTransformer(MODEL_NAME)
-
-        # Prepare embeddings
-        self.req_industries = [normalize(x) for x in self.requirements.get("industry", [])]
-        self.req_kw_list = self._expand_keywords(self.requirements.get("preferred_keywords", []))
-        self.req_hq_text = " ".join(self.requirements.get("headquarters", []))
-
-        self.req_ind_embs = (
-            self.model.encode(self.req_industries, convert_to_tensor=True)
-            if self.req_industries else None
-        )
-        self.req_kw_emb = (
-            self.model.encode(" ".join(self.req_kw_list), convert_to_tensor=True)
-            if self.req_kw_list else None
-        )
-        self.req_hq_emb = (
-            self.model.encode(self.req_hq_text, convert_to_tensor=True)
-            if self.req_hq_text else None
-        )
-
-        self._req_domain_tokens = set()
-        for ind in self.req_industries:
-            toks = re.findall(r"\b[a-z]{3,30}\b", ind)
-            self._req_domain_tokens.update(toks)
+        self.weights = dict(DEFAULT_WEIGHTS)
+
+        # Requirement profile (normalized + embedded requirements), cached by content hash
+        self.profile = load_requirement_profile(self.user_root)
+        self.req_industries = self.profile.industries
+        self.req_kw_list = self.profile.keywords
+        self.req_hq_text = self.profile.hq_text
+        self.req_ind_embs = self.profile.ind_embs
+        self.req_kw_emb = self.profile.kw_emb
+        self.req_hq_emb = self.profile.hq_emb
+        self._req_domain_tokens = self.profile.domain_tokens
+        self.prefilter = LexicalPrefilter(self.req_industries, self.req_kw_list)
+        self.hq_matcher = HQMatcher(self.requirements.get("headquarters", []))
+        self._hq_sims: Dict[str, float] = {}
+
+    @property
+    def model(self) -> SentenceTransformer:
+        """Sentence-transformers model, loaded lazily (only needed for company encodes)."""
+        return load_model(MODEL_NAME)
 
     # -----------------------------
     def _setup_logging(self):
@@ -231,58 +511,26 @@ class ScoringAgent:
 
     # -----------------------------
     def _expand_keywords(self, keywords: List[str]) -> List[str]:
-        expansion_map = {
-            "payment": ["payments", "transaction", "gateway", "upi", "wallet", "billing", "checkout"],
-            "digital": ["online", "virtual", "cloud", "internet", "mobile", "web"],
-            "loan": ["credit", "financing", "borrow", "microloan", "debt", "lending"],
-            "credit": ["card", "debit", "score", "lending", "creditcard"],
-            "finance": ["financial", "fintech", "payments"],
-            "food": ["restaurant", "snack", "cafe", "tea", "beverage", "coffee", "delivery"],
-            "technology": ["tech", "software", "digital", "platform", "saas"],
-            "delivery": ["logistics", "shipping", "lastmile"],
-        }
-        kws = set()
-        for k in keywords or []:
-            nk = normalize(k)
-            kws.add(nk)
-            for ex in expansion_map.get(nk, []):
-                kws.add(normalize(ex))
-        return sorted(kws)
+        return expand_keywords(keywords)
 
 # -----------------------------
     # Rest of logic stays EXACTLY the same (scoring logic untouched)
     # -----------------------------
     def extract_keywords(self, company: Dict) -> List[str]:
-        s = company.get("structured_info", {}) or {}
-        parts = [
-            s.get("description", "") or "",
-            " ".join(map(str, s.get("products", []) or [])),
-            " ".join(map(str, s.get("services", []) or [])),
-            company.get("description", "") or "",
-        ]
-        text = " ".join(parts).lower()
-        tokens = re.findall(r"\b[a-z]{3,30}\b", text)
-        return sorted({normalize(t) for t in tokens if len(t) >= 3})
+        return extract_keywords(company)
 
     def _detect_domain_hint(self, industry_text: str) -> str:
-        it = industry_text.lower()
-        for domain, hintset in self.DOMAIN_KEYWORD_HINTS.items():
-            if any(h in it for h in hintset):
-                return domain
-        for token in self._req_domain_tokens:
-            for domain, hintset in self.DOMAIN_KEYWORD_HINTS.items():
-                if token in hintset and token in it:
-                    return domain
-        return ""
+        return detect_domain_hint(industry_text, self._req_domain_tokens)
 
     # -----------------------------
-    # Full scoring logic unchanged
+    # Feature extraction (encodes) + scoring (pure math in utils.lead_scoring)
     # -----------------------------
-    def score_company(self, company: Dict) -> Dict:
+    def extract_features(self, company: Dict) -> Dict:
+        """
+        Compute the raw, weight-independent scoring features for one company.
+        These are persisted so leads can be re-ranked with new weights without re-encoding.
+        """
         s = company.get("structured_info", {}) or {}
-        breakdown = {}
-        reasons = []
-        total = 0.0
 
         # normalize industry text
         ind_text = (s.get("industry") or "")
@@ -304,197 +552,220 @@ class ScoringAgent:
             ratios = [SequenceMatcher(None, ind_text_norm, req).ratio() for req in self.req_industries] if self.req_industries else [0.0]
             ind_sim = max(ratios) if ratios else 0.0
 
-        # Apply generic-technology downweight and domain+tech boost
-        low_generic_penalty = 0.75  # multiply ind_sim by this if industry is generic-tech only
-        hybrid_boost = 1.2        # multiply if we detect domain + tech hybrid (e.g., Food + Tech)
-        # detect if company industry contains generic tech terms
-        industry_tokens = set(re.findall(r"\b[a-z]{3,30}\b", ind_text_norm))
-        has_generic_term = bool(industry_tokens & self.GENERIC_INDUSTRY_TERMS)
-        # detect domain hint
-        domain_hint = self._detect_domain_hint(ind_text_norm)
-        # check if requirements contain a specific domain (not only "technology")
-        req_domains_non_generic = [r for r in self.req_industries if not any(g in r for g in self.GENERIC_INDUSTRY_TERMS)]
-        is_hybrid = False
-        if has_generic_term:
-            # if also contains a clear domain token (like 'food' or 'restaurant'), consider hybrid
-            if domain_hint:
-                is_hybrid = True
-
-        # apply transformations
-        adj_ind_sim = ind_sim
-        if has_generic_term and not is_hybrid:
-            adj_ind_sim = adj_ind_sim * low_generic_penalty
-        if is_hybrid:
-            adj_ind_sim = min(1.0, adj_ind_sim * hybrid_boost)
-
-        industry_score = self.weights["industry"] * adj_ind_sim
-        breakdown["industry"] = round(industry_score, 3)
-        if adj_ind_sim > 0.8:
-            reasons.append(f"Strong industry alignment ({ind_text})")
-        elif adj_ind_sim > 0.5:
-            reasons.append(f"Partial industry similarity ({ind_text})")
-        total += industry_score
-
         # --- Keywords (expanded + semantic)
         company_kw = self.extract_keywords(company)
         company_kw_text = " ".join(company_kw)
         company_kw_emb = self.model.encode(company_kw_text, convert_to_tensor=True) if company_kw_text else None
-        req_kw_text = " ".join(self.req_kw_list)
-        req_kw_emb = self.req_kw_emb
-
-        kw_sem_sim = cos_sim(company_kw_emb, req_kw_emb) if company_kw_emb is not None and req_kw_emb is not None else 0.0
-        exact_overlap = sorted(list(set(company_kw) & set(self.req_kw_list)))
-        # combined score: semantic + exact overlap fraction
-        overlap_frac = (len(exact_overlap) / max(1, len(self.req_kw_list)))
-        kw_score = self.weights["keywords"] * (0.65 * kw_sem_sim + 0.35 * overlap_frac)
-        breakdown["keywords"] = round(kw_score, 3)
-        if exact_overlap:
-            reasons.append(f"Keywords matched: {', '.join(exact_overlap)}")
-        elif kw_sem_sim > 0.45:
-            reasons.append("Semantic keyword similarity detected")
-        total += kw_score
-
-        # --- HQ matching (robust to list or mixed types)
-        raw_hq = s.get("headquarters", "")
-        hq = normalize(raw_hq)
-        req_hq_text_norm = normalize(self.req_hq_text or "")
-        hq_sim = SequenceMatcher(None, hq, req_hq_text_norm).ratio() if hq and req_hq_text_norm else 0.0
-        hq_score = self.weights["hq"] * hq_sim
-        breakdown["hq"] = round(hq_score, 3)
-        if hq_sim > 0.8:
-            reasons.append("HQ region matches")
-        elif hq_sim > 0.5:
-            reasons.append("HQ region partially matches")
-        total += hq_score
-
-
-        # --- Signals: funding, expansion, negative (contextualized by industry relevance)
-        f = float(company.get("funding_signal", 0) or 0)
-        e = float(company.get("expansion_signal", 0) or 0)
-        n = float(company.get("negative_signal", 0) or 0)
-
-        # domain_factor reduces signal impact when industry relevance is low
-        domain_factor = 0.5 + 0.5 * adj_ind_sim
-        funding_score = self.weights["funding"] * logistic(f) * domain_factor
-        expansion_score = self.weights["expansion"] * logistic(e) * domain_factor
-        negative_score = self.weights["negative"] * n  # negative weight already negative value
-        breakdown["funding"] = round(funding_score, 3)
-        breakdown["expansion"] = round(expansion_score, 3)
-        breakdown["negative"] = round(negative_score, 3)
-        if f >= self.requirements.get("min_funding_signal", 0.0):
-            # treat meeting threshold as positive
-            reasons.append("Meets funding threshold")
-        if f >= 0.7:
-            reasons.append("Strong funding momentum")
-        if e >= 0.5:
-            reasons.append("Active expansion observed")
-        if n >= self.requirements.get("max_negative_signal", 1.0):
-            reasons.append("High negative sentiment detected")
-        total += funding_score + expansion_score + negative_score
-
-        # --- Momentum (derived)
-        momentum = max(0.0, (f + e - n) / 2.0) * domain_factor
-        momentum_score = self.weights["momentum"] * momentum
-        breakdown["momentum"] = round(momentum_score, 3)
-        if momentum >= 0.6:
-            reasons.append("High momentum (growth health)")
-        total += momentum_score
-
-        # --- Hiring requirement
-        hiring_req = self.requirements.get("hiring_required", False)
-        if hiring_req:
-            if company.get("hiring"):
-                hiring_score = self.weights["hiring"]
-                reasons.append("Actively hiring")
-            else:
-                hiring_score = -abs(self.weights["hiring"]) * 0.5
-                reasons.append("Not hiring (requirement unmet)")
+        kw_sem_sim = cos_sim(company_kw_emb, self.req_kw_emb) if company_kw_emb is not None and self.req_kw_emb is not None else 0.0
+
+        # --- HQ matching (robust to list or mixed types), per requirement city via gazetteer
+        hq = normalize(s.get("headquarters", ""))
+        hq_sim = self._hq_sims.get(hq)
+        if hq_sim is None:
+            hq_sim = self.hq_matcher.score(hq) if hq else 0.0
+
+        return self._assemble_features(company, ind_text, ind_sim, company_kw, kw_sem_sim, hq_sim)
+
+    def _assemble_features(self, company: Dict, ind_text: str, ind_sim: float,
+                           company_kw: List[str], kw_sem_sim: float, hq_sim: float) -> Dict:
+        return assemble_features(company, self.profile, ind_text, ind_sim, company_kw, kw_sem_sim, hq_sim)
+
+    def score_company(self, company: Dict) -> Dict:
+        return score_features(self.extract_features(company), self.requirements, self.weights)
+
+    # -----------------------------
+    # ANN candidate generation (large corpora)
+    # -----------------------------
+    def _encode_company_vectors(self, companies: List[Dict]) -> np.ndarray:
+        """Batch-encode [industry | keywords] vectors used by the ANN index (halves weighted equally)."""
+        ind_texts = [normalize((c.get("structured_info", {}) or {}).get("industry") or "") for c in companies]
+        kw_texts = [" ".join(self.extract_keywords(c)) for c in companies]
+        halves = []
+        for texts in (ind_texts, kw_texts):
+            embs = np.asarray(self.model.encode(texts, batch_size=256), dtype=np.float32)
+            embs[[not t for t in texts]] = 0.0
+            norms = np.maximum(np.linalg.norm(embs, axis=1, keepdims=True), 1e-12)
+            halves.append(embs / norms * math.sqrt(0.5))
+        return np.hstack(halves)
+
+    def _requirement_queries(self) -> Optional[np.ndarray]:
+        """One ANN query per requested industry, each paired with the keyword embedding."""
+        dim = self.model.get_sentence_embedding_dimension()
+        kw = np.asarray(self.req_kw_emb, dtype=np.float32) if self.req_kw_emb is not None else np.zeros(dim, dtype=np.float32)
+        kw = kw / max(float(np.linalg.norm(kw)), 1e-12)
+        if self.req_ind_embs is not None and len(self.req_ind_embs):
+            inds = np.asarray(self.req_ind_embs, dtype=np.float32)
+            inds = inds / np.maximum(np.linalg.norm(inds, axis=1, keepdims=True), 1e-12)
+        elif self.req_kw_emb is not None:
+            inds = np.zeros((1, dim), dtype=np.float32)
         else:
-            hiring_score = 0.0
-        breakdown["hiring"] = round(hiring_score, 3)
-        total += hiring_score
+            return None
+        return np.hstack([inds, np.repeat(kw[None, :], len(inds), axis=0)]) * math.sqrt(0.5)
 
-        # --- Founded year freshness
-        fy_score = 0.0
+    def candidate_companies(self, k: int, companies: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        Sync the persistent ANN index with the corpus (encoding only new/changed
+        companies) and return the ~k companies nearest to the requirements, in corpus order.
+        """
+        companies = self.companies if companies is None else companies
+        queries = self._requirement_queries()
+        if queries is None:
+            return list(companies)
+
+        index = IVFIndex(self.ann_index_dir, tag=MODEL_NAME, codec=self.embedding_codec)
+        keys = company_keys(companies)
+        hashes = [enrichment_hash(c) for c in companies]
+        index.remove(list(set(index.live_keys()) - set(keys)))
+        stale = [i for i, (key, h) in enumerate(zip(keys, hashes)) if index.hash_of(key) != h]
+        if stale:
+            logging.info(f"ANN index: encoding {len(stale)} new/changed companies")
+            vectors = self._encode_company_vectors([companies[i] for i in stale])
+            index.add([keys[i] for i in stale], vectors, [hashes[i] for i in stale])
         try:
-            fy_raw = s.get("founded_year", None)
-            if fy_raw:
-                fy = int(str(fy_raw)[:4])
-                after = int(self.requirements.get("founded_after", 0) or 0)
-                if after and fy >= after:
-                    # map (fy-after) into [0..1] then logistic
-                    val = (fy - after) / max(1.0, (2025 - after))  # normalized horizon (2025 as rough cap)
-                    freshness = logistic(val, k=6, x0=0.2)
-                    fy_score = self.weights["founded_year"] * freshness
-                    reasons.append(f"Founded recently ({fy})")
-        except Exception:
-            fy_score = 0.0
-        breakdown["founded_year"] = round(fy_score, 3)
-        total += fy_score
-
-        # --- Employees
-        emp_score = 0.0
-        emp_val = parse_employees(s.get("employees_count", "") or "")
-        if emp_val > 0:
-            low, high = self.requirements.get("employee_range", [0, 99999999])
-            if low <= emp_val <= high:
-                emp_score = self.weights["employees"]
-                reasons.append(f"Employee size within target ({emp_val})")
-            elif (low * 0.8) <= emp_val <= (high * 1.2):
-                emp_score = self.weights["employees"] * 0.6
-                reasons.append(f"Employee size near target ({emp_val})")
-        breakdown["employees"] = round(emp_score, 3)
-        total += emp_score
-
-        # --- Industry irrelevance gate: cap final score if industry similarity is very low
-        if adj_ind_sim < 0.35:
-            total = min(total, 40.0)
-
-        # --- final score & label
-        final_score = max(0.0, min(100.0, round(total, 2)))
-        if final_score >= 75:
-            fit_label = "Excellent Match"
-        elif final_score >= 45:
-            fit_label = "Moderate Match"
-        else:
-            fit_label = "Low Match"
-
-        # Ensure consistent ordering in breakdown
-        ordered_breakdown = {
-            "industry": breakdown.get("industry", 0.0),
-            "keywords": breakdown.get("keywords", 0.0),
-            "hq": breakdown.get("hq", 0.0),
-            "funding": breakdown.get("funding", 0.0),
-            "expansion": breakdown.get("expansion", 0.0),
-            "negative": breakdown.get("negative", 0.0),
-            "momentum": breakdown.get("momentum", 0.0),
-            "hiring": breakdown.get("hiring", 0.0),
-            "founded_year": breakdown.get("founded_year", 0.0),
-            "employees": breakdown.get("employees", 0.0),
-            "total": final_score,
-        }
+            index.save()
+        except Exception as e:
+            logging.warning(f"Failed to save ANN index: {e}")
+
+        pos = {key: i for i, key in enumerate(keys)}
+        hits = index.search(queries, k)
+        logging.info(f"ANN candidates: {len(hits)} of {len(keys)} companies")
+        return [companies[i] for i in sorted(pos[key] for key, _ in hits)]
+
+    def embedding_drift(self, sample: int = 2000, k: int = 50) -> Dict:
+        """Score drift of the configured embedding codec vs full precision on a corpus sample."""
+        queries = self._requirement_queries()
+        if queries is None or not self.companies:
+            return {}
+        rng = np.random.default_rng(13)
+        idx = rng.choice(len(self.companies), min(sample, len(self.companies)), replace=False)
+        full = self._encode_company_vectors([self.companies[i] for i in idx])
+        codec = EmbeddingCodec(self.embedding_codec).fit(full)
+        report = score_drift(full, codec, queries, k=k)
+        logging.info(f"Embedding drift: {report}")
+        return report
 
-        return {
-            "company": company.get("company"),
-            "score": final_score,
-            "fit_label": fit_label,
-            "breakdown": ordered_breakdown,
-            "reasons": reasons,
-        }
+    # -----------------------------
+    # Lexical prefilter (stage 1: no encodes)
+    # -----------------------------
+    def lexical_survivors(self, companies: List[Dict]) -> List[Dict]:
+        industries = [normalize((c.get("structured_info", {}) or {}).get("industry") or "") for c in companies]
+        keywords = [self.extract_keywords(c) for c in companies]
+        keep = self.prefilter.survivors(industries, keywords)
+        logging.info(f"Lexical prefilter: {len(keep)} of {len(companies)} companies survive "
+                     f"({self.prefilter.last_stats.get('survivor_rate', 1.0):.1%})")
+        return [companies[i] for i in keep]
+
+    def prefilter_recall(self, top_n: int = 50) -> Dict:
+        """Score the full corpus and report how much of its top-N the prefilter keeps."""
+        full = sorted((self.score_company(c) for c in self.companies), key=lambda x: x["score"], reverse=True)
+        survivors = {c.get("company") for c in self.lexical_survivors(self.companies)}
+        report = prefilter_recall(full, survivors, top_n=top_n)
+        logging.info(f"Prefilter recall: {report}")
+        return report
+
+    def _companies_to_score(self, top_n: int) -> List[Dict]:
+        companies = self.companies
+        if self.prefilter_min_corpus and len(companies) >= self.prefilter_min_corpus:
+            companies = self.lexical_survivors(companies)
+        if self.ann_min_corpus and len(companies) >= self.ann_min_corpus:
+            companies = self.candidate_companies(max(self.ann_candidates, top_n), companies)
+        return companies
 
     # -----------------------------
     def rank_companies(self, top_n=15):
-        results = [self.score_company(c) for c in self.companies]
+        results = [self.score_company(c) for c in self._companies_to_score(top_n)]
         return sorted(results, key=lambda x: x["score"], reverse=True)[:top_n]
 
+    def _precompute_hq(self, companies: List[Dict]):
+        """Score all distinct company HQs in one RapidFuzz batch (looked up by extract_features)."""
+        hqs = sorted({normalize((c.get("structured_info", {}) or {}).get("headquarters", "")) for c in companies} - {""})
+        self._hq_sims.update(zip(hqs, self.hq_matcher.score_batch(hqs).tolist()))
+
+    def _scoring_hash(self) -> str:
+        """Lead index tag: changes whenever requirements, model or weights change."""
+        raw = f"{FEATURES_VERSION}|{self.profile.profile_hash}|{json.dumps(self.weights, sort_keys=True)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _index_entry(self, company: Dict) -> Dict:
+        features = self.extract_features(company)
+        return {"features": features, "result": score_features(features, self.requirements, self.weights)}
+
+    def _save_features(self, features: List[Dict]):
+        """Persist per-company raw features (+ thresholds/weights used) for /scoring re-ranking."""
+        doc = {
+            "user_id": self.user_id,
+            "profile_hash": self.profile.profile_hash,
+            "created_at": datetime.utcnow().isoformat(),
+            "weights": self.weights,
+            "requirements": {k: self.requirements[k] for k in THRESHOLD_KEYS if k in self.requirements},
+            "features": features,
+        }
+        try:
+            with open(self.features_file, "w", encoding="utf-8") as f:
+                json.dump(doc, f, ensure_ascii=False)
+            logging.info(f"Saved scoring features for {len(features)} companies → {self.features_file}")
+        except Exception as e:
+            logging.exception(f"Failed to write scoring features: {e}")
+
     def run(self, top_n=50):
         """Run scoring, persist results to JSON + MongoDB."""
         logging.info("🚀 Starting scoring process...")
-        from copy import deepcopy
 
-        # reuse original rank_companies logic
-        results = [self.score_company(c) for c in self.companies]
-        results_sorted = sorted(results, key=lambda x: x["score"], reverse=True)[:top_n]
+        # per-phase wall times (seconds), read by benchmarks/scoring_benchmark.py
+        timings, t0 = {}, time.perf_counter()
+
+        # incremental: only new/changed companies (or all, if requirements changed) are re-encoded
+        index = LeadIndex(self.lead_index_file)
+        self.prefilter.last_stats = {}
+        companies = self._companies_to_score(top_n)
+        timings["candidates"], t0 = time.perf_counter() - t0, time.perf_counter()
+        self._precompute_hq(companies)
+        entries = index.sync(companies, self._scoring_hash(), self._index_entry)
+        features = [e["features"] for e in entries]
+        results = [e["result"] for e in entries]
+        timings["features_and_score"], t0 = time.perf_counter() - t0, time.perf_counter()
+        results_sorted = index.top_n(top_n)
+        timings["rank"], t0 = time.perf_counter() - t0, time.perf_counter()
+        try:
+            index.save()
+        except Exception as e:
+            logging.warning(f"Failed to save lead index: {e}")
+        self._save_features(features)
+        out = self._persist_results(results, results_sorted)
+        timings["write"] = time.perf_counter() - t0
+
+        self.last_run_stats = {"timings": timings, "scored": len(companies), "corpus": len(self.companies),
+                               **{f"index_{k}": v for k, v in index.last_stats.items()},
+                               **{f"prefilter_{k}": v for k, v in self.prefilter.last_stats.items()}}
+        return out
+
+    def rank_variants(self, variants: Optional[Dict[str, Dict]] = None, top_n: int = 50) -> Dict[str, List[Dict]]:
+        """
+        Rank this user's companies against several ICP variants in one batched pass.
+        variants: {name: requirements dict}; defaults to inputs/icp_variants/*.json.
+        The current customer_requirements.json is always included as "default".
+        Writes outputs/scored_variants.json.
+        """
+        if variants is None:
+            variants = {}
+            for path in sorted((self.inputs_dir / "icp_variants").glob("*.json")):
+                with open(path, "r", encoding="utf-8") as f:
+                    variants[path.stem] = json.load(f)
+
+        profiles = {"default": self.profile}
+        for name, reqs in variants.items():
+            profiles[name] = compile_requirement_profile(reqs, self.model)
+
+        rankings = rank_profiles(profiles, self.companies, top_n=top_n, weights=self.weights)
+        out_file = self.outputs_dir / "scored_variants.json"
+        with open(out_file, "w", encoding="utf-8") as f:
+            json.dump(rankings, f, indent=2, ensure_ascii=False)
+        logging.info(f"✅ Ranked {len(self.companies)} companies against {len(profiles)} profiles → {out_file}")
+        return rankings
+
+    def _persist_results(self, results: List[Dict], results_sorted: List[Dict]) -> List[Dict]:
+        """Write scored_companies.json, a timestamped backup and the Mongo user_outputs record."""
+        from copy import deepcopy
 
         # canonical JSON save
         with open(self.output_file, "w", encoding="utf-8") as f:
@@ -532,6 +803,130 @@ class ScoringAgent:
         print(f"✅ Scoring complete. Saved {len(results_sorted)} results to {self.output_file}")
         return results_sorted
 
+# -----------------------------
+# Multi-profile batched scoring
+# -----------------------------
+def _unit_rows(x) -> np.ndarray:
+    x = np.atleast_2d(np.asarray(x, dtype=np.float32))
+    return x / np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-12)
+
+
+def extract_features_multi(companies: List[Dict], profiles: List[RequirementProfile],
+                           rows_per_profile: Optional[List[Sequence[int]]] = None,
+                           model: SentenceTransformer = None) -> List[List[Dict]]:
+    """
+    Features for M companies against N requirement profiles in one batched pass.
+    Company texts are encoded once; industry and keyword similarities are a single
+    matrix multiply each (M x sum(industries), M x N).
+    rows_per_profile: optional company indices to assemble per profile (defaults to all).
+    Returns features[profile_idx] aligned with rows_per_profile[profile_idx].
+    """
+    model = model or load_model(MODEL_NAME)
+    M, N = len(companies), len(profiles)
+    if rows_per_profile is None:
+        rows_per_profile = [range(M)] * N
+
+    ind_texts, kw_lists, hq_norms = [], [], []
+    for c in companies:
+        s = c.get("structured_info", {}) or {}
+        ind_texts.append(s.get("industry") or "")
+        kw_lists.append(extract_keywords(c))
+        hq_norms.append(normalize(s.get("headquarters", "")))
+    ind_norms = [normalize(t) for t in ind_texts]
+    kw_texts = [" ".join(k) for k in kw_lists]
+
+    # --- Industry: max cosine over each profile's requested industries
+    ind_sims = np.zeros((M, N), dtype=np.float32)
+    ind_rows = [i for i, t in enumerate(ind_norms) if t]
+    with_ind = [p for p, prof in enumerate(profiles) if prof.ind_embs is not None and len(prof.ind_embs)]
+    if ind_rows and with_ind:
+        C = _unit_rows(model.encode([ind_norms[i] for i in ind_rows], batch_size=256))
+        R = _unit_rows(np.vstack([profiles[p].ind_embs for p in with_ind]))
+        sims = C @ R.T
+        starts = np.cumsum([0] + [len(profiles[p].ind_embs) for p in with_ind[:-1]])
+        ind_sims[np.ix_(ind_rows, with_ind)] = np.maximum.reduceat(sims, starts, axis=1)
+
+    # --- Keywords: cosine between company keyword text and each profile's keyword text
+    kw_sims = np.zeros((M, N), dtype=np.float32)
+    kw_rows = [i for i, t in enumerate(kw_texts) if t]
+    with_kw = [p for p, prof in enumerate(profiles) if prof.kw_emb is not None]
+    if kw_rows and with_kw:
+        K = _unit_rows(model.encode([kw_texts[i] for i in kw_rows], batch_size=256))
+        Q = _unit_rows(np.vstack([profiles[p].kw_emb for p in with_kw]))
+        kw_sims[np.ix_(kw_rows, with_kw)] = K @ Q.T
+
+    out = []
+    for p, prof in enumerate(profiles):
+        rows = list(rows_per_profile[p])
+        hq_sims = HQMatcher(prof.requirements.get("headquarters", [])).score_batch([hq_norms[i] for i in rows])
+        feats = []
+        for i, hq_sim in zip(rows, hq_sims.tolist()):
+            feats.append(assemble_features(
+                companies[i], prof, ind_texts[i], float(ind_sims[i, p]),
+                kw_lists[i], float(kw_sims[i, p]), hq_sim,
+            ))
+        out.append(feats)
+    return out
+
+
+def rank_profiles(profiles: Dict[str, RequirementProfile], companies: List[Dict],
+                  top_n: int = 50, weights: Optional[Dict] = None) -> Dict[str, List[Dict]]:
+    """Score one corpus against several requirement profiles and return per-profile rankings."""
+    names = list(profiles)
+    features = extract_features_multi(companies, [profiles[n] for n in names])
+    rankings = {}
+    for name, feats in zip(names, features):
+        results = [score_features(f, profiles[name].requirements, weights or DEFAULT_WEIGHTS) for f in feats]
+        rankings[name] = sorted(results, key=lambda x: x["score"], reverse=True)[:top_n]
+    return rankings
+
+
+def score_all_users(users_dir: Path = None, top_n: int = 50) -> Dict[str, int]:
+    """
+    Nightly batch: score every tenant in one pass.
+    Companies shared between tenants (same enrichment hash) are encoded once; each
+    tenant's ranking only covers its own enriched companies. Outputs are persisted
+    exactly like ScoringAgent.run (scored_companies.json, features, backup, Mongo).
+    """
+    users_dir = Path(users_dir) if users_dir else Path(__file__).resolve().parents[1] / "users"
+    agents: Dict[str, ScoringAgent] = {}
+    for user_path in sorted(p for p in users_dir.iterdir() if p.is_dir()):
+        try:
+            agents[user_path.name] = ScoringAgent(user_root=user_path)
+        except FileNotFoundError:
+            logging.info(f"Skipping {user_path.name}: missing scoring inputs")
+
+    union: List[Dict] = []
+    positions: Dict[str, int] = {}
+    tenant_rows: Dict[str, List[int]] = {}
+    for uid, agent in agents.items():
+        rows = []
+        for c in agent.companies:
+            h = enrichment_hash(c)
+            if h not in positions:
+                positions[h] = len(union)
+                union.append(c)
+            rows.append(positions[h])
+        tenant_rows[uid] = rows
+
+    uids = list(agents)
+    total_rows = sum(len(r) for r in tenant_rows.values())
+    logging.info(f"Batch scoring {len(uids)} tenants: {len(union)} unique of {total_rows} companies")
+    features = extract_features_multi(
+        union, [agents[u].profile for u in uids], rows_per_profile=[tenant_rows[u] for u in uids]
+    )
+
+    counts = {}
+    for uid, feats in zip(uids, features):
+        agent = agents[uid]
+        results = [score_features(f, agent.requirements, agent.weights) for f in feats]
+        results_sorted = sorted(results, key=lambda x: x["score"], reverse=True)[:top_n]
+        agent._save_features(feats)
+        agent._persist_results(results, results_sorted)
+        counts[uid] = len(results_sorted)
+    return counts
+
+
 # -----------------------------
 # Runner / Entrypoint
 # -----------------------------
@@ -555,6 +950,14 @@ def main(user_folder: str | None = None):
 if __name__ == "__main__":
     import sys
     user_arg = sys.argv[1] if len(sys.argv) >= 2 else None
+    if user_arg == "--all":
+        # nightly batch across every tenant (python agents/scoring_agent.py --all)
+        score_all_users()
+        sys.exit(0)
+    if len(sys.argv) >= 3 and sys.argv[2] == "--drift":
+        # embedding codec drift report (python agents/scoring_agent.py user_demo --drift)
+        print(json.dumps(ScoringAgent(user_root=str(Path("users") / user_arg)).embedding_drift(), indent=2))
+        sys.exit(0)
     if user_arg:
         user_folder = str(Path("users") / user_arg)
     else:
@@ -2,7 +2,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from backend.api.routes import users, agents, analytics, campaigns, data, auth
+from backend.api.routes import users, agents, analytics, campaigns, data, auth, scoring
 
 app = FastAPI(
     title="Agentic CRM Backend API",
@@ -27,6 +27,7 @@ app.include_router(campaigns.router, prefix="/campaigns", tags=["Campaigns"])
 app.include_router(data.router, prefix="/data", tags=["Data"])
 app.include_router(data.router, prefix="/users", tags=["User Data"])
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
+app.include_router(scoring.router, prefix="/scoring", tags=["Scoring"])
 
 
 @app.get("/")
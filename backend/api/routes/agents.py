@@ -7,6 +7,7 @@ import json
 import uuid
 import time
 import os
+import logging
 
 from backend.agents.agent_runner import enqueue_job, JOBS, USER_QUEUES
 
@@ -28,6 +29,17 @@ PIPELINE_ORDER = [
 ]
 
 
+def _start_live_leaderboard(user_path: Path):
+    """Follow enrichment output with the live scorer (best effort, needs customer requirements)."""
+    if not (user_path / "inputs" / "customer_requirements.json").exists():
+        return
+    try:
+        from backend.agents.live_leaderboard import start_live_scoring
+        start_live_scoring(str(user_path))
+    except Exception as e:
+        logging.warning(f"Live leaderboard not started for {user_path.name}: {e}")
+
+
 @router.get("/list")
 def list_available_agents():
     files = [p.name for p in AGENTS_DIR.glob("*.py") if p.is_file()]
@@ -51,6 +63,7 @@ def run_pipeline(user_id: str, background: bool = True):
             raise HTTPException(status_code=404, detail=f"Agent {agent_name} not found")
         jid = enqueue_job(user_id, agent_name, str(user_path))
         job_ids.append({"agent": agent_name, "job_id": jid})
+    _start_live_leaderboard(user_path)
     return {"status": "pipeline_queued", "jobs": job_ids}
 
 
@@ -69,6 +82,8 @@ def run_agent(user_id: str, agent_name: str, background: bool = True, bt: Backgr
         raise HTTPException(status_code=404, detail=f"Agent {agent_name} not found")
 
     job_id = enqueue_job(user_id, agent_name, str(user_path))
+    if agent_name == "enrichment_agent":
+        _start_live_leaderboard(user_path)
 
     return {"status": "queued", "job_id": job_id, "agent": agent_name, "user": user_id}
 
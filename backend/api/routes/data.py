@@ -1,4 +1,4 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, Form, HTTPException
 from pathlib import Path
 from backend.db.mongo import save_user_input
 import shutil
@@ -10,6 +10,17 @@ router = APIRouter()
 BASE = Path(__file__).resolve().parents[2]
 USERS_DIR = BASE / "users"
 
+
+def _rebuild_requirement_profile(user_path: Path):
+    """Recompile the scoring agent's cached requirement profile (runs in background)."""
+    try:
+        # imported lazily: pulls in sentence-transformers
+        from backend.agents.scoring_agent import load_requirement_profile
+        load_requirement_profile(user_path, force=True)
+    except Exception as e:
+        logging.error(f"Failed to rebuild requirement profile for {user_path.name}: {e}")
+
+
 @router.post("/{user_id}/upload_companies_csv")
 async def upload_companies_csv(user_id: str, file: UploadFile = File(...)):
     """
@@ -45,6 +56,7 @@ async def upload_companies_csv(user_id: str, file: UploadFile = File(...)):
 @router.post("/{user_id}/save_customer_requirements")
 async def save_customer_requirements(
     user_id: str,
+    bt: BackgroundTasks,
     requirements_json: str = Form(...),
     template_file: UploadFile = File(None)
 ):
@@ -74,4 +86,7 @@ async def save_customer_requirements(
 
     save_user_input(user_id, "customer_requirements", data)
 
+    # keep the scorer's compiled profile warm for the next scoring run
+    bt.add_task(_rebuild_requirement_profile, USERS_DIR / user_id)
+
     return {"message": "✅ customer_requirements.json saved", "path": str(json_path)}
@@ -0,0 +1,141 @@
+# backend/api/routes/scoring.py
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import json
+import threading
+import time
+
+from backend.utils.lead_scoring import DEFAULT_WEIGHTS, THRESHOLD_KEYS, score_features
+
+router = APIRouter()
+BASE = Path(__file__).resolve().parents[2]  # backend/
+USERS_DIR = BASE / "users"
+
+# Parsed scoring_features.json per user, invalidated by file mtime
+_FEATURES_CACHE: Dict[str, Dict[str, Any]] = {}
+_FEATURES_LOCK = threading.Lock()
+
+
+class ScoreRequest(BaseModel):
+    company: Optional[Dict[str, Any]] = None
+    companies: List[Dict[str, Any]] = []
+
+
+class ReweightRequest(BaseModel):
+    weights: Dict[str, float] = {}
+    thresholds: Dict[str, Any] = {}
+    top_n: int = 50
+
+
+def _load_features(user_id: str) -> Dict[str, Any]:
+    features_file = USERS_DIR / user_id / "outputs" / "scoring_features.json"
+    if not features_file.exists():
+        raise HTTPException(status_code=404, detail="No scoring features found. Run scoring_agent first.")
+    mtime = features_file.stat().st_mtime
+    with _FEATURES_LOCK:
+        cached = _FEATURES_CACHE.get(user_id)
+        if cached and cached["mtime"] == mtime:
+            return cached["doc"]
+    with open(features_file, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+    with _FEATURES_LOCK:
+        _FEATURES_CACHE[user_id] = {"mtime": mtime, "doc": doc}
+    return doc
+
+
+@router.post("/{user_id}/reweight")
+def reweight_leads(user_id: str, req: ReweightRequest):
+    """
+    Re-rank the last scoring run with caller-supplied weights / thresholds.
+    Uses the raw features persisted by scoring_agent (no model, no re-encoding).
+    """
+    if not (USERS_DIR / user_id).exists():
+        raise HTTPException(status_code=404, detail="User not found")
+
+    unknown = set(req.weights) - set(DEFAULT_WEIGHTS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown weight keys: {sorted(unknown)}")
+    unknown = set(req.thresholds) - set(THRESHOLD_KEYS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown threshold keys: {sorted(unknown)}")
+
+    start = time.perf_counter()
+    doc = _load_features(user_id)
+    weights = {**DEFAULT_WEIGHTS, **doc.get("weights", {}), **req.weights}
+    requirements = {**doc.get("requirements", {}), **req.thresholds}
+
+    results = [score_features(feat, requirements, weights) for feat in doc.get("features", [])]
+    results_sorted = sorted(results, key=lambda x: x["score"], reverse=True)[: max(0, req.top_n)]
+
+    return {
+        "ok": True,
+        "user_id": user_id,
+        "weights": weights,
+        "thresholds": requirements,
+        "count": len(results),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+        "results": results_sorted,
+    }
+
+
+@router.post("/{user_id}/score")
+def score_leads(user_id: str, req: ScoreRequest):
+    """
+    Score one or many enriched company records synchronously.
+    Uses a warm per-user scorer (model + requirement embeddings in memory) with micro-batching.
+    """
+    user_root = USERS_DIR / user_id
+    if not (user_root / "inputs" / "customer_requirements.json").exists():
+        raise HTTPException(status_code=404, detail="No customer requirements found for user")
+    companies = ([req.company] if req.company else []) + list(req.companies)
+    if not companies:
+        raise HTTPException(status_code=400, detail="Provide 'company' or 'companies'")
+
+    from backend.agents.online_scorer import get_online_scorer  # heavy import (model), only on first use
+
+    start = time.perf_counter()
+    try:
+        results = get_online_scorer(user_root).score(companies)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Scoring failed: {e}")
+
+    return {
+        "ok": True,
+        "user_id": user_id,
+        "count": len(results),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+        "results": results,
+    }
+
+
+# -----------------------------
+# Live leaderboard (scores enrichment output while it is being produced)
+# -----------------------------
+@router.post("/{user_id}/live/start")
+def start_live_leaderboard(user_id: str, top_n: int = 50):
+    user_root = USERS_DIR / user_id
+    if not (user_root / "inputs" / "customer_requirements.json").exists():
+        raise HTTPException(status_code=404, detail="No customer requirements found for user")
+    from backend.agents.live_leaderboard import start_live_scoring
+    return start_live_scoring(str(user_root), top_n=top_n)
+
+
+@router.post("/{user_id}/live/stop")
+def stop_live_leaderboard(user_id: str):
+    from backend.agents.live_leaderboard import stop_live_scoring
+    return stop_live_scoring(str(USERS_DIR / user_id))
+
+
+@router.get("/{user_id}/leaderboard")
+def get_leaderboard(user_id: str):
+    """Latest live leaderboard snapshot (top-N so far, qualified count, time to first qualified lead)."""
+    snapshot_file = USERS_DIR / user_id / "outputs" / "leaderboard.json"
+    if not snapshot_file.exists():
+        raise HTTPException(status_code=404, detail="No leaderboard yet. Start live scoring or run enrichment.")
+    with open(snapshot_file, "r", encoding="utf-8") as f:
+        snapshot = json.load(f)
+    from backend.agents.live_leaderboard import live_scoring_status
+    snapshot["running"] = live_scoring_status(str(USERS_DIR / user_id))["running"]
+    return snapshot
@@ -0,0 +1,266 @@
+# benchmarks/scoring_benchmark.py
+"""
+ScoringAgent benchmark suite
+-----------------------------
+- Generates synthetic enriched_companies.json corpora (default 1k, 10k, 100k;
+  1M only on request with --sizes, since features are still encoded per company)
+  with realistic structured_info variety (industries, HQ spellings, employee
+  ranges, founded years, products/services, signals, missing/N/A fields).
+- Runs ScoringAgent end-to-end per corpus in a fresh subprocess (so peak RSS is
+  per size): model load, init, candidates, features + score, rank, write.
+  Model loading is timed on its own and excluded from scoring throughput.
+- Runs offline (HF_HUB_OFFLINE=1) against the locally cached model.
+- MongoDB writes are skipped unless --with-mongo is given.
+- Prints / writes one JSON report, tagged with the git commit, so runs are
+  comparable across commits.
+
+Usage (from repo root):
+    python -m backend.benchmarks.scoring_benchmark --sizes 1000,10000 --out bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+BASE = Path(__file__).resolve().parents[1]  # backend/
+REPO_ROOT = BASE.parent
+DEFAULT_SIZES = [1000, 10000, 100000]  # add 1000000 via --sizes
+DEFAULT_REQUIREMENTS = BASE / "users" / "user_demo" / "inputs" / "customer_requirements.json"
+
+# -----------------------------
+# Synthetic corpus
+# -----------------------------
+INDUSTRIES = [
+    "Financial Technology", "Fintech", "Payments", "Digital Payments", "Banking", "NBFC", "Lending",
+    "Insurance Technology", "Wealth Management", "Data Analytics", "Artificial Intelligence",
+    "Business Intelligence", "SaaS", "Information Technology", "IT Services", "Cloud Computing",
+    "Cybersecurity", "E-commerce", "Retail", "Food Delivery", "Restaurants", "Coffee Industry",
+    "Food & Beverage", "Logistics", "Supply Chain", "Healthcare", "Telehealth", "EdTech",
+    "Education", "Real Estate", "Travel & Hospitality", "Media & Entertainment", "Gaming",
+    "Automotive", "Electric Vehicles", "Renewable Energy", "Manufacturing", "Agritech",
+    "Telecommunications", "Consulting", "Human Resources", "Marketing Technology", "",
+]
+HEADQUARTERS = [
+    "Bengaluru, Karnataka, India", "Bangalore, India", "Mumbai, Maharashtra", "Bombay", "Navi Mumbai",
+    "Gurugram, Haryana", "Gurgaon, India", "New Delhi, India", "Delhi NCR", "Noida, Uttar Pradesh",
+    "Pune, Maharashtra", "Hyderabad, Telangana", "Chennai, Tamil Nadu", "Kolkata", "Ahmedabad, Gujarat",
+    "Jaipur", "Kochi, Kerala", "Singapore", "London, UK", "San Francisco, CA", "New York, NY",
+    "Dubai, UAE", "Berlin, Germany", "Toronto, Canada", "N/A", "",
+]
+EMPLOYEES = [
+    "1-10", "11-50", "51-200", "201-500", "501-1,000", "1,001-5,000", "5,001-10,000", "10,000+",
+    "50+", "~250", "1200", "3k", "N/A", "",
+]
+PRODUCT_WORDS = [
+    "payment gateway", "UPI app", "credit card", "loan platform", "risk engine", "fraud detection",
+    "analytics dashboard", "forecasting", "data platform", "AI assistant", "wallet", "billing software",
+    "insurance app", "coffee", "tea", "snacks", "food delivery app", "cloud kitchen", "delivery network",
+    "fleet management", "CRM", "HR software", "learning app", "telemedicine", "EV charger", "solar panels",
+]
+SERVICES_WORDS = [
+    "consulting", "lending", "merchant onboarding", "data engineering", "machine learning",
+    "customer support", "last-mile delivery", "catering", "training", "managed services",
+    "cloud migration", "credit scoring", "underwriting", "payroll", "digital marketing",
+]
+NAME_PARTS = ["Fin", "Pay", "Cred", "Data", "Nova", "Quant", "Chai", "Brew", "Cart", "Swift", "Edu",
+              "Medi", "Volt", "Agro", "Cloud", "Secure", "Urban", "Blue", "Zen", "Apex"]
+NAME_SUFFIX = ["ly", "ify", "Labs", "Tech", "Works", "Hub", "X", "AI", "Pay", "Foods", "Systems", "Point"]
+
+
+def _company(rng: random.Random, i: int) -> Dict:
+    name = f"{rng.choice(NAME_PARTS)}{rng.choice(NAME_SUFFIX)} {i}"
+    founded = rng.choice([rng.randint(1950, 2024), rng.randint(2005, 2023), "N/A", ["N/A", rng.randint(1990, 2022)]])
+    hq = rng.choice(HEADQUARTERS)
+    if rng.random() < 0.1:
+        hq = ["N/A", hq, rng.choice(HEADQUARTERS)]  # mixed lists, as produced by LLM enrichment
+    industry = rng.choice(INDUSTRIES)
+    if rng.random() < 0.15:
+        industry = f"{industry}, {rng.choice(INDUSTRIES)}".strip(", ")
+    return {
+        "company": name,
+        "website": f"https://www.{name.lower().replace(' ', '')}.com",
+        "description": "",
+        "hiring": rng.random() < 0.55,
+        "funding_signal": round(rng.random(), 2),
+        "expansion_signal": round(rng.random(), 2),
+        "negative_signal": round(rng.random() * 0.7, 2),
+        "structured_info": {
+            "company_name": name,
+            "founded_year": founded,
+            "employees_count": rng.choice(EMPLOYEES),
+            "headquarters": hq,
+            "industry": industry,
+            "description": f"{name} builds {rng.choice(PRODUCT_WORDS)} and {rng.choice(PRODUCT_WORDS)} "
+                           f"for {rng.choice(['banks', 'merchants', 'consumers', 'SMEs', 'restaurants', 'schools'])}.",
+            "products": rng.sample(PRODUCT_WORDS, rng.randint(0, 3)),
+            "services": rng.sample(SERVICES_WORDS, rng.randint(0, 2)),
+        },
+    }
+
+
+def generate_corpus(n: int, seed: int = 7) -> List[Dict]:
+    rng = random.Random(seed)
+    return [_company(rng, i) for i in range(n)]
+
+
+def make_user_dir(root: Path, n: int, requirements_file: Path, seed: int = 7) -> Path:
+    """Create users/bench_<n>/ with inputs/customer_requirements.json and outputs/enriched_companies.json."""
+    user_root = root / "users" / f"bench_{n}"
+    (user_root / "inputs").mkdir(parents=True, exist_ok=True)
+    (user_root / "outputs").mkdir(parents=True, exist_ok=True)
+    shutil.copy(requirements_file, user_root / "inputs" / "customer_requirements.json")
+    with open(user_root / "outputs" / "enriched_companies.json", "w", encoding="utf-8") as f:
+        json.dump(generate_corpus(n, seed), f, ensure_ascii=False)
+    return user_root
+
+
+# -----------------------------
+# Single-size run (executed in a child process)
+# -----------------------------
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 1024 if sys.platform != "darwin" else peak / (1024 * 1024), 1)
+
+
+def run_single(user_root: Path, top_n: int, with_mongo: bool, rerun: bool) -> Dict:
+    phases, rss = {}, {}
+
+    t = time.perf_counter()
+    from backend.agents import scoring_agent
+    from backend.utils.lead_scoring import score_features
+    phases["import"] = time.perf_counter() - t
+    if not with_mongo:
+        scoring_agent.save_user_output = lambda **kwargs: None
+
+    t = time.perf_counter()
+    model = scoring_agent.load_model(scoring_agent.MODEL_NAME)
+    model.encode(["warmup"])
+    phases["model_load"] = time.perf_counter() - t
+    rss["after_model_load"] = _peak_rss_mb()
+
+    t = time.perf_counter()
+    agent = scoring_agent.ScoringAgent(user_root=str(user_root))
+    phases["init"] = time.perf_counter() - t
+    rss["after_init"] = _peak_rss_mb()
+
+    t = time.perf_counter()
+    agent.run(top_n=top_n)
+    run_s = time.perf_counter() - t
+    phases.update(agent.last_run_stats["timings"])
+    rss["after_run"] = _peak_rss_mb()
+
+    # pure scoring math on persisted features (no encodes)
+    with open(agent.features_file, "r", encoding="utf-8") as f:
+        features = json.load(f)["features"]
+    t = time.perf_counter()
+    for feat in features:
+        score_features(feat, agent.requirements, agent.weights)
+    phases["score_only"] = time.perf_counter() - t
+
+    report = {
+        "corpus": len(agent.companies),
+        "scored": agent.last_run_stats["scored"],
+        "phases_s": {k: round(v, 4) for k, v in phases.items()},
+        "end_to_end_s": round(phases["init"] + run_s, 4),
+        "throughput_per_s": round(len(agent.companies) / max(phases["init"] + run_s, 1e-9), 1),
+        "peak_rss_mb": rss,
+    }
+    if rerun:
+        # unchanged corpus: exercises the incremental lead index path
+        t = time.perf_counter()
+        agent.run(top_n=top_n)
+        report["rerun_s"] = round(time.perf_counter() - t, 4)
+        report["rerun_phases_s"] = {k: round(v, 4) for k, v in agent.last_run_stats["timings"].items()}
+    return report
+
+
+# -----------------------------
+# Driver
+# -----------------------------
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def run_suite(sizes: List[int], top_n: int = 50, requirements_file: Path = DEFAULT_REQUIREMENTS,
+              with_mongo: bool = False, rerun: bool = False, keep: bool = False) -> Dict:
+    workdir = Path(tempfile.mkdtemp(prefix="scoring_bench_"))
+    results = []
+    try:
+        for n in sizes:
+            t = time.perf_counter()
+            user_root = make_user_dir(workdir, n, requirements_file)
+            gen_s = round(time.perf_counter() - t, 2)
+            print(f"⏱️  {n} companies generated in {gen_s}s, scoring...", file=sys.stderr)
+            cmd = [sys.executable, "-m", "backend.benchmarks.scoring_benchmark", "--single", str(user_root),
+                   "--top-n", str(top_n)] + (["--with-mongo"] if with_mongo else []) + (["--rerun"] if rerun else [])
+            proc = subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True)
+            if proc.returncode != 0:
+                results.append({"corpus": n, "error": proc.stderr.strip().splitlines()[-1:]})
+                continue
+            res = json.loads(proc.stdout.strip().splitlines()[-1])
+            res["generate_s"] = gen_s
+            results.append(res)
+            if not keep:
+                shutil.rmtree(user_root, ignore_errors=True)
+    finally:
+        if not keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    import numpy as np
+    return {
+        "benchmark": "scoring_agent",
+        "commit": _git_commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "top_n": top_n,
+        "embedding_codec": os.getenv("SCORING_EMBEDDING_CODEC", "default"),
+        "mongo": with_mongo,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ScoringAgent on synthetic corpora")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated corpus sizes")
+    parser.add_argument("--top-n", type=int, default=50)
+    parser.add_argument("--requirements", default=str(DEFAULT_REQUIREMENTS), help="customer_requirements.json to score against")
+    parser.add_argument("--out", help="write the JSON report here (also printed)")
+    parser.add_argument("--with-mongo", action="store_true", help="include the MongoDB write in the write phase")
+    parser.add_argument("--rerun", action="store_true", help="also time a second run on the unchanged corpus")
+    parser.add_argument("--keep", action="store_true", help="keep generated corpora and outputs")
+    parser.add_argument("--single", help=argparse.SUPPRESS)  # internal: benchmark one prepared user dir
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_single(Path(args.single), args.top_n, args.with_mongo, args.rerun)))
+        return
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    report = run_suite(sizes, args.top_n, Path(args.requirements), args.with_mongo, args.rerun, args.keep)
+    out = json.dumps(report, indent=2)
+    print(out)
+    if args.out:
+        Path(args.out).write_text(out, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
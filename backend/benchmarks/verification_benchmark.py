@@ -0,0 +1,161 @@
+# benchmarks/verification_benchmark.py
+"""
+ContactFinderAgent verification benchmark (offline)
+-----------------------------------------------------
+- Starts the local Verifalia stand-in (utils/verifalia_stub_server.py) with a
+  fixed job latency and runs ContactFinderAgent against it in each mode:
+  serial (one job per address), batch (multi-entry jobs, sync polling) and
+  async (concurrent jobs with long-poll).
+- Synthetic employees_companies.json: N companies x 2 employees; domain
+  behaviour (first.last / first / catch-all / dead) is decided by the stub.
+- --accounts N configures N stub accounts; with --credits / --rate-limit the
+  run exercises credit exhaustion and 429 rotation across accounts.
+- Every mode gets a fresh stub, so credits used by one mode don't carry
+  over to the next.
+- MongoDB writes are skipped: an offline stand-in for backend.db.mongo is
+  installed before contact_finder is imported (no MONGO_URI / pymongo needed).
+- Prints / writes one JSON report tagged with the git commit.
+
+Usage (from repo root):
+    python -m backend.benchmarks.verification_benchmark --companies 20 --latency 1.0
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+from typing import Dict, List
+
+BASE = Path(__file__).resolve().parents[1]  # backend/
+REPO_ROOT = BASE.parent
+FIRST = ["asha", "rahul", "priya", "vikram", "neha", "arjun", "sara", "john", "meera", "kiran"]
+LAST = ["shah", "rao", "iyer", "mehta", "gupta", "smith", "khan", "das", "nair", "bose"]
+
+
+def generate_employees(n: int, seed: int = 11) -> List[Dict]:
+    rng = random.Random(seed)
+    companies = []
+    for i in range(n):
+        employees = [
+            {"name": f"{rng.choice(FIRST).title()} {rng.choice(LAST).title()}", "title": "Sales Manager",
+             "confidence": round(rng.uniform(0.5, 0.7), 2)}
+            for _ in range(2)
+        ]
+        companies.append({"company": f"Benchco{i:04d}", "num_found": len(employees), "employees": employees})
+    return companies
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def _offline_mongo():
+    """Stand-in for backend.db.mongo (which connects at import time) with no-op writes."""
+    mongo = types.ModuleType("backend.db.mongo")
+    mongo.save_user_output = lambda **kwargs: None
+    sys.modules.setdefault("backend.db.mongo", mongo)
+
+
+def run_mode(mode: str, companies: List[Dict], workdir: Path, api_base: str, server) -> Dict:
+    _offline_mongo()
+    from backend.agents import contact_finder
+
+    contact_finder.API_BASE = api_base
+    contact_finder.save_user_output = lambda **kwargs: None
+    user_root = workdir / mode
+    (user_root / "outputs").mkdir(parents=True)
+    with open(user_root / "outputs" / "employees_companies.json", "w", encoding="utf-8") as f:
+        json.dump(companies, f)
+
+    # no shared cache / pattern model: every mode starts cold and nothing leaks into backend/cache
+    agent = contact_finder.ContactFinderAgent(
+        user_root=str(user_root), batch=mode != "serial", async_engine=mode == "async",
+        use_cache=False, learn_patterns=False
+    )
+    if agent.precheck is not None:
+        agent.precheck.use_dns = False  # synthetic domains don't resolve; the stub decides dead domains
+    t = time.perf_counter()
+    agent.run()
+    elapsed = time.perf_counter() - t
+
+    with open(user_root / "outputs" / "employees_email.json", "r", encoding="utf-8") as f:
+        out = json.load(f)
+    statuses: Dict[str, int] = {}
+    for c in out:
+        statuses[c.get("verification_status", "none")] = statuses.get(c.get("verification_status", "none"), 0) + 1
+    return {
+        "mode": mode,
+        "elapsed_s": round(elapsed, 2),
+        "jobs": server.state.stats["submitted"],
+        "entries": server.state.stats["entries"],
+        "polls": server.state.stats["polls"],
+        "rate_limited": server.state.stats["rate_limited"],
+        "statuses": statuses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ContactFinderAgent against a local Verifalia stand-in")
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=1.0, help="stub seconds per job")
+    parser.add_argument("--modes", default="serial,batch,async")
+    parser.add_argument("--no-long-poll", action="store_true", help="stub ignores waitTime (tests backoff polling)")
+    parser.add_argument("--accounts", type=int, default=1, help="Verifalia accounts (1-3)")
+    parser.add_argument("--credits", type=int, default=10 ** 9, help="stub credits per account")
+    parser.add_argument("--rate-limit", type=int, help="stub job submissions per account per second")
+    parser.add_argument("--out", help="write the JSON report here (also printed)")
+    args = parser.parse_args()
+
+    from backend.utils.verifalia_stub_server import start_stub_server
+
+    for i in range(1, min(max(args.accounts, 1), 3) + 1):
+        os.environ.setdefault(f"VERIFALIA_USER_{i}", f"bench{i}")
+        os.environ.setdefault(f"VERIFALIA_PASS_{i}", "bench")
+    companies = generate_employees(args.companies)
+    workdir = Path(tempfile.mkdtemp(prefix="verification_bench_"))
+    try:
+        results = []
+        for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+            print(f"⏱️  {mode}: {args.companies} companies...", file=sys.stderr)
+            # a fresh stub per mode: every mode starts with full credits and zeroed stats
+            server, api_base = start_stub_server(latency_s=args.latency, credits=args.credits,
+                                                 long_poll=not args.no_long_poll, rate_limit=args.rate_limit)
+            try:
+                results.append(run_mode(mode, json.loads(json.dumps(companies)), workdir, api_base, server))
+            finally:
+                server.shutdown()
+                server.server_close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "benchmark": "contact_finder_verification",
+        "commit": _git_commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "companies": args.companies,
+        "stub_latency_s": args.latency,
+        "long_poll": not args.no_long_poll,
+        "accounts": args.accounts,
+        "results": results,
+    }
+    out = json.dumps(report, indent=2)
+    print(out)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(out)
+
+
+if __name__ == "__main__":
+    main()
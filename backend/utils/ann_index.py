@@ -0,0 +1,261 @@
+# backend/utils/ann_index.py
+"""
+IVF (inverted-file) approximate nearest-neighbour index on NumPy
+------------------------------------------------------------------
+- Spherical k-means coarse quantizer (cosine / inner product on unit vectors).
+- Each vector lives in the inverted list of its nearest centroid; a query only
+  scans the lists of its closest centroids, so cost is ~O(nlist + N * nprobe / nlist)
+  instead of O(N).
+- Incremental: add()/remove() by key without retraining; the quantizer is
+  retrained automatically once the corpus has grown well past its training size.
+- Vectors are stored through an EmbeddingCodec (float32 / float16 / pca128);
+  centroids and search run in the codec's stored space. pca128 is only fitted
+  once the index holds at least 128 vectors (a smaller sample would give a
+  lower-rank basis for good); until then vectors are kept as float16, then
+  they are re-encoded and the quantizer is retrained.
+- Persists to a directory (centroids.npy, vectors.npy, assign.npy, codec.npz,
+  meta.json); vectors are memory-mapped on load.
+"""
+
+import json
+import logging
+import math
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.utils.embedding_store import EmbeddingCodec
+
+KMEANS_ITERS = 12
+KMEANS_SAMPLE = 50000
+RETRAIN_GROWTH = 4.0  # retrain quantizer once corpus is this many times the training size
+
+
+def _unit(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float32)
+    if x.ndim == 1:
+        x = x[None, :]
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+def _spherical_kmeans(x: np.ndarray, k: int, seed: int = 13) -> np.ndarray:
+    """Return k unit-norm centroids for unit-norm rows of x."""
+    rng = np.random.default_rng(seed)
+    if len(x) > KMEANS_SAMPLE:
+        x = x[rng.choice(len(x), KMEANS_SAMPLE, replace=False)]
+    k = max(1, min(k, len(x)))
+    centroids = x[rng.choice(len(x), k, replace=False)].copy()
+    for _ in range(KMEANS_ITERS):
+        assign = np.argmax(x @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=k)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sums = np.zeros_like(centroids)
+        nonempty = counts > 0
+        sums[nonempty] = np.add.reduceat(x[order], starts[nonempty], axis=0)
+        empty = counts == 0
+        if empty.any():
+            # re-seed empty clusters with random points
+            sums[empty] = x[rng.choice(len(x), int(empty.sum()), replace=False)]
+        centroids = _unit(sums)
+    return centroids
+
+
+class IVFIndex:
+    def __init__(self, path: Path, nprobe: int = 8, tag: str = "", codec: str = "float32"):
+        """
+        tag: identifies the embedding space (e.g. model name); a mismatch on load resets the index.
+        codec: storage codec for vectors (see utils.embedding_store); a mismatch on load resets too.
+        """
+        self.path = Path(path)
+        self.nprobe = nprobe
+        self.tag = tag
+        self.codec_name = codec
+        self._reset()
+        self.load()
+
+    def _reset(self):
+        self.codec = EmbeddingCodec(self.codec_name)
+        self.centroids: Optional[np.ndarray] = None
+        self.vectors = np.zeros((0, 0), dtype=self.codec.dtype)
+        self.assign = np.zeros(0, dtype=np.int32)
+        self.alive = np.zeros(0, dtype=bool)
+        self.keys: List[str] = []
+        self.hashes: List[str] = []
+        self.trained_size = 0
+        self._rows: Dict[str, int] = {}
+        self._lists: Dict[int, np.ndarray] = {}
+
+    # -----------------------------
+    # Persistence
+    # -----------------------------
+    def load(self):
+        meta_path = self.path / "meta.json"
+        if not meta_path.exists():
+            return
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("tag", "") != self.tag or meta.get("codec", "float32") != self.codec_name:
+                logging.info(f"ANN index at {self.path} built for another embedding space/codec; rebuilding")
+                return
+            if (self.path / "codec.npz").exists():
+                self.codec = EmbeddingCodec.load(self.path / "codec.npz")
+            self.centroids = np.load(self.path / "centroids.npy")
+            self.vectors = np.load(self.path / "vectors.npy", mmap_mode="r")
+            self.assign = np.load(self.path / "assign.npy")
+            self.keys = meta["keys"]
+            self.hashes = meta["hashes"]
+            self.trained_size = meta.get("trained_size", len(self.keys))
+            self.alive = np.ones(len(self.keys), dtype=bool)
+            self._rows = {k: i for i, k in enumerate(self.keys)}
+            self._rebuild_lists()
+        except Exception as e:
+            logging.warning(f"ANN index at {self.path} unreadable, rebuilding: {e}")
+            self._reset()
+
+    def save(self):
+        """Compact deleted rows and write the index atomically (per file)."""
+        self._compact()
+        self.path.mkdir(parents=True, exist_ok=True)
+        for name, arr in (("centroids", self.centroids), ("vectors", np.asarray(self.vectors)), ("assign", self.assign)):
+            tmp = self.path / f"{name}.tmp.npy"
+            np.save(tmp, arr)
+            os.replace(tmp, self.path / f"{name}.npy")
+        self.codec.save(self.path / "codec.npz")
+        tmp = self.path / "meta.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"tag": self.tag, "codec": self.codec_name, "keys": self.keys, "hashes": self.hashes,
+                       "trained_size": self.trained_size}, f)
+        os.replace(tmp, self.path / "meta.json")
+
+    # -----------------------------
+    # Maintenance
+    # -----------------------------
+    def __len__(self):
+        return int(self.alive.sum())
+
+    def live_keys(self) -> List[str]:
+        return list(self._rows)
+
+    def hash_of(self, key: str) -> Optional[str]:
+        row = self._rows.get(key)
+        return self.hashes[row] if row is not None else None
+
+    def add(self, keys: Sequence[str], vectors: np.ndarray, hashes: Sequence[str]):
+        """Insert or replace vectors by key (replaced rows are tombstoned)."""
+        if not len(keys):
+            return
+        vecs = _unit(vectors)
+        self.remove([k for k in keys if k in self._rows])
+
+        if not self.codec.fitted:
+            self._fit_codec(vecs)
+        stored = self.codec.encode(vecs)
+        if self.centroids is None:
+            self._train(stored)
+        base = len(self.keys)
+        assign = np.argmax(stored.astype(np.float32) @ self.centroids.T, axis=1).astype(np.int32)
+        old = np.asarray(self.vectors) if len(self.keys) else np.zeros((0, stored.shape[1]), dtype=self.codec.dtype)
+        self.vectors = np.concatenate([old, stored]).astype(self.codec.dtype)
+        self.assign = np.concatenate([self.assign, assign])
+        self.alive = np.concatenate([self.alive, np.ones(len(keys), dtype=bool)])
+        for i, (k, h) in enumerate(zip(keys, hashes)):
+            self.keys.append(k)
+            self.hashes.append(h)
+            self._rows[k] = base + i
+
+        if len(self) > RETRAIN_GROWTH * max(1, self.trained_size):
+            self._compact()
+            self._train(np.asarray(self.vectors))
+            self.assign = np.argmax(np.asarray(self.vectors, dtype=np.float32) @ self.centroids.T, axis=1).astype(np.int32)
+        self._rebuild_lists()
+
+    def remove(self, keys: Sequence[str]):
+        for k in keys:
+            row = self._rows.pop(k, None)
+            if row is not None:
+                self.alive[row] = False
+        if len(keys):
+            self._rebuild_lists()
+
+    def _fit_codec(self, vecs: np.ndarray):
+        """Fit the PCA projection once enough vectors are in (held + new); re-encode the held ones."""
+        self._compact()
+        held = np.asarray(self.vectors, dtype=np.float32) if len(self.keys) else np.zeros((0, vecs.shape[1]), dtype=np.float32)
+        if len(held) + len(vecs) < self.codec.dims:
+            return  # unfitted codec: stored as float16 at full dimension
+        self.codec.fit(np.concatenate([held, vecs]))
+        if len(held):
+            self.vectors = self.codec.encode(held)
+            self._train(self.vectors)
+            self.assign = np.argmax(self.vectors.astype(np.float32) @ self.centroids.T, axis=1).astype(np.int32)
+        else:
+            self.centroids = None  # trained below in the new space
+
+    def _train(self, vecs: np.ndarray):
+        nlist = max(1, min(4096, int(4 * math.sqrt(len(vecs)))))
+        self.centroids = _spherical_kmeans(_unit(vecs), nlist)
+        self.trained_size = len(vecs)
+        logging.info(f"ANN quantizer trained: {len(self.centroids)} lists over {len(vecs)} vectors")
+
+    def _compact(self):
+        if self.alive.all():
+            return
+        idx = np.flatnonzero(self.alive)
+        self.vectors = np.asarray(self.vectors)[idx]
+        self.assign = self.assign[idx]
+        self.keys = [self.keys[i] for i in idx]
+        self.hashes = [self.hashes[i] for i in idx]
+        self.alive = np.ones(len(idx), dtype=bool)
+        self._rows = {k: i for i, k in enumerate(self.keys)}
+        self._rebuild_lists()
+
+    def _rebuild_lists(self):
+        rows = np.flatnonzero(self.alive)
+        if not len(rows):
+            self._lists = {}
+            return
+        order = rows[np.argsort(self.assign[rows], kind="stable")]
+        bounds = np.flatnonzero(np.diff(self.assign[order])) + 1
+        self._lists = {int(self.assign[chunk[0]]): chunk for chunk in np.split(order, bounds)}
+
+    # -----------------------------
+    # Query
+    # -----------------------------
+    def search(self, queries: np.ndarray, k: int, nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Return up to k (key, score) pairs, best first, taking the max inner product over queries.
+        Probes at least `nprobe` lists per query, and more until ~2k rows are gathered.
+        """
+        if self.centroids is None or not self._lists or k <= 0:
+            return []
+        q = self.codec.project(_unit(queries))
+        nprobe = nprobe or self.nprobe
+        centroid_order = np.argsort(-(q @ self.centroids.T), axis=1)
+
+        best: Dict[int, float] = {}
+        for qi in range(len(q)):
+            picked, gathered = [], 0
+            for ci in centroid_order[qi]:
+                rows = self._lists.get(int(ci))
+                if rows is None:
+                    continue
+                picked.append(rows)
+                gathered += len(rows)
+                if len(picked) >= nprobe and gathered >= 2 * k:
+                    break
+            rows = np.concatenate(picked)
+            scores = np.asarray(self.vectors[rows], dtype=np.float32) @ q[qi]
+            if len(rows) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                rows, scores = rows[top], scores[top]
+            for r, sc in zip(rows.tolist(), scores.tolist()):
+                if sc > best.get(r, -np.inf):
+                    best[r] = sc
+
+        ranked = sorted(best.items(), key=lambda x: -x[1])[:k]
+        return [(self.keys[r], float(sc)) for r, sc in ranked]
@@ -0,0 +1,132 @@
+# backend/utils/domain_precheck.py
+"""
+Catch-all / dead-domain pre-check before email permutation fan-out
+--------------------------------------------------------------------
+- domain_from_website(): the real mail domain from an enrichment website URL.
+- mx_status(): DNS check with dnspython; NXDOMAIN or no MX / A record means
+  the domain cannot receive mail ("dead"); lookups that time out are
+  "unknown". Without dnspython the DNS step is skipped.
+- DomainPrecheck.run(domains, verifier): DNS for all domains in parallel, then
+  one probe address per surviving domain (a local part no real mailbox uses),
+  all in a single verify_batch call (skipped with probe=False, DNS only):
+    probe Deliverable / ServerIsCatchAll  → "catch_all"
+    DomainDoesNotExist and similar        → "dead"
+    anything else                         → "ok"
+- Domains the pattern model already knows (catch-all, dead, or with a
+  confirmed pattern) are not probed again; new verdicts are recorded in it
+  (with a TTL). A DNS-only "dead" is recorded for this run only, so one
+  resolver failure never marks a domain dead for other runs and tenants.
+"""
+
+import hashlib
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+try:
+    import dns.exception
+    import dns.resolver
+except ImportError:  # optional: without dnspython only the probe address is used
+    dns = None
+
+from backend.utils.email_patterns import CATCH_ALL_STATUSES, DEAD_DOMAIN_STATUSES
+
+DNS_TIMEOUT = 3.0
+DNS_WORKERS = 16
+
+
+def domain_from_website(website: Optional[str]) -> Optional[str]:
+    if not website or website in ("N/A", "Unknown"):
+        return None
+    host = re.sub(r"^https?://", "", website.strip().lower()).split("/")[0].split(":")[0]
+    host = re.sub(r"^www\d?\.", "", host)
+    return host if "." in host else None
+
+
+def probe_address(domain: str) -> str:
+    """Deterministic, implausible mailbox (so repeated probes hit the verification cache)."""
+    tag = hashlib.md5(domain.encode()).hexdigest()[:8]
+    return f"probe-{tag}-no-mailbox@{domain}"
+
+
+def mx_status(domain: str, timeout: float = DNS_TIMEOUT) -> str:
+    """'ok', 'dead' or 'unknown' (no dnspython, or the lookup timed out)."""
+    if dns is None:
+        return "unknown"
+    try:
+        dns.resolver.resolve(domain, "MX", lifetime=timeout)
+        return "ok"
+    except dns.resolver.NXDOMAIN:
+        return "dead"
+    except dns.resolver.NoAnswer:
+        pass
+    except dns.exception.DNSException:  # timeouts, SERVFAIL: no verdict
+        return "unknown"
+    try:
+        dns.resolver.resolve(domain, "A", lifetime=timeout)  # implicit MX
+        return "ok"
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+        return "dead"
+    except dns.exception.DNSException:
+        return "unknown"
+
+
+class DomainPrecheck:
+    def __init__(self, patterns=None, probe: bool = True, use_dns: bool = True,
+                 logger: Optional[logging.Logger] = None):
+        self.patterns = patterns
+        self.probe = probe
+        self.use_dns = use_dns and dns is not None
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = {"domains": 0, "known": 0, "dns_dead": 0, "probed": 0, "catch_all": 0, "dead": 0}
+
+    def run(self, domains: Iterable[str], verifier, probe: Optional[bool] = None) -> Dict[str, str]:
+        """{domain: 'ok' | 'catch_all' | 'dead'}; probe overrides self.probe (False = DNS only, no credits)."""
+        probe = self.probe if probe is None else probe
+        domains = list(dict.fromkeys(d.lower() for d in domains if d))
+        self.stats["domains"] += len(domains)
+        states: Dict[str, str] = {}
+        todo = []
+        for d in domains:
+            known = self.patterns.domain_state(d) if self.patterns is not None else None
+            if not known and self.patterns is not None and self.patterns.confirmed_pattern(d):
+                known = "ok"  # a verified mailbox: neither dead nor catch-all
+            if known:
+                states[d] = known
+                self.stats["known"] += 1
+            else:
+                todo.append(d)
+
+        dns_dead = set()
+        if self.use_dns and todo:
+            with ThreadPoolExecutor(max_workers=DNS_WORKERS) as ex:
+                dns_states = dict(zip(todo, ex.map(mx_status, todo)))
+            for d, st in dns_states.items():
+                if st == "dead":
+                    states[d] = "dead"
+                    dns_dead.add(d)
+                    self.stats["dns_dead"] += 1
+            todo = [d for d in todo if d not in states]
+
+        if probe and todo and not verifier.out_of_credits:
+            probes = {probe_address(d): d for d in todo}
+            results = verifier.verify_batch(list(probes))
+            self.stats["probed"] += len(probes)
+            for address, d in probes.items():
+                res = results.get(address.lower()) or {}
+                status = res.get("status", "")
+                if not res.get("verified"):
+                    continue
+                if res.get("classification") == "Deliverable" or status in CATCH_ALL_STATUSES:
+                    states[d] = "catch_all"
+                elif status in DEAD_DOMAIN_STATUSES:
+                    states[d] = "dead"
+
+        for d in domains:
+            state = states.setdefault(d, "ok")
+            if state in ("catch_all", "dead"):
+                self.stats[state] += 1
+                if self.patterns is not None and not self.patterns.domain_state(d):
+                    self.patterns.record_domain(d, state, persist=d not in dns_dead)
+        return states
@@ -0,0 +1,208 @@
+# backend/utils/email_patterns.py
+"""
+Per-domain email pattern model shared by all tenants
+------------------------------------------------------
+- Stored at backend/cache/email_patterns.json, keyed by email domain.
+- Learns from verification outcomes: a Deliverable address confirms its
+  pattern (first.last, flast, ...) for the domain; a MailboxDoesNotExist
+  answer counts against it. Catch-all (ServerIsCatchAll) and dead-domain
+  (DomainDoesNotExist, ...) answers are counted per domain.
+- rank() reorders a person's candidates by the posterior share of each
+  pattern (generator prior as pseudo-counts + observed outcomes) and prunes
+  unlikely patterns once one is confirmed for the domain.
+  Dead domains get no candidates; catch-all domains only the best guess.
+- Domain verdicts expire: each catch-all / dead observation stores when it
+  was last seen (seen_at) and only counts within DOMAIN_TTL_DAYS, and a
+  Deliverable answer seen after it clears it. Pre-check verdicts from DNS
+  alone are kept in memory for the run but never persisted.
+- save() re-reads the file and adds this run's counts, so concurrent runs
+  don't overwrite each other.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BASE = Path(__file__).resolve().parents[1]  # backend/
+DEFAULT_PATH = BASE / "cache" / "email_patterns.json"
+PRIOR_WEIGHT = 2.0      # pseudo-observations given to the generator's prior
+PRUNE_RATIO = 0.25      # once a pattern is confirmed, drop patterns under this share of the best one
+CATCH_ALL_STATUSES = {"ServerIsCatchAll"}
+DEAD_DOMAIN_STATUSES = {"DomainDoesNotExist", "DomainHasNullMx", "DomainIsMisconfigured", "DomainIsWellKnownDea"}
+NO_MAILBOX_STATUSES = {"MailboxDoesNotExist"}
+DOMAIN_TTL_DAYS = {
+    "catch_all": 14,
+    "dead": 7,
+}
+
+_SAVE_LOCK = threading.Lock()
+
+
+def _empty_domain() -> Dict:
+    return {"patterns": {}, "catch_all": 0, "dead": 0, "deliverable": 0, "seen_at": {}}
+
+
+def _mark(d: Dict, field: str, now: str):
+    """Count a domain-level observation and stamp when it was seen."""
+    d[field] += 1
+    d.setdefault("seen_at", {})[field] = now
+
+
+class EmailPatternModel:
+    def __init__(self, path: Path = DEFAULT_PATH):
+        self.path = Path(path)
+        self.domains: Dict[str, Dict] = self._read()
+        self._delta: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.stats = {"ranked": 0, "pruned": 0, "skipped_dead": 0, "catch_all_shortcut": 0}
+
+    def _read(self) -> Dict[str, Dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("domains", {}) or {}
+        except Exception as e:
+            logging.warning(f"Email pattern model unreadable, starting fresh: {e}")
+            return {}
+
+    # -------------------------
+    # Domain state
+    # -------------------------
+    def domain_state(self, domain: str) -> Optional[str]:
+        """'dead', 'catch_all' or None (normal / unknown / verdict expired)."""
+        with self._lock:
+            d = self.domains.get(domain.lower())
+        if not d:
+            return None
+        seen_at = d.get("seen_at", {})  # verdicts without a timestamp (older files) have expired
+        now = datetime.utcnow()
+
+        def current(state: str) -> bool:
+            at = seen_at.get(state)
+            return (at is not None and at > seen_at.get("deliverable", "")
+                    and now - datetime.fromisoformat(at) < timedelta(days=DOMAIN_TTL_DAYS[state]))
+
+        if current("dead"):
+            return "dead"
+        if current("catch_all"):
+            return "catch_all"
+        return None
+
+    def confirmed_pattern(self, domain: str) -> Optional[str]:
+        with self._lock:
+            patterns = (self.domains.get(domain.lower()) or {}).get("patterns", {})
+            best = max(patterns.items(), key=lambda kv: kv[1].get("hit", 0), default=None)
+        return best[0] if best and best[1].get("hit", 0) > 0 else None
+
+    # -------------------------
+    # Ranking
+    # -------------------------
+    def rank(self, domain: str, candidates: List[Tuple[str, str, float]]) -> List[Tuple[str, str, float]]:
+        """
+        candidates: (pattern, email, prior) in generator order. Returns them reordered by
+        posterior (prior replaced by it), pruned for confirmed domains, [] for dead domains.
+        """
+        if not candidates:
+            return candidates
+        state = self.domain_state(domain)
+        with self._lock:
+            self.stats["ranked"] += 1
+            if state == "dead":
+                self.stats["skipped_dead"] += 1
+                return []
+            patterns = (self.domains.get(domain.lower()) or {}).get("patterns", {})
+
+        def posterior(pattern: str, prior: float) -> float:
+            p = patterns.get(pattern, {})
+            return (prior * PRIOR_WEIGHT + p.get("hit", 0)) / (PRIOR_WEIGHT + p.get("hit", 0) + p.get("miss", 0))
+
+        scored = [(pat, email, posterior(pat, prior)) for pat, email, prior in candidates]
+        total = sum(s for _, _, s in scored) or 1.0
+        scored = [(pat, email, s / total) for pat, email, s in scored]
+        scored.sort(key=lambda c: -c[2])  # stable: ties keep the generator order
+        if state == "catch_all":
+            with self._lock:
+                self.stats["catch_all_shortcut"] += 1
+            return scored[:1]
+        if any(p.get("hit", 0) for p in patterns.values()):
+            kept = [c for c in scored if c[2] >= PRUNE_RATIO * scored[0][2]]
+            with self._lock:
+                self.stats["pruned"] += len(scored) - len(kept)
+            return kept
+        return scored
+
+    # -------------------------
+    # Learning
+    # -------------------------
+    def observe(self, domain: str, pattern: Optional[str], result: Dict):
+        """Record one verification outcome (results without a completed verification are ignored)."""
+        if not result.get("verified") or result.get("cached"):  # cached answers were learned when verified
+            return
+        status = result.get("status", "")
+        classification = result.get("classification", "Unknown")
+        updates = []
+        if classification == "Deliverable":
+            updates.append(("deliverable", None))
+            if pattern:
+                updates.append(("hit", pattern))
+        elif status in CATCH_ALL_STATUSES:
+            updates.append(("catch_all", None))
+        elif status in DEAD_DOMAIN_STATUSES:
+            updates.append(("dead", None))
+        elif pattern and (status in NO_MAILBOX_STATUSES or (not status and classification == "Undeliverable")):
+            updates.append(("miss", pattern))
+        if not updates:
+            return
+        key = domain.lower()
+        now = datetime.utcnow().isoformat()
+        with self._lock:
+            for table in (self.domains, self._delta):
+                d = table.setdefault(key, _empty_domain())
+                for field, pat in updates:
+                    if pat is None:
+                        _mark(d, field, now)
+                    else:
+                        counts = d["patterns"].setdefault(pat, {"hit": 0, "miss": 0})
+                        counts[field] += 1
+
+    def record_domain(self, domain: str, state: str, persist: bool = True):
+        """
+        Record a domain-level verdict ('catch_all' or 'dead') from a pre-check;
+        persist=False keeps it for this run only (e.g. a DNS-only verdict).
+        """
+        if state not in ("catch_all", "dead"):
+            return
+        key = domain.lower()
+        now = datetime.utcnow().isoformat()
+        with self._lock:
+            for table in (self.domains, self._delta) if persist else (self.domains,):
+                _mark(table.setdefault(key, _empty_domain()), state, now)
+
+    def save(self):
+        """Add this run's counts to whatever is on disk and write atomically."""
+        with _SAVE_LOCK:
+            on_disk = self._read()
+            with self._lock:
+                for key, delta in self._delta.items():
+                    d = on_disk.setdefault(key, _empty_domain())
+                    for field in ("catch_all", "dead", "deliverable"):
+                        d[field] = d.get(field, 0) + delta[field]
+                    seen_at = d.setdefault("seen_at", {})
+                    for field, at in delta["seen_at"].items():
+                        seen_at[field] = max(seen_at.get(field, ""), at)
+                    for pat, counts in delta["patterns"].items():
+                        mine = d["patterns"].setdefault(pat, {"hit": 0, "miss": 0})
+                        mine["hit"] += counts["hit"]
+                        mine["miss"] += counts["miss"]
+                self._delta = {}
+                self.domains = on_disk
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"domains": on_disk}, f, indent=2)
+            os.replace(tmp, self.path)
@@ -0,0 +1,112 @@
+# backend/utils/embedding_store.py
+"""
+Compact storage codecs for company embeddings
+-----------------------------------------------
+- "float32": full precision (4 bytes / dim).
+- "float16": half precision (2 bytes / dim), no fitting, ~1e-3 score drift.
+- "pca128":  projection onto the top 128 principal directions (uncentered, so
+  inner products are preserved directly), stored as float16. The projection
+  matrix is fitted once and saved next to the vectors (codec.npz).
+- Stored arrays stay plain .npy files, so they can be memory-mapped.
+- score_drift() compares codec scores against full precision for a sample.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+CODECS = ("float32", "float16", "pca128")
+DEFAULT_CODEC = "float16"
+PCA_FIT_SAMPLE = 50000
+
+
+class EmbeddingCodec:
+    def __init__(self, name: str = DEFAULT_CODEC):
+        if name not in CODECS:
+            raise ValueError(f"Unknown embedding codec '{name}' (choose from {', '.join(CODECS)})")
+        self.name = name
+        self.dims = 128 if name == "pca128" else None
+        self.components: Optional[np.ndarray] = None  # (dims, D) for PCA
+
+    @property
+    def dtype(self):
+        return np.float32 if self.name == "float32" else np.float16
+
+    @property
+    def fitted(self) -> bool:
+        return self.name != "pca128" or self.components is not None
+
+    def fit(self, x: np.ndarray, seed: int = 13):
+        """Fit the projection (PCA only); x: full-precision vectors, one per row."""
+        if self.name != "pca128":
+            return self
+        x = np.asarray(x, dtype=np.float32)
+        if len(x) > PCA_FIT_SAMPLE:
+            x = x[np.random.default_rng(seed).choice(len(x), PCA_FIT_SAMPLE, replace=False)]
+        # uncentered PCA: top eigenvectors of X^T X keep q·x ≈ (Pq)·(Px)
+        _, _, vt = np.linalg.svd(x, full_matrices=False)
+        self.components = vt[: min(self.dims, vt.shape[0])].astype(np.float32)
+        return self
+
+    def project(self, x: np.ndarray) -> np.ndarray:
+        """Map full-precision vectors (or queries) into the stored space, as float32."""
+        x = np.asarray(x, dtype=np.float32)
+        return x @ self.components.T if self.components is not None else x
+
+    def encode(self, x: np.ndarray) -> np.ndarray:
+        return self.project(x).astype(self.dtype)
+
+    def bytes_per_vector(self, dim: int) -> int:
+        return (self.dims or dim) * np.dtype(self.dtype).itemsize
+
+    # -----------------------------
+    # Persistence
+    # -----------------------------
+    def save(self, path: Path):
+        path = Path(path)
+        arrays = {"name": np.array(self.name)}
+        if self.components is not None:
+            arrays["components"] = self.components
+        tmp = path.with_suffix(".tmp.npz")
+        np.savez(tmp, **arrays)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "EmbeddingCodec":
+        with np.load(path) as data:
+            codec = cls(str(data["name"]))
+            if "components" in data:
+                codec.components = data["components"].astype(np.float32)
+        return codec
+
+
+def score_drift(full: np.ndarray, codec: EmbeddingCodec, queries: np.ndarray, k: int = 50) -> Dict:
+    """
+    Compare query·vector scores under `codec` with full precision.
+    full: full-precision vectors; queries: full-precision query vectors.
+    Reports absolute score error and overlap of the top-k rows per query.
+    """
+    full = np.asarray(full, dtype=np.float32)
+    queries = np.asarray(queries, dtype=np.float32)
+    if queries.ndim == 1:
+        queries = queries[None, :]
+    exact = full @ queries.T
+    approx = codec.encode(full).astype(np.float32) @ codec.project(queries).T
+    err = np.abs(exact - approx)
+    k = max(1, min(k, len(full)))
+    overlaps = []
+    for qi in range(len(queries)):
+        top_exact = set(np.argpartition(-exact[:, qi], k - 1)[:k].tolist())
+        top_approx = set(np.argpartition(-approx[:, qi], k - 1)[:k].tolist())
+        overlaps.append(len(top_exact & top_approx) / k)
+    dim = full.shape[1]
+    return {
+        "codec": codec.name,
+        "vectors": len(full),
+        "bytes_per_vector": codec.bytes_per_vector(dim),
+        "compression": round(dim * 4 / codec.bytes_per_vector(dim), 2),
+        "max_abs_error": round(float(err.max()), 6),
+        "mean_abs_error": round(float(err.mean()), 6),
+        f"top{k}_overlap": round(float(np.mean(overlaps)), 4),
+    }
@@ -0,0 +1,124 @@
+# backend/utils/employee_directory.py
+"""
+Persistent employee directory shared by all tenants
+-----------------------------------------------------
+- Stored at backend/cache/employee_directory.json.
+- One entry per company, keyed by domain when known, else by canonical name
+  (lowercased, punctuation and legal suffixes like "Pvt Ltd" / "Inc" removed).
+- Each entry keeps the discovered employees (one record per linkedin_url, with
+  discovered_at / last_seen_at) and when the company was last searched.
+- An entry is fresh for ttl_days (empty results for empty_ttl_days); stale
+  entries are re-searched and merged by linkedin_url.
+- Partial searches (cut short by the query budget) are recorded too, flagged
+  partial: they get empty_ttl_days and don't mark earlier employees as gone.
+- save() re-reads the file and keeps the newest entry per company, so parallel
+  runs for different tenants don't drop each other's results.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BASE = Path(__file__).resolve().parents[1]  # backend/
+DEFAULT_PATH = BASE / "cache" / "employee_directory.json"
+TTL_DAYS = 14          # entries with employees
+EMPTY_TTL_DAYS = 3     # searches that found nobody are retried sooner
+
+LEGAL_SUFFIXES = re.compile(
+    r"\b(private limited|pvt ltd|pvt|ltd|limited|llp|llc|inc|incorporated|corp|corporation|co|company|gmbh|plc)\b"
+)
+
+_SAVE_LOCK = threading.Lock()
+
+
+def company_key(company_name: str, domain: Optional[str] = None) -> str:
+    """Canonical directory key: 'domain:<host>' if a website/domain is known, else 'name:<canonical name>'."""
+    if domain:
+        host = re.sub(r"^https?://", "", domain.strip().lower()).split("/")[0]
+        host = re.sub(r"^www\.", "", host)
+        if host:
+            return f"domain:{host}"
+    name = re.sub(r"[^a-z0-9\s]", " ", (company_name or "").lower())
+    name = LEGAL_SUFFIXES.sub(" ", name)
+    return "name:" + re.sub(r"\s+", " ", name).strip()
+
+
+class EmployeeDirectory:
+    def __init__(self, path: Path = DEFAULT_PATH, ttl_days: float = TTL_DAYS, empty_ttl_days: float = EMPTY_TTL_DAYS):
+        self.path = Path(path)
+        self.ttl = timedelta(days=ttl_days)
+        self.empty_ttl = timedelta(days=empty_ttl_days)
+        self.entries: Dict[str, Dict] = self._read()
+        self._dirty: set = set()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale": 0, "misses": 0}
+
+    def _read(self) -> Dict[str, Dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("companies", {}) or {}
+        except Exception as e:
+            logging.warning(f"Employee directory unreadable, starting fresh: {e}")
+            return {}
+
+    def lookup(self, key: str) -> Tuple[Optional[Dict], bool]:
+        """Return (entry, is_fresh); entry is None when the company was never searched."""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None, False
+            ttl = self.ttl if entry.get("employees") and not entry.get("partial") else self.empty_ttl
+            fresh = datetime.utcnow() - datetime.fromisoformat(entry["searched_at"]) < ttl
+            self.stats["hits" if fresh else "stale"] += 1
+            return entry, fresh
+
+    def record(self, key: str, company_name: str, found: List[Dict], partial: bool = False) -> List[Dict]:
+        """
+        Merge a new search result into the directory (by linkedin_url) and return the
+        merged employee list: this search's hits first, then earlier ones not seen again
+        (marked likely_current=False, unless the search was partial).
+        """
+        now = datetime.utcnow().isoformat()
+        with self._lock:
+            previous = {e["linkedin_url"]: e for e in (self.entries.get(key) or {}).get("employees", [])}
+            merged, seen = [], set()
+            for emp in found:
+                url = emp.get("linkedin_url")
+                if not url or url in seen:
+                    continue
+                old = previous.get(url, {})
+                merged.append({**emp, "discovered_at": old.get("discovered_at", now), "last_seen_at": now})
+                seen.add(url)
+            for url, old in previous.items():
+                if url not in seen:
+                    merged.append(old if partial else {**old, "likely_current": False})
+            self.entries[key] = {"company": company_name, "searched_at": now, "employees": merged}
+            if partial:
+                self.entries[key]["partial"] = True
+            self._dirty.add(key)
+            return merged
+
+    def save(self):
+        """Write atomically, keeping entries other runs saved meanwhile (newest search wins)."""
+        with _SAVE_LOCK:
+            on_disk = self._read()
+            with self._lock:
+                for key in self._dirty:
+                    mine, theirs = self.entries[key], on_disk.get(key)
+                    if theirs is None or theirs.get("searched_at", "") <= mine["searched_at"]:
+                        on_disk[key] = mine
+                self.entries = dict(on_disk)
+                self._dirty.clear()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"companies": on_disk}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
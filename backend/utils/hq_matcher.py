@@ -0,0 +1,79 @@
+# backend/utils/hq_matcher.py
+"""
+Batch HQ matching against a gazetteer of requirement cities
+------------------------------------------------------------
+- Each requested headquarters city is expanded to its known aliases
+  (bangalore/bengaluru, gurgaon/gurugram, bombay/mumbai, delhi ncr/new delhi, ...).
+- Company HQ strings are matched against every alias separately (not against the
+  concatenated requirement text) and the best match per company wins.
+- All companies are scored in one RapidFuzz cdist call (C++, multi-threaded).
+"""
+
+import re
+from typing import Dict, List, Sequence
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+# canonical city -> aliases (all lowercase, ascii)
+CITY_ALIASES: Dict[str, List[str]] = {
+    "bengaluru": ["bengaluru", "bangalore", "blr"],
+    "mumbai": ["mumbai", "bombay", "navi mumbai", "thane"],
+    "gurugram": ["gurugram", "gurgaon"],
+    "new delhi": ["new delhi", "delhi", "delhi ncr", "ncr"],
+    "noida": ["noida", "greater noida"],
+    "pune": ["pune", "poona"],
+    "chennai": ["chennai", "madras"],
+    "kolkata": ["kolkata", "calcutta"],
+    "hyderabad": ["hyderabad", "secunderabad", "cyberabad"],
+    "ahmedabad": ["ahmedabad", "amdavad"],
+    "kochi": ["kochi", "cochin"],
+    "thiruvananthapuram": ["thiruvananthapuram", "trivandrum"],
+    "vadodara": ["vadodara", "baroda"],
+    "mysuru": ["mysuru", "mysore"],
+    "san francisco": ["san francisco", "sf", "bay area"],
+    "new york": ["new york", "nyc", "new york city"],
+}
+
+_ALIAS_TO_CITY = {alias: city for city, aliases in CITY_ALIASES.items() for alias in aliases}
+
+
+def _norm(text: str) -> str:
+    text = re.sub(r"[^a-z0-9\s]", " ", (text or "").lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class HQMatcher:
+    def __init__(self, headquarters: Sequence[str]):
+        """headquarters: requirement HQ list (e.g. ["Bengaluru", "Mumbai", "Gurugram", "Pune"])."""
+        self.cities: List[str] = []
+        self.aliases: List[str] = []
+        for raw in headquarters or []:
+            name = _norm(raw)
+            if not name:
+                continue
+            city = _ALIAS_TO_CITY.get(name, name)
+            if city in self.cities:
+                continue
+            self.cities.append(city)
+            self.aliases.extend(a for a in CITY_ALIASES.get(city, [city]) if a not in self.aliases)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.aliases)
+
+    def score_batch(self, hq_texts: Sequence[str]) -> np.ndarray:
+        """Similarity in [0, 1] of each company HQ to its best-matching requirement city."""
+        out = np.zeros(len(hq_texts), dtype=np.float32)
+        if not self.enabled:
+            return out
+        rows = [i for i, t in enumerate(hq_texts) if t]
+        if not rows:
+            return out
+        queries = [_norm(hq_texts[i]) for i in rows]
+        scores = process.cdist(queries, self.aliases, scorer=fuzz.token_set_ratio, workers=-1)
+        out[rows] = scores.max(axis=1) / 100.0
+        return out
+
+    def score(self, hq_text: str) -> float:
+        return float(self.score_batch([hq_text])[0])
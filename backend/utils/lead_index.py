@@ -0,0 +1,148 @@
+# backend/utils/lead_index.py
+"""
+Persistent per-user lead index for incremental rescoring
+---------------------------------------------------------
+- Stored at /users/<user_id>/cache/lead_index.json.
+- One entry per company: enrichment hash, raw scoring features and scored result.
+- The whole index is tagged with a scoring hash (requirements profile + weights);
+  when it changes every entry is invalidated.
+- On sync, only companies whose enrichment hash changed (or new companies) are
+  recomputed; removed companies are dropped.
+- A ranking sorted by score is kept alongside the entries and updated by
+  upsert() / remove() (O(log N) search + list insert per change), so top_n()
+  is a slice instead of a pass over the whole index. Bulk fills (loading
+  from disk, syncing into an empty index) sort the ranking once instead.
+  Ties rank by insertion order (corpus order for a fresh index; a recomputed
+  company goes after the unchanged companies it ties with).
+"""
+
+import bisect
+import hashlib
+import itertools
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+
+def enrichment_hash(company: Dict) -> str:
+    """Stable content hash of one enriched company record."""
+    raw = json.dumps(company, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def company_keys(companies: List[Dict]) -> List[str]:
+    """Index keys (company name + website), de-duplicated in corpus order."""
+    keys, seen = [], {}
+    for c in companies:
+        base = f"{(c.get('company') or '').strip().lower()}|{(c.get('website') or '').strip().lower()}"
+        n = seen.get(base, 0) + 1
+        seen[base] = n
+        keys.append(base if n == 1 else f"{base}#{n}")
+    return keys
+
+
+class LeadIndex:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.scoring_hash = ""
+        self.entries: Dict[str, Dict] = {}
+        self.last_stats: Dict[str, int] = {}
+        self._ranking: List[Tuple[float, int, str]] = []  # (-score, seq, key), ascending
+        self._rank_keys: Dict[str, Tuple[float, int, str]] = {}
+        self._seq = itertools.count()
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                doc = json.load(f)
+            self.scoring_hash = doc.get("scoring_hash", "")
+            entries = doc.get("entries", {}) or {}
+        except Exception as e:
+            logging.warning(f"Lead index unreadable, starting fresh: {e}")
+            self.scoring_hash, entries = "", {}
+        self.entries = entries
+        self._rebuild_ranking()
+
+    # -------------------------
+    # Ranking maintenance
+    # -------------------------
+    def _rebuild_ranking(self):
+        """Sort the whole ranking once (O(N log N)); ties keep the entries' order."""
+        self._seq = itertools.count()
+        self._ranking = sorted((-float(e["result"]["score"]), next(self._seq), k) for k, e in self.entries.items())
+        self._rank_keys = {rank_key[2]: rank_key for rank_key in self._ranking}
+
+    def upsert(self, key: str, entry: Dict):
+        """Add or replace one entry and move it to its place in the ranking."""
+        self.remove(key)
+        self.entries[key] = entry
+        rank_key = (-float(entry["result"]["score"]), next(self._seq), key)
+        bisect.insort(self._ranking, rank_key)
+        self._rank_keys[key] = rank_key
+
+    def remove(self, key: str):
+        """Drop one entry (no-op for unknown keys)."""
+        rank_key = self._rank_keys.pop(key, None)
+        self.entries.pop(key, None)
+        if rank_key is not None:
+            del self._ranking[bisect.bisect_left(self._ranking, rank_key)]
+
+    def clear(self):
+        self.entries, self._ranking, self._rank_keys = {}, [], {}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"scoring_hash": self.scoring_hash, "entries": self.entries}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def sync(self, companies: List[Dict], scoring_hash: str, compute: Callable[[Dict], Dict]) -> List[Dict]:
+        """
+        Bring the index in line with `companies` and return their entries (corpus order).
+        compute(company) -> {"features": ..., "result": ...} is only called for companies
+        that are new, changed, or when scoring_hash differs from the stored one.
+        """
+        if scoring_hash != self.scoring_hash:
+            if self.entries:
+                logging.info("Requirements/weights changed → rescoring all companies")
+            self.clear()
+            self.scoring_hash = scoring_hash
+
+        keys = company_keys(companies)
+        bulk = not self.entries  # filling an empty index: rank once at the end
+        recomputed = 0
+        for key, company in zip(keys, companies):
+            h = enrichment_hash(company)
+            entry = self.entries.get(key)
+            if entry is None or entry.get("enrichment_hash") != h:
+                entry = {"enrichment_hash": h, **compute(company)}
+                if bulk:
+                    self.entries[key] = entry
+                else:
+                    self.upsert(key, entry)
+                recomputed += 1
+        if bulk:
+            self._rebuild_ranking()
+
+        gone = set(self.entries) - set(keys)
+        for key in gone:
+            self.remove(key)
+        removed = len(gone)
+        self.last_stats = {
+            "total": len(keys), "recomputed": recomputed,
+            "reused": len(keys) - recomputed, "removed": removed,
+        }
+        logging.info(
+            f"Lead index sync: {recomputed} recomputed, {len(keys) - recomputed} reused, {removed} removed"
+        )
+        return [self.entries[k] for k in keys]
+
+    def top_n(self, n: int) -> List[Dict]:
+        """Highest-scoring results, read off the maintained ranking (O(n))."""
+        return [self.entries[key]["result"] for _, _, key in self._ranking[:n]]
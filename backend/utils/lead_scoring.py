@@ -0,0 +1,184 @@
+# backend/utils/lead_scoring.py
+"""
+Pure-Python lead scoring math (no model / encoder dependencies).
+-----------------------------------------------------------------
+- ScoringAgent extracts raw per-company features (similarities, signals, sizes).
+- score_features() turns those features into score / fit_label / breakdown / reasons
+  for a given set of weights and requirement thresholds.
+- Lets the API re-rank persisted features with new weights without re-encoding.
+"""
+
+import math
+from typing import Dict, Optional
+
+DEFAULT_WEIGHTS = {
+    "industry": 38, "keywords": 32, "hq": 10,
+    "funding": 7, "expansion": 6, "negative": -8,
+    "momentum": 4, "hiring": 6, "founded_year": 3, "employees": 3,
+}
+
+# Requirement keys that only act as thresholds at scoring time (safe to override per request)
+THRESHOLD_KEYS = (
+    "min_funding_signal", "max_negative_signal", "hiring_required",
+    "founded_after", "employee_range",
+)
+
+BREAKDOWN_ORDER = (
+    "industry", "keywords", "hq", "funding", "expansion", "negative",
+    "momentum", "hiring", "founded_year", "employees",
+)
+
+
+def logistic(x, k=5, x0=0.5):
+    """Smooth logistic weighting (boosts values >0.5)."""
+    try:
+        return 1.0 / (1.0 + math.exp(-k * (x - x0)))
+    except Exception:
+        return 0.0
+
+
+def fit_label_for(score: float) -> str:
+    if score >= 75:
+        return "Excellent Match"
+    elif score >= 45:
+        return "Moderate Match"
+    return "Low Match"
+
+
+def score_features(features: Dict, requirements: Dict, weights: Optional[Dict] = None) -> Dict:
+    """
+    Score one company from its extracted features.
+    features: output of ScoringAgent.extract_features()
+    requirements: customer_requirements dict (only THRESHOLD_KEYS are read)
+    weights: component weights (defaults to DEFAULT_WEIGHTS)
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    breakdown = {}
+    reasons = []
+    total = 0.0
+
+    # --- Industry
+    ind_text = features.get("industry_text", "")
+    adj_ind_sim = float(features.get("industry_sim_adj", 0.0))
+    industry_score = weights["industry"] * adj_ind_sim
+    breakdown["industry"] = round(industry_score, 3)
+    if adj_ind_sim > 0.8:
+        reasons.append(f"Strong industry alignment ({ind_text})")
+    elif adj_ind_sim > 0.5:
+        reasons.append(f"Partial industry similarity ({ind_text})")
+    total += industry_score
+
+    # --- Keywords (semantic + exact overlap fraction)
+    kw_sem_sim = float(features.get("keyword_sem_sim", 0.0))
+    overlap_frac = float(features.get("keyword_overlap_frac", 0.0))
+    exact_overlap = features.get("keyword_overlap", []) or []
+    kw_score = weights["keywords"] * (0.65 * kw_sem_sim + 0.35 * overlap_frac)
+    breakdown["keywords"] = round(kw_score, 3)
+    if exact_overlap:
+        reasons.append(f"Keywords matched: {', '.join(exact_overlap)}")
+    elif kw_sem_sim > 0.45:
+        reasons.append("Semantic keyword similarity detected")
+    total += kw_score
+
+    # --- HQ
+    hq_sim = float(features.get("hq_sim", 0.0))
+    hq_score = weights["hq"] * hq_sim
+    breakdown["hq"] = round(hq_score, 3)
+    if hq_sim > 0.8:
+        reasons.append("HQ region matches")
+    elif hq_sim > 0.5:
+        reasons.append("HQ region partially matches")
+    total += hq_score
+
+    # --- Signals: funding, expansion, negative (contextualized by industry relevance)
+    f = float(features.get("funding_signal", 0.0))
+    e = float(features.get("expansion_signal", 0.0))
+    n = float(features.get("negative_signal", 0.0))
+
+    # domain_factor reduces signal impact when industry relevance is low
+    domain_factor = 0.5 + 0.5 * adj_ind_sim
+    funding_score = weights["funding"] * logistic(f) * domain_factor
+    expansion_score = weights["expansion"] * logistic(e) * domain_factor
+    negative_score = weights["negative"] * n  # negative weight already negative value
+    breakdown["funding"] = round(funding_score, 3)
+    breakdown["expansion"] = round(expansion_score, 3)
+    breakdown["negative"] = round(negative_score, 3)
+    if f >= requirements.get("min_funding_signal", 0.0):
+        reasons.append("Meets funding threshold")
+    if f >= 0.7:
+        reasons.append("Strong funding momentum")
+    if e >= 0.5:
+        reasons.append("Active expansion observed")
+    if n >= requirements.get("max_negative_signal", 1.0):
+        reasons.append("High negative sentiment detected")
+    total += funding_score + expansion_score + negative_score
+
+    # --- Momentum (derived)
+    momentum = max(0.0, (f + e - n) / 2.0) * domain_factor
+    momentum_score = weights["momentum"] * momentum
+    breakdown["momentum"] = round(momentum_score, 3)
+    if momentum >= 0.6:
+        reasons.append("High momentum (growth health)")
+    total += momentum_score
+
+    # --- Hiring requirement
+    if requirements.get("hiring_required", False):
+        if features.get("hiring"):
+            hiring_score = weights["hiring"]
+            reasons.append("Actively hiring")
+        else:
+            hiring_score = -abs(weights["hiring"]) * 0.5
+            reasons.append("Not hiring (requirement unmet)")
+    else:
+        hiring_score = 0.0
+    breakdown["hiring"] = round(hiring_score, 3)
+    total += hiring_score
+
+    # --- Founded year freshness
+    fy_score = 0.0
+    try:
+        fy = features.get("founded_year")
+        if fy:
+            after = int(requirements.get("founded_after", 0) or 0)
+            if after and fy >= after:
+                # map (fy-after) into [0..1] then logistic
+                val = (fy - after) / max(1.0, (2025 - after))  # normalized horizon (2025 as rough cap)
+                freshness = logistic(val, k=6, x0=0.2)
+                fy_score = weights["founded_year"] * freshness
+                reasons.append(f"Founded recently ({fy})")
+    except Exception:
+        fy_score = 0.0
+    breakdown["founded_year"] = round(fy_score, 3)
+    total += fy_score
+
+    # --- Employees
+    emp_score = 0.0
+    emp_val = int(features.get("employees", 0) or 0)
+    if emp_val > 0:
+        low, high = requirements.get("employee_range", [0, 99999999])
+        if low <= emp_val <= high:
+            emp_score = weights["employees"]
+            reasons.append(f"Employee size within target ({emp_val})")
+        elif (low * 0.8) <= emp_val <= (high * 1.2):
+            emp_score = weights["employees"] * 0.6
+            reasons.append(f"Employee size near target ({emp_val})")
+    breakdown["employees"] = round(emp_score, 3)
+    total += emp_score
+
+    # --- Industry irrelevance gate: cap final score if industry similarity is very low
+    if adj_ind_sim < 0.35:
+        total = min(total, 40.0)
+
+    final_score = max(0.0, min(100.0, round(total, 2)))
+
+    # Ensure consistent ordering in breakdown
+    ordered_breakdown = {k: breakdown.get(k, 0.0) for k in BREAKDOWN_ORDER}
+    ordered_breakdown["total"] = final_score
+
+    return {
+        "company": features.get("company"),
+        "score": final_score,
+        "fit_label": fit_label_for(final_score),
+        "breakdown": ordered_breakdown,
+        "reasons": reasons,
+    }
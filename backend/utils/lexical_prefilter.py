@@ -0,0 +1,128 @@
+# backend/utils/lexical_prefilter.py
+"""
+Lexical prefilter for lead scoring (stage 1 of 2)
+--------------------------------------------------
+- Cheap token + character-trigram overlap between each company's industry /
+  keyword text and the expanded requirement industries / keywords.
+- Requirement keywords match exact tokens; requirement industries only match
+  through trigram Dice on their content words (generic words like "and",
+  "for", "services" are dropped, or they would let almost everything through).
+- Companies with no keyword hit and no industry resemblance are discarded
+  before any transformer encode; survivors get the full semantic scoring.
+- Built on an inverted trigram index so candidate lookup only touches postings
+  of requirement n-grams, not every company.
+- prefilter_recall() measures how many of the full scorer's top-N survive.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Set
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"\b[a-z]{3,30}\b")
+MIN_INDUSTRY_DICE = 0.3   # trigram Dice similarity to any requested industry
+MIN_KEYWORD_HITS = 1      # exact keyword tokens shared with the expanded keyword list
+INDUSTRY_STOPWORDS = {
+    "and", "for", "the", "with", "other", "services", "service", "solutions", "products",
+    "industry", "industries", "related", "general", "misc", "miscellaneous",
+}
+
+
+def _tokens(text: str) -> Set[str]:
+    return set(TOKEN_RE.findall((text or "").lower()))
+
+
+def _industry_tokens(text: str) -> Set[str]:
+    return _tokens(text) - INDUSTRY_STOPWORDS
+
+
+def _trigrams(text: str) -> Set[str]:
+    grams = set()
+    for tok in _industry_tokens(text):
+        padded = f" {tok} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class LexicalPrefilter:
+    def __init__(self, req_industries: Sequence[str], req_keywords: Sequence[str],
+                 min_industry_dice: float = MIN_INDUSTRY_DICE, min_keyword_hits: int = MIN_KEYWORD_HITS):
+        self.min_industry_dice = min_industry_dice
+        self.min_keyword_hits = min_keyword_hits
+        self.req_keywords = set(req_keywords)
+        self.req_industry_grams = [g for g in (_trigrams(ind) for ind in req_industries if ind) if g]
+        # keyword-hit path: requirement keywords only (industries go through trigram Dice)
+        self.req_tokens = set(self.req_keywords) - INDUSTRY_STOPWORDS
+        self.last_stats: Dict = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.req_industry_grams or self.req_tokens)
+
+    def survivors(self, industries: Sequence[str], keyword_lists: Sequence[Iterable[str]]) -> List[int]:
+        """
+        Indices of companies that pass the lexical stage.
+        industries: normalized industry text per company
+        keyword_lists: extracted keyword tokens per company (ScoringAgent.extract_keywords)
+        """
+        if not self.enabled:
+            self.last_stats = {"corpus": len(industries), "survivors": len(industries), "survivor_rate": 1.0}
+            return list(range(len(industries)))
+        keep = np.zeros(len(industries), dtype=bool)
+
+        # keyword path: inverted token index → hits per company
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for i, (ind, kws) in enumerate(zip(industries, keyword_lists)):
+            for tok in set(kws) | _tokens(ind):
+                postings[tok].append(i)
+        hits = [postings[t] for t in self.req_tokens if t in postings]
+        if hits:
+            counts = np.bincount(np.concatenate(hits), minlength=len(industries))
+            keep |= counts >= self.min_keyword_hits
+
+        # industry path: trigram Dice against each requested industry (only for undecided rows)
+        gram_postings: Dict[str, List[int]] = defaultdict(list)
+        company_grams = []
+        for i, ind in enumerate(industries):
+            grams = _trigrams(ind) if not keep[i] else set()
+            company_grams.append(len(grams))
+            for g in grams:
+                gram_postings[g].append(i)
+        sizes = np.asarray(company_grams, dtype=np.float32)
+        for req_grams in self.req_industry_grams:
+            lists = [gram_postings[g] for g in req_grams if g in gram_postings]
+            if not lists:
+                continue
+            shared = np.bincount(np.concatenate(lists), minlength=len(industries))
+            dice = 2.0 * shared / np.maximum(sizes + len(req_grams), 1.0)
+            keep |= dice >= self.min_industry_dice
+
+        survivors = np.flatnonzero(keep).tolist()
+        self.last_stats = {
+            "corpus": len(industries),
+            "survivors": len(survivors),
+            "survivor_rate": round(len(survivors) / len(industries), 4) if len(industries) else 1.0,
+        }
+        return survivors
+
+
+def prefilter_recall(full_ranking: Sequence[Dict], survivor_names: Set[str], top_n: int = 50,
+                     min_score: float = 45.0) -> Dict:
+    """
+    Compare the prefilter against the full scorer.
+    full_ranking: full-scorer results sorted by score (desc)
+    survivor_names: company names that passed the prefilter
+    """
+    top = list(full_ranking[:top_n])
+    qualified = [r for r in full_ranking if r["score"] >= min_score]
+    kept_top = sum(1 for r in top if r["company"] in survivor_names)
+    kept_q = sum(1 for r in qualified if r["company"] in survivor_names)
+    return {
+        "top_n": len(top),
+        "recall_at_n": round(kept_top / len(top), 4) if top else 1.0,
+        "qualified": len(qualified),
+        "qualified_recall": round(kept_q / len(qualified), 4) if qualified else 1.0,
+        "survivors": len(survivor_names),
+        "corpus": len(full_ranking),
+    }
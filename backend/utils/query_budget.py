@@ -0,0 +1,79 @@
+# backend/utils/query_budget.py
+"""
+Score-weighted search query budget for a run
+----------------------------------------------
+- A total number of search queries is split across companies: every company
+  gets min_per_company, the rest is shared in proportion to lead score
+  (largest-remainder rounding, so allocations sum exactly to the total).
+- take(company) spends one query from the company's allocation, then from
+  the shared pool of queries handed back by companies that finished early.
+- finish(company) returns a company's unused allocation to that pool;
+  refund() does the same for queries taken but cancelled before sending.
+- Thread-safe: companies may be searched concurrently.
+"""
+
+import math
+import threading
+from typing import Dict, Sequence
+
+
+class QueryBudget:
+    def __init__(self, total: int, scores: Dict[str, float], min_per_company: int = 2):
+        self.total = max(0, int(total))
+        self.min_per_company = max(0, int(min_per_company))
+        self.allocation = self._allocate(list(scores), scores)
+        self._left = dict(self.allocation)
+        self._pool = 0
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    def _allocate(self, companies: Sequence[str], scores: Dict[str, float]) -> Dict[str, int]:
+        """companies are expected in priority (score) order."""
+        n = len(companies)
+        if not n:
+            return {}
+        if self.total < self.min_per_company * n:
+            # not even the minimum for everyone: highest-scored companies first
+            alloc, left = {}, self.total
+            for c in companies:
+                alloc[c] = min(self.min_per_company, left)
+                left -= alloc[c]
+            return alloc
+        extra = self.total - self.min_per_company * n
+        weights = [max(float(scores.get(c) or 0.0), 0.0) for c in companies]
+        if sum(weights) <= 0:
+            weights = [1.0] * n
+        shares = [extra * w / sum(weights) for w in weights]
+        alloc = {c: self.min_per_company + math.floor(s) for c, s in zip(companies, shares)}
+        remainder = extra - sum(math.floor(s) for s in shares)
+        by_fraction = sorted(range(n), key=lambda i: shares[i] - math.floor(shares[i]), reverse=True)
+        for i in by_fraction[:remainder]:
+            alloc[companies[i]] += 1
+        return alloc
+
+    def take(self, company: str) -> bool:
+        """Spend one query for `company`; False when neither its allocation nor the pool has any left."""
+        with self._lock:
+            if self._left.get(company, 0) > 0:
+                self._left[company] -= 1
+            elif self._pool > 0:
+                self._pool -= 1
+            else:
+                return False
+            self.spent += 1
+            return True
+
+    def refund(self, n: int = 1):
+        """Queries that were taken but never sent (cancelled) go to the shared pool."""
+        with self._lock:
+            self._pool += n
+            self.spent -= n
+
+    def finish(self, company: str):
+        """Hand back the company's unused queries to the shared pool."""
+        with self._lock:
+            self._pool += self._left.pop(company, 0)
+
+    def remaining(self, company: str) -> int:
+        with self._lock:
+            return self._left.get(company, 0) + self._pool
@@ -0,0 +1,76 @@
+# backend/utils/rate_limiter.py
+"""
+Thread-safe token-bucket rate limiter for outbound search calls
+----------------------------------------------------------------
+- rate: sustained calls per second across all threads sharing the limiter.
+- burst: how many calls may go out back-to-back after an idle period.
+- jitter: extra random delay (seconds, uniform 0..jitter) so calls don't
+  line up on exact intervals.
+- Callers reserve a slot under the lock and sleep outside it, so waiting
+  threads are served in arrival order.
+- acquire(cancel=event) waits on the event instead of sleeping; when it is
+  set during the wait the reserved slot is handed back and None is returned.
+- shared_limiter(name, ...) returns one process-wide limiter per name (e.g.
+  "ddgs"), so every agent hitting the same service draws from one budget.
+  The first caller's settings win; a later call asking for different ones
+  gets a warning.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: int = 1, jitter: float = 0.0):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.jitter = max(0.0, float(jitter))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cancel: Optional[threading.Event] = None) -> Optional[float]:
+        """
+        Block until a call may be made; returns the seconds waited, or None when
+        `cancel` was set before the slot came up (the slot is given back).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if self.jitter:
+            wait += random.uniform(0, self.jitter)
+        if cancel is None:
+            if wait > 0:
+                time.sleep(wait)
+        elif cancel.wait(wait) if wait > 0 else cancel.is_set():
+            with self._lock:
+                self._tokens += 1.0
+            return None
+        return wait
+
+
+_LIMITERS: Dict[str, RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def shared_limiter(name: str, rate: float, burst: int = 1, jitter: float = 0.0) -> RateLimiter:
+    """Process-wide limiter for `name`; the first caller's settings win."""
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(name)
+        if limiter is None:
+            limiter = RateLimiter(rate, burst=burst, jitter=jitter)
+            _LIMITERS[name] = limiter
+        elif (limiter.rate, limiter.burst, limiter.jitter) != (float(rate), max(1, int(burst)), max(0.0, float(jitter))):
+            logging.warning(
+                f"Shared limiter '{name}' already runs at rate={limiter.rate}/s burst={limiter.burst} "
+                f"jitter={limiter.jitter}s; ignoring requested rate={rate}/s burst={burst} jitter={jitter}s"
+            )
+        return limiter
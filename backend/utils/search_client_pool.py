@@ -0,0 +1,141 @@
+# backend/utils/search_client_pool.py
+"""
+Thread-safe pool of long-lived DDGS search clients
+----------------------------------------------------
+- Clients are created lazily (up to `size`) and reused across queries, so
+  their HTTP connections stay warm instead of a new client per query.
+- Each client is checked out by one thread at a time; callers beyond `size`
+  wait for a free client.
+- Health checks on checkout: clients older than max_age_s or used more than
+  max_uses times are closed and replaced.
+- A client whose query raised is recycled after max_errors consecutive
+  failures (the error is still raised to the caller, which keeps its retries).
+- shared_search_pool(name, ...) returns one process-wide pool per name, so
+  employee_finder and enrichment_agent share the same clients.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from ddgs import DDGS
+
+POOL_SIZE = 8
+MAX_USES = 500        # queries per client before it is replaced
+MAX_AGE_S = 900       # seconds a client may live
+MAX_ERRORS = 2        # consecutive failures before a client is recycled
+
+
+class _PooledClient:
+    def __init__(self, client):
+        self.client = client
+        self.created = time.monotonic()
+        self.uses = 0
+        self.errors = 0
+
+
+class SearchClientPool:
+    def __init__(self, size: int = POOL_SIZE, max_uses: int = MAX_USES, max_age_s: float = MAX_AGE_S,
+                 max_errors: int = MAX_ERRORS, factory: Optional[Callable] = None):
+        self.size = max(1, int(size))
+        self.max_uses = max_uses
+        self.max_age_s = max_age_s
+        self.max_errors = max(1, int(max_errors))
+        self.factory = factory or DDGS
+        self._idle: List[_PooledClient] = []
+        self._open = 0
+        self._cond = threading.Condition()
+        self.stats = {"created": 0, "recycled": 0, "queries": 0, "errors": 0}
+
+    def _healthy(self, pc: _PooledClient) -> bool:
+        return pc.uses < self.max_uses and time.monotonic() - pc.created < self.max_age_s
+
+    def _close(self, pc: _PooledClient):
+        exit_ = getattr(pc.client, "__exit__", None)
+        try:
+            if exit_ is not None:
+                exit_(None, None, None)
+        except Exception as e:
+            logging.debug(f"Closing search client failed: {e}")
+
+    def _checkout(self) -> _PooledClient:
+        with self._cond:
+            while True:
+                while self._idle:
+                    pc = self._idle.pop()
+                    if self._healthy(pc):
+                        return pc
+                    self._open -= 1
+                    self.stats["recycled"] += 1
+                    self._close(pc)
+                if self._open < self.size:
+                    self._open += 1
+                    break
+                self._cond.wait()
+        try:
+            client = self.factory()
+            enter = getattr(client, "__enter__", None)
+            pc = _PooledClient(enter() if enter is not None else client)
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.stats["created"] += 1
+        return pc
+
+    def _checkin(self, pc: _PooledClient, failed: bool):
+        with self._cond:
+            pc.uses += 1
+            self.stats["queries"] += 1
+            pc.errors = pc.errors + 1 if failed else 0
+            if failed:
+                self.stats["errors"] += 1
+            if pc.errors >= self.max_errors or not self._healthy(pc):
+                self._open -= 1
+                self.stats["recycled"] += 1
+                self._close(pc)
+            else:
+                self._idle.append(pc)
+            self._cond.notify()
+
+    @contextmanager
+    def client(self):
+        """Check out a client for one query; errors count towards recycling it."""
+        pc = self._checkout()
+        failed = False
+        try:
+            yield pc.client
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._checkin(pc, failed)
+
+    def text(self, query: str, max_results: int = 10) -> List[Dict]:
+        with self.client() as ddgs:
+            return list(ddgs.text(query, max_results=max_results))
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for pc in idle:
+            self._close(pc)
+
+
+_POOLS: Dict[str, SearchClientPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def shared_search_pool(name: str = "ddgs", size: int = POOL_SIZE, **kwargs) -> SearchClientPool:
+    """Process-wide client pool for `name`; the first caller's settings win."""
+    with _POOLS_LOCK:
+        pool = _POOLS.get(name)
+        if pool is None:
+            pool = SearchClientPool(size=size, **kwargs)
+            _POOLS[name] = pool
+        return pool
@@ -0,0 +1,110 @@
+# backend/utils/template_stats.py
+"""
+Per-template hit statistics for employee search queries (UCB1 ordering)
+------------------------------------------------------------------------
+- Stored at backend/cache/query_template_stats.json, shared by all tenants.
+- Counts queries and valid sales employees found per
+  (region, company size band, query template).
+- order() ranks templates by UCB1 (mean hit rate + exploration bonus); never
+  tried templates go first, in their default order.
+- save() re-reads the file and adds this run's counts, so concurrent runs
+  don't overwrite each other.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+BASE = Path(__file__).resolve().parents[1]  # backend/
+DEFAULT_PATH = BASE / "cache" / "query_template_stats.json"
+EXPLORATION = 0.5          # UCB1 exploration weight
+HIT_CAP = 3                # hits per query counted towards the mean (max_employees per company)
+
+_SAVE_LOCK = threading.Lock()
+
+
+def size_band(employees_count) -> str:
+    """Coarse company size band from an enrichment employees_count value ('1,001-5,000', '200+', 'N/A', ...)."""
+    if isinstance(employees_count, list):
+        employees_count = next((v for v in employees_count if v not in (None, "", "N/A")), "")
+    m = re.search(r"\d[\d,]*", str(employees_count or ""))
+    if not m:
+        return "unknown"
+    n = int(m.group(0).replace(",", ""))
+    if re.search(r"\d\s*k\b", str(employees_count).lower()):
+        n *= 1000
+    if n < 50:
+        return "<50"
+    if n < 500:
+        return "50-500"
+    if n < 5000:
+        return "500-5000"
+    return "5000+"
+
+
+class TemplateStats:
+    def __init__(self, path: Path = DEFAULT_PATH, hit_cap: int = HIT_CAP):
+        self.path = Path(path)
+        self.hit_cap = max(1, int(hit_cap))
+        self.stats: Dict[str, Dict[str, int]] = self._read()
+        self._delta: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Dict[str, int]]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("templates", {}) or {}
+        except Exception as e:
+            logging.warning(f"Template stats unreadable, starting fresh: {e}")
+            return {}
+
+    @staticmethod
+    def _key(region: str, band: str, template: str) -> str:
+        return f"{region}|{band}|{template}"
+
+    def order(self, region: str, band: str, templates: Sequence[str]) -> List[str]:
+        with self._lock:
+            arms = [self.stats.get(self._key(region, band, t), {"queries": 0, "hits": 0}) for t in templates]
+        total = sum(a["queries"] for a in arms)
+
+        def ucb(i):
+            a = arms[i]
+            if not a["queries"]:
+                return math.inf
+            mean = min(a["hits"] / a["queries"], self.hit_cap) / self.hit_cap
+            return mean + EXPLORATION * math.sqrt(math.log(max(total, 1)) / a["queries"])
+
+        # stable: untried (inf) and tied arms keep the default order
+        return [templates[i] for i in sorted(range(len(templates)), key=lambda i: -ucb(i))]
+
+    def record(self, region: str, band: str, template: str, hits: int):
+        key = self._key(region, band, template)
+        with self._lock:
+            for table in (self.stats, self._delta):
+                entry = table.setdefault(key, {"queries": 0, "hits": 0})
+                entry["queries"] += 1
+                entry["hits"] += int(hits)
+
+    def save(self):
+        """Add this run's counts to whatever is on disk and write atomically."""
+        with _SAVE_LOCK:
+            on_disk = self._read()
+            with self._lock:
+                for key, d in self._delta.items():
+                    entry = on_disk.setdefault(key, {"queries": 0, "hits": 0})
+                    entry["queries"] += d["queries"]
+                    entry["hits"] += d["hits"]
+                self._delta = {}
+                self.stats = on_disk
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"templates": on_disk}, f, indent=2)
+            os.replace(tmp, self.path)
@@ -0,0 +1,120 @@
+# backend/utils/verifalia_accounts.py
+"""
+Multi-account scheduler for Verifalia verification jobs
+---------------------------------------------------------
+- Tracks every configured account: remaining credits (from the
+  /credits/balance endpoint when available, then decremented per entry),
+  jobs in flight, rate-limit cooldown and whether it is exhausted.
+- acquire(entries) picks the account for the next job: not exhausted, not
+  cooling down, below max_in_flight jobs, with credits not already reserved
+  by jobs in flight, preferring accounts with enough of them for the job,
+  then the most left, then the least busy. Jobs therefore run on all
+  accounts in parallel instead of one at a time.
+- The chosen account reserves the entries it can pay for (all of them when
+  its balance is unknown) and returns (account, reserved): a smaller number
+  means the caller should split the job instead of burning a 402.
+- release() settles the reservation and records the outcome: entries used,
+  401/402 (account exhausted), 429 (cooldown from Retry-After, else
+  cooldown_s). The caller resubmits the same job on the next acquired
+  account, so nothing is dropped on rotation.
+- For asyncio callers (AsyncVerifaliaEngine); state changes happen on the
+  event loop thread, so no locking is needed.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+MAX_IN_FLIGHT_PER_ACCOUNT = 4
+COOLDOWN_S = 30.0
+CREDITS_PER_ENTRY = 1.0   # Standard quality
+
+
+class AccountScheduler:
+    def __init__(self, accounts: List[Dict[str, str]], max_in_flight: int = MAX_IN_FLIGHT_PER_ACCOUNT,
+                 cooldown_s: float = COOLDOWN_S):
+        self.accounts = accounts
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.cooldown_s = cooldown_s
+        self.state = [
+            {"remaining": None, "reserved": 0.0, "in_flight": 0, "cool_until": 0.0, "exhausted": False,
+             "jobs": 0, "entries": 0}
+            for _ in accounts
+        ]
+
+    @property
+    def all_exhausted(self) -> bool:
+        return all(s["exhausted"] for s in self.state)
+
+    def remaining_credits(self) -> Optional[float]:
+        """Known credits left across usable accounts (None if no balance is known)."""
+        known = [s["remaining"] for s in self.state if not s["exhausted"] and s["remaining"] is not None]
+        return sum(known) if known else None
+
+    def set_balance(self, idx: int, credits: Optional[float]):
+        self.state[idx]["remaining"] = credits
+        if credits is not None and credits < CREDITS_PER_ENTRY:
+            self.state[idx]["exhausted"] = True
+
+    def capacity(self, idx: int) -> Optional[int]:
+        """Entries the account can still pay for beyond jobs in flight (None if its balance is unknown)."""
+        s = self.state[idx]
+        return None if s["remaining"] is None else int((s["remaining"] - s["reserved"]) // CREDITS_PER_ENTRY)
+
+    def _candidates(self, now: float) -> List[int]:
+        return [
+            i for i, s in enumerate(self.state)
+            if not s["exhausted"] and s["cool_until"] <= now and s["in_flight"] < self.max_in_flight
+            and (self.capacity(i) is None or self.capacity(i) > 0)
+        ]
+
+    async def acquire(self, entries: int) -> Optional[Tuple[int, int]]:
+        """
+        (account index, entries reserved) for a job of `entries` addresses; waits for a free
+        slot (or for jobs in flight to settle their credits); None when all are exhausted.
+        """
+        while not self.all_exhausted:
+            now = time.monotonic()
+            free = self._candidates(now)
+            if free:
+                def key(i):
+                    fits = self.capacity(i)
+                    fits = float("inf") if fits is None else fits
+                    return (fits >= entries, fits, -self.state[i]["in_flight"])
+                idx = max(free, key=key)
+                fits = self.capacity(idx)
+                reserved = entries if fits is None else min(entries, fits)
+                self.state[idx]["in_flight"] += 1
+                self.state[idx]["reserved"] += reserved * CREDITS_PER_ENTRY
+                return idx, reserved
+            usable = [s for s in self.state if not s["exhausted"]]
+            if any(s["cool_until"] <= now for s in usable):
+                wait = 0.05  # all busy: a slot frees up when a job finishes
+            else:
+                wait = min(s["cool_until"] for s in usable) - now
+            await asyncio.sleep(max(wait, 0.01))
+        return None
+
+    def release(self, idx: int, reserved: int, used_entries: int = 0, status: Optional[int] = None,
+                retry_after: Optional[float] = None):
+        """Settle a job acquired with `reserved` entries: `used_entries` were actually charged."""
+        s = self.state[idx]
+        s["in_flight"] = max(0, s["in_flight"] - 1)
+        s["reserved"] = max(0.0, s["reserved"] - reserved * CREDITS_PER_ENTRY)
+        if used_entries:
+            s["jobs"] += 1
+            s["entries"] += used_entries
+            if s["remaining"] is not None:
+                s["remaining"] = max(0.0, s["remaining"] - used_entries * CREDITS_PER_ENTRY)
+                s["exhausted"] = s["remaining"] < CREDITS_PER_ENTRY
+        if status in (401, 402):
+            s["exhausted"] = True
+        elif status == 429:
+            s["cool_until"] = time.monotonic() + (retry_after if retry_after is not None else self.cooldown_s)
+
+    def summary(self) -> List[Dict]:
+        return [
+            {"account": i + 1, "user": acc.get("user", ""), "jobs": s["jobs"], "entries": s["entries"],
+             "remaining": s["remaining"], "exhausted": s["exhausted"]}
+            for i, (acc, s) in enumerate(zip(self.accounts, self.state))
+        ]
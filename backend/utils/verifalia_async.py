@@ -0,0 +1,302 @@
+# backend/utils/verifalia_async.py
+"""
+Asynchronous Verifalia verification engine
+--------------------------------------------
+- Splits addresses into multi-entry jobs (job_entries each) and runs them
+  concurrently over one pooled httpx.AsyncClient, spread across all
+  configured accounts by an AccountScheduler (utils/verifalia_accounts.py):
+  up to max_in_flight_per_account jobs per account, credits tracked from
+  the balance endpoint; a job larger than any account's remaining credits is
+  split to fit.
+- Uses the API's server-side wait: submissions and status polls carry
+  ?waitTime=<ms>, so a job usually completes within one or two round trips.
+  If the server answers a poll immediately (no long-poll support), polling
+  falls back to exponential backoff (0.5s doubling, capped at 8s).
+- 401/402 retire an account, 429 cools it down; the job is resubmitted on
+  another account rather than dropped. A job the API accepted is never
+  resubmitted (it is paid for): errors while polling or paging its entries
+  only retry those calls, and a job that still fails maps to api_error
+  without affecting the other jobs. out_of_credits is true once every
+  account is exhausted.
+- Result dicts have the same shape as VerifaliaVerifier._parse_result
+  (parse_entry / default_result below are shared with contact_finder).
+- verify_batch() is the synchronous entry point used by ContactFinderAgent;
+  with a VerificationCache, cached addresses are answered without a job.
+"""
+
+import asyncio
+import base64
+import concurrent.futures
+import logging
+import time
+from typing import Dict, List, Optional
+
+from backend.utils.verifalia_accounts import MAX_IN_FLIGHT_PER_ACCOUNT, AccountScheduler
+
+try:
+    import httpx
+except ImportError:  # optional: contact_finder falls back to the requests-based verifier
+    httpx = None
+
+MAX_RETRIES = 3
+JOB_ENTRIES = 50          # addresses per job
+WAIT_TIME_MS = 20000      # server-side wait per submission / poll
+MAX_JOB_SECONDS = 300     # give up on a job after this long
+BACKOFF_START = 0.5
+BACKOFF_MAX = 8.0
+
+CONFIDENCE_BY_CLASS = {"Deliverable": 0.95, "Risky": 0.5, "Unknown": 0.2, "Undeliverable": 0.0}
+
+
+def parse_entry(entry: Dict) -> Dict:
+    classification = entry.get("classification", "Unknown")
+    return {
+        "email": entry.get("inputData", ""),
+        "is_valid": classification == "Deliverable",
+        "classification": classification,
+        "confidence": CONFIDENCE_BY_CLASS.get(classification, 0.1),
+        "verified": True,
+        "status": entry.get("status", "")
+    }
+
+
+def default_result(email: str, reason: str) -> Dict:
+    return {
+        "email": email,
+        "is_valid": False,
+        "classification": "Unknown",
+        "confidence": 0.0,
+        "verified": False,
+        "error": reason
+    }
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class AsyncVerifaliaEngine:
+    def __init__(self, accounts: List[Dict[str, str]], logger: Optional[logging.Logger] = None,
+                 api_base: str = "https://api.verifalia.com/v2.7", job_entries: int = JOB_ENTRIES,
+                 max_in_flight_per_account: int = MAX_IN_FLIGHT_PER_ACCOUNT, wait_time_ms: int = WAIT_TIME_MS,
+                 cache=None):
+        if httpx is None:
+            raise RuntimeError("httpx is required for the async verification engine")
+        self.accounts = accounts
+        self.logger = logger or logging.getLogger(__name__)
+        self.api_base = api_base.rstrip("/")
+        self.job_entries = max(1, int(job_entries))
+        self.scheduler = AccountScheduler(accounts, max_in_flight=max_in_flight_per_account)
+        self.max_in_flight = self.scheduler.max_in_flight * len(accounts)
+        self.wait_time_ms = int(wait_time_ms)
+        self.cache = cache
+        self.stats = {"jobs": 0, "polls": 0, "backoff_s": 0.0, "resubmitted": 0}
+        self._balances_checked = False
+
+    @property
+    def out_of_credits(self) -> bool:
+        return self.scheduler.all_exhausted
+
+    def _headers(self, idx: int) -> Dict[str, str]:
+        creds = self.accounts[idx]
+        auth = base64.b64encode(f"{creds['user']}:{creds['pass']}".encode()).decode()
+        return {
+            "Authorization": f"Basic {auth}",
+            "Content-Type": "application/json",
+            "User-Agent": f"AgenticCRM/EmailVerifier/{idx+1}"
+        }
+
+    async def _check_balances(self, client):
+        """Seed the scheduler with each account's credit balance (unknown if the call fails)."""
+
+        async def balance(idx):
+            try:
+                r = await client.get(f"{self.api_base}/credits/balance", headers=self._headers(idx))
+                if r.status_code == 200:
+                    data = r.json()
+                    return float(data.get("creditPacks") or 0) + float(data.get("freeCredits") or 0)
+                if r.status_code == 401:
+                    return 0.0
+            except (httpx.HTTPError, ValueError) as e:
+                self.logger.warning(f"Balance check failed for account #{idx+1}: {e}")
+            return None
+
+        balances = await asyncio.gather(*(balance(i) for i in range(len(self.accounts))))
+        for idx, credits in enumerate(balances):
+            self.scheduler.set_balance(idx, credits)
+        self.logger.info(f"💳 Verifalia credits per account: {balances}")
+        self._balances_checked = True
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def verify_batch(self, emails: List[str]) -> Dict[str, Dict]:
+        """{lowercased email: result} for all addresses; blocks until every job is done."""
+        emails = list(dict.fromkeys(e for e in emails if e))
+        cached: Dict[str, Dict] = {}
+        if self.cache is not None:
+            cached, emails = self.cache.split(emails)
+        if not emails:
+            return cached
+        results = self._run_sync(self.verify_many, emails)
+        if self.cache is not None:
+            self.cache.put_many(results)
+        return {**results, **cached}
+
+    def remaining_credits(self) -> Optional[float]:
+        """Credits left across usable accounts (reads the balances once; None if unknown)."""
+        if not self._balances_checked:
+            self._run_sync(self._fetch_balances)
+        return self.scheduler.remaining_credits()
+
+    @staticmethod
+    def _run_sync(fn, *args):
+        try:
+            asyncio.get_running_loop()
+            in_loop = True
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            # called from inside an event loop (e.g. an async route): run on a private loop
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ex:
+                return ex.submit(asyncio.run, fn(*args)).result()
+        return asyncio.run(fn(*args))
+
+    async def _fetch_balances(self):
+        async with httpx.AsyncClient(timeout=httpx.Timeout(15)) as client:
+            await self._check_balances(client)
+
+    async def verify_many(self, emails: List[str]) -> Dict[str, Dict]:
+        jobs = [emails[i:i + self.job_entries] for i in range(0, len(emails), self.job_entries)]
+        sem = asyncio.Semaphore(self.max_in_flight)
+        timeout = httpx.Timeout(self.wait_time_ms / 1000 + 15)
+        limits = httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight)
+        async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+            if not self._balances_checked:
+                await self._check_balances(client)
+
+            async def run(chunk):
+                async with sem:
+                    return await self._run_job(client, chunk)
+
+            results: Dict[str, Dict] = {}
+            parts = await asyncio.gather(*(run(chunk) for chunk in jobs), return_exceptions=True)
+            for chunk, part in zip(jobs, parts):
+                if isinstance(part, BaseException):
+                    # one bad job must not take the other jobs' results down with it
+                    self.logger.error(f"Verification job of {len(chunk)} entries failed: {part!r}")
+                    part = self._map(chunk, [], "api_error")
+                results.update(part)
+        return results
+
+    # -------------------------
+    # Jobs
+    # -------------------------
+    async def _run_job(self, client, emails: List[str]) -> Dict[str, Dict]:
+        payload = {"entries": [{"inputData": e} for e in emails], "quality": "Standard"}
+        failures = limited = 0
+        while failures < MAX_RETRIES and limited < MAX_RETRIES * len(self.accounts):
+            grant = await self.scheduler.acquire(len(emails))
+            if grant is None:
+                self.logger.error("❌ All Verifalia accounts exhausted. Stopping verification.")
+                break
+            idx, fits = grant
+            if fits < len(emails):
+                # the best account left can't pay for the whole job: split it instead of burning a 402
+                self.scheduler.release(idx, fits)
+                parts = await asyncio.gather(self._run_job(client, emails[:fits]), self._run_job(client, emails[fits:]))
+                return {**parts[0], **parts[1]}
+            headers = self._headers(idx)
+            used, status, retry_after = 0, None, None
+            try:
+                r = await client.post(f"{self.api_base}/email-validations", json=payload, headers=headers,
+                                      params={"waitTime": self.wait_time_ms})
+                status = r.status_code
+                if r.status_code in (200, 202):
+                    # accepted (and charged): from here on the job is only polled, never resubmitted
+                    self.stats["jobs"] += 1
+                    used = len(emails)
+                    return await self._collect(client, r, emails, headers)
+                if r.status_code in (401, 402, 429):
+                    retry_after = _retry_after(r.headers.get("Retry-After"))
+                    self.logger.warning(f"⚠️ Account #{idx+1} hit limit ({r.status_code}); resubmitting the {len(emails)}-entry job.")
+                    self.stats["resubmitted"] += 1
+                    limited += 1
+                    continue
+                self.logger.warning(f"Unexpected response {r.status_code}: {r.text[:200]}")
+            except httpx.HTTPError as e:
+                self.logger.error(f"Error verifying batch of {len(emails)}: {e}")
+            finally:
+                self.scheduler.release(idx, fits, used, status, retry_after)
+            failures += 1
+            await asyncio.sleep(BACKOFF_START * 2 ** failures)
+        return self._map(emails, [], "all_accounts_exhausted" if self.out_of_credits else "api_error")
+
+    async def _collect(self, client, r, emails: List[str], headers: Dict[str, str]) -> Dict[str, Dict]:
+        """Results of an accepted job; polling / entry paging is retried on errors, the job itself is not."""
+        try:
+            data = r.json()
+        except ValueError:
+            data = {}
+        job_id = (data.get("overview") or {}).get("id")
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                if r.status_code == 202 or (data.get("overview") or {}).get("status") != "Completed":
+                    if not job_id:
+                        self.logger.error(f"Accepted job of {len(emails)} entries returned no id; results lost")
+                        break
+                    data = await self._await_job(client, job_id, headers)
+                    if data is None:
+                        return self._map(emails, [], "timeout")
+                entries = await self._all_entries(client, data, headers)
+                return self._map(emails, [parse_entry(e) for e in entries], "no_entries")
+            except (httpx.HTTPError, ValueError, KeyError, AttributeError) as e:
+                self.logger.warning(f"Fetching results of job {job_id} failed (attempt {attempt}): {e}")
+                data = {"overview": {"id": job_id}}  # re-poll the same job
+                await asyncio.sleep(BACKOFF_START * 2 ** attempt)
+        return self._map(emails, [], "api_error")
+
+    async def _await_job(self, client, job_id: Optional[str], headers: Dict[str, str]) -> Optional[Dict]:
+        """Long-poll until Completed; exponential backoff when the server doesn't hold the request."""
+        if not job_id:
+            return None
+        url = f"{self.api_base}/email-validations/{job_id}"
+        deadline = time.monotonic() + MAX_JOB_SECONDS
+        delay = BACKOFF_START
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            try:
+                r = await client.get(url, headers=headers, params={"waitTime": self.wait_time_ms})
+                self.stats["polls"] += 1
+                if r.status_code == 200:
+                    data = r.json()
+                    if data.get("overview", {}).get("status") == "Completed":
+                        return data
+            except (httpx.HTTPError, ValueError) as e:
+                self.logger.warning(f"Polling failed for {job_id}: {e}")
+            if time.monotonic() - started < 1.0:  # answered at once: back off instead of spinning
+                await asyncio.sleep(delay)
+                self.stats["backoff_s"] += delay
+                delay = min(delay * 2, BACKOFF_MAX)
+        return None
+
+    async def _all_entries(self, client, data: Dict, headers: Dict[str, str]) -> List[Dict]:
+        page = data.get("entries", {}) or {}
+        entries = list(page.get("data", []))
+        job_id = data.get("overview", {}).get("id")
+        while job_id and (page.get("meta") or {}).get("isTruncated"):
+            r = await client.get(f"{self.api_base}/email-validations/{job_id}/entries",
+                                 headers=headers, params={"cursor": page["meta"].get("cursor")})
+            if r.status_code != 200:
+                break
+            page = r.json()
+            entries.extend(page.get("data", []))
+        return entries
+
+    @staticmethod
+    def _map(emails: List[str], parsed: List[Dict], missing_reason: str) -> Dict[str, Dict]:
+        by_email = {res["email"].lower(): res for res in parsed if res.get("email")}
+        return {e.lower(): by_email.get(e.lower()) or default_result(e, missing_reason) for e in emails}
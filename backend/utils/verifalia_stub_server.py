@@ -0,0 +1,228 @@
+# backend/utils/verifalia_stub_server.py
+"""
+Local stand-in for the Verifalia v2.7 email-validation API
+-----------------------------------------------------------
+- For offline tests and benchmarks of contact_finder: point the agent at it
+  with VERIFALIA_API_BASE=http://127.0.0.1:<port>/v2.7
+- POST /v2.7/email-validations: multi-entry jobs; optional ?waitTime=<ms>
+  returns 200 with results if the job finishes in time, else 202.
+- GET /v2.7/email-validations/<id>: 200 when completed, 202 while running;
+  ?waitTime=<ms> long-polls (disable with long_poll=False to test fallbacks).
+- GET /v2.7/email-validations/<id>/entries?cursor=...: paged entries.
+- Jobs take latency_s + per_entry_s * entries to complete.
+- Basic-auth users get `credits` entries each; an exhausted account gets 402.
+  GET /v2.7/credits/balance reports what is left (as freeCredits).
+- rate_limit: max job submissions per account per second; above it the
+  account gets 429 with Retry-After: 1.
+- Classification is deterministic per domain (hash of the domain):
+  "first.last" domains accept dotted full names, "first" domains accept
+  plain local parts, catch-all domains answer Risky/ServerIsCatchAll for
+  everything and dead domains answer Undeliverable/DomainDoesNotExist.
+  `rules` overrides the kind for given domains.
+
+Usage (from repo root):
+    python -m backend.utils.verifalia_stub_server --port 8765 --latency 1.0
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+DOMAIN_KINDS = [("first.last", 55), ("first", 30), ("catch_all", 10), ("dead", 5)]
+PAGE_SIZE = 100
+MAX_WAIT_MS = 30000
+
+
+def domain_kind(domain: str, rules: Optional[Dict[str, str]] = None) -> str:
+    if rules and domain in rules:
+        return rules[domain]
+    bucket = int(hashlib.md5(domain.encode()).hexdigest(), 16) % 100
+    for kind, weight in DOMAIN_KINDS:
+        if bucket < weight:
+            return kind
+        bucket -= weight
+    return DOMAIN_KINDS[0][0]
+
+
+def classify(email: str, rules: Optional[Dict[str, str]] = None) -> Tuple[str, str]:
+    """(classification, status) for an address."""
+    local, _, domain = email.lower().partition("@")
+    kind = domain_kind(domain, rules)
+    if kind == "dead":
+        return "Undeliverable", "DomainDoesNotExist"
+    if kind == "catch_all":
+        return "Risky", "ServerIsCatchAll"
+    if kind == "first.last" and re.fullmatch(r"[a-z]{2,}\.[a-z]{2,}", local):
+        return "Deliverable", "Success"
+    if kind == "first" and re.fullmatch(r"[a-z]{2,}", local):
+        return "Deliverable", "Success"
+    return "Undeliverable", "MailboxDoesNotExist"
+
+
+class StubState:
+    def __init__(self, latency_s: float, per_entry_s: float, credits: int, long_poll: bool,
+                 rules: Optional[Dict[str, str]], rate_limit: Optional[int] = None):
+        self.latency_s = latency_s
+        self.per_entry_s = per_entry_s
+        self.credits = credits
+        self.long_poll = long_poll
+        self.rules = rules or {}
+        self.rate_limit = rate_limit
+        self.jobs: Dict[str, Dict] = {}
+        self.used: Dict[str, int] = {}
+        self.recent: Dict[str, List[float]] = {}  # user → submission times in the last second
+        self.stats = {"submitted": 0, "entries": 0, "polls": 0, "rate_limited": 0, "by_user": {}}
+        self.lock = threading.Lock()
+
+    def job_view(self, job: Dict, with_entries: bool = True) -> Tuple[int, Dict]:
+        done = time.monotonic() >= job["ready_at"]
+        body = {"overview": {"id": job["id"], "status": "Completed" if done else "InProgress",
+                             "noOfEntries": len(job["entries"])}}
+        if done and with_entries:
+            body["entries"] = self.page(job, 0)
+        return (200 if done else 202), body
+
+    def throttled(self, user: str) -> bool:
+        """Record a submission; True if it goes over rate_limit (caller holds the lock)."""
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        recent = [t for t in self.recent.get(user, []) if now - t < 1.0]
+        if len(recent) >= self.rate_limit:
+            self.recent[user] = recent
+            return True
+        self.recent[user] = recent + [now]
+        return False
+
+    def page(self, job: Dict, start: int) -> Dict:
+        data = job["entries"][start:start + PAGE_SIZE]
+        more = start + PAGE_SIZE < len(job["entries"])
+        return {"meta": {"isTruncated": more, "cursor": str(start + PAGE_SIZE) if more else None}, "data": data}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    state: StubState = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):  # keep test output quiet
+        pass
+
+    def _send(self, code: int, body: Dict, headers: Optional[Dict[str, str]] = None):
+        raw = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _user(self) -> Optional[str]:
+        auth = self.headers.get("Authorization", "")
+        if not auth.startswith("Basic "):
+            return None
+        try:
+            return base64.b64decode(auth[6:]).decode().split(":", 1)[0]
+        except Exception:
+            return None
+
+    def _wait_ms(self, query: Dict) -> int:
+        try:
+            return min(int(query.get("waitTime", ["0"])[0]), MAX_WAIT_MS)
+        except ValueError:
+            return 0
+
+    def _wait_for(self, job: Dict, wait_ms: int):
+        if wait_ms and self.state.long_poll:
+            time.sleep(max(0.0, min(job["ready_at"] - time.monotonic(), wait_ms / 1000)))
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if not url.path.rstrip("/").endswith("/email-validations"):
+            return self._send(404, {"error": "not found"})
+        user = self._user()
+        if user is None:
+            return self._send(401, {"error": "unauthorized"})
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        emails = [e.get("inputData", "") for e in payload.get("entries", [])]
+        st = self.state
+        with st.lock:
+            if st.throttled(user):
+                st.stats["rate_limited"] += 1
+                return self._send(429, {"error": "too many requests"}, {"Retry-After": "1"})
+            if st.used.get(user, 0) + len(emails) > st.credits:
+                return self._send(402, {"error": "insufficient credits"})
+            st.used[user] = st.used.get(user, 0) + len(emails)
+            st.stats["by_user"][user] = st.stats["by_user"].get(user, 0) + len(emails)
+            st.stats["submitted"] += 1
+            st.stats["entries"] += len(emails)
+            entries = []
+            for e in emails:
+                classification, status = classify(e, st.rules)
+                entries.append({"inputData": e, "classification": classification, "status": status})
+            job = {"id": uuid.uuid4().hex, "entries": entries,
+                   "ready_at": time.monotonic() + st.latency_s + st.per_entry_s * len(emails)}
+            st.jobs[job["id"]] = job
+        self._wait_for(job, self._wait_ms(parse_qs(url.query)))
+        self._send(*st.job_view(job))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/").endswith("/credits/balance"):
+            user = self._user()
+            if user is None:
+                return self._send(401, {"error": "unauthorized"})
+            with self.state.lock:
+                left = max(0, self.state.credits - self.state.used.get(user, 0))
+            return self._send(200, {"creditPacks": 0, "freeCredits": left})
+        m = re.search(r"/email-validations/([0-9a-f]+)(/entries)?/?$", url.path)
+        job = self.state.jobs.get(m.group(1)) if m else None
+        if job is None:
+            return self._send(404, {"error": "not found"})
+        query = parse_qs(url.query)
+        with self.state.lock:
+            self.state.stats["polls"] += 1
+        if m.group(2):
+            return self._send(200, self.state.page(job, int(query.get("cursor", ["0"])[0] or 0)))
+        self._wait_for(job, self._wait_ms(query))
+        self._send(*self.state.job_view(job))
+
+
+def start_stub_server(port: int = 0, latency_s: float = 1.0, per_entry_s: float = 0.0, credits: int = 10 ** 9,
+                      long_poll: bool = True, rules: Optional[Dict[str, str]] = None,
+                      rate_limit: Optional[int] = None):
+    """Serve in a daemon thread; returns (server, api_base). server.state holds jobs and stats."""
+    state = StubState(latency_s, per_entry_s, credits, long_poll, rules, rate_limit)
+    handler = type("StubHandler", (_Handler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v2.7"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Verifalia stand-in")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=1.0, help="seconds per job")
+    parser.add_argument("--per-entry", type=float, default=0.0, help="extra seconds per entry")
+    parser.add_argument("--credits", type=int, default=10 ** 9, help="entries per account")
+    parser.add_argument("--no-long-poll", action="store_true", help="ignore waitTime")
+    parser.add_argument("--rate-limit", type=int, help="job submissions per account per second")
+    args = parser.parse_args()
+    srv, base = start_stub_server(args.port, args.latency, args.per_entry, args.credits, not args.no_long_poll,
+                                  rate_limit=args.rate_limit)
+    print(f"Verifalia stub listening on {base}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        srv.shutdown()
@@ -0,0 +1,132 @@
+# backend/utils/verification_cache.py
+"""
+Persistent email-verification result cache shared by all tenants
+------------------------------------------------------------------
+- Stored at backend/cache/verification_cache.json, keyed by lowercased email.
+- Keeps classification, status, confidence and verified_at for completed
+  verifications (API errors / timeouts are never cached).
+- Class-specific TTLs: Deliverable and Undeliverable answers are stable and
+  kept for weeks; Risky and Unknown are re-checked after a day or two.
+- peek() reads a classification without touching stats (used for planning).
+- split() separates a list of addresses into cached results and misses;
+  stats counts hits, misses and the credits (one per address) saved.
+- save() re-reads the file and keeps the newest verification per address.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BASE = Path(__file__).resolve().parents[1]  # backend/
+DEFAULT_PATH = BASE / "cache" / "verification_cache.json"
+TTL_DAYS = {
+    "Deliverable": 30,
+    "Undeliverable": 60,
+    "Risky": 3,
+    "Unknown": 1,
+}
+DEFAULT_TTL_DAYS = 1
+
+_SAVE_LOCK = threading.Lock()
+
+
+class VerificationCache:
+    def __init__(self, path: Path = DEFAULT_PATH, ttl_days: Optional[Dict[str, float]] = None):
+        self.path = Path(path)
+        self.ttl_days = {**TTL_DAYS, **(ttl_days or {})}
+        self.entries: Dict[str, Dict] = self._read()
+        self._dirty: set = set()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "credits_saved": 0}
+
+    def _read(self) -> Dict[str, Dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("emails", {}) or {}
+        except Exception as e:
+            logging.warning(f"Verification cache unreadable, starting fresh: {e}")
+            return {}
+
+    def _fresh(self, entry: Dict) -> bool:
+        ttl = timedelta(days=self.ttl_days.get(entry.get("classification"), DEFAULT_TTL_DAYS))
+        return datetime.utcnow() - datetime.fromisoformat(entry["verified_at"]) < ttl
+
+    def get(self, email: str) -> Optional[Dict]:
+        """Cached result (same shape as a live verification, plus cached/verified_at) or None."""
+        key = email.lower()
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or not self._fresh(entry):
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self.stats["credits_saved"] += 1
+        classification = entry["classification"]
+        return {
+            "email": email,
+            "is_valid": classification == "Deliverable",
+            "classification": classification,
+            "confidence": entry.get("confidence", 0.0),
+            "verified": True,
+            "status": entry.get("status", ""),
+            "cached": True,
+            "verified_at": entry["verified_at"],
+        }
+
+    def peek(self, email: str) -> Optional[str]:
+        """Fresh cached classification without counting a hit or miss (for planning)."""
+        with self._lock:
+            entry = self.entries.get(email.lower())
+            return entry["classification"] if entry is not None and self._fresh(entry) else None
+
+    def split(self, emails: List[str]) -> Tuple[Dict[str, Dict], List[str]]:
+        """({lowercased email: cached result}, addresses still to verify)."""
+        hits, misses = {}, []
+        for email in emails:
+            cached = self.get(email)
+            if cached is None:
+                misses.append(email)
+            else:
+                hits[email.lower()] = cached
+        return hits, misses
+
+    def put(self, result: Dict):
+        """Store a completed verification; failed or unverified results are ignored."""
+        email = (result.get("email") or "").lower()
+        if not email or not result.get("verified") or result.get("cached"):
+            return
+        with self._lock:
+            self.entries[email] = {
+                "classification": result.get("classification", "Unknown"),
+                "status": result.get("status", ""),
+                "confidence": result.get("confidence", 0.0),
+                "verified_at": datetime.utcnow().isoformat(),
+            }
+            self._dirty.add(email)
+
+    def put_many(self, results: Dict[str, Dict]):
+        for result in results.values():
+            self.put(result)
+
+    def save(self):
+        """Write atomically, keeping verifications other runs saved meanwhile (newest wins)."""
+        with _SAVE_LOCK:
+            on_disk = self._read()
+            with self._lock:
+                for key in self._dirty:
+                    mine, theirs = self.entries[key], on_disk.get(key)
+                    if theirs is None or theirs.get("verified_at", "") <= mine["verified_at"]:
+                        on_disk[key] = mine
+                self.entries = dict(on_disk)
+                self._dirty.clear()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"emails": on_disk}, f)
+            os.replace(tmp, self.path)
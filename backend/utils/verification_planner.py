@@ -0,0 +1,121 @@
+# backend/utils/verification_planner.py
+"""
+Credit-aware verification planner for ContactFinderAgent
+-----------------------------------------------------------
+- Estimates per company, before any credit is spent:
+    expected_credits: the employees' candidate addresses walked in rank order
+      (pattern-model posteriors), each paid only if nothing earlier was
+      deliverable; cached addresses cost nothing. Deferred companies add one
+      probe when their pre-check will need it (the planned tier is only
+      DNS-checked, so its budget has no probes).
+    p_verified: chance that at least one employee gets a deliverable
+      address (mailbox_prior x the share of patterns that will be tried).
+- Orders companies by expected value per credit (lead score x p_verified /
+  expected_credits) and plans them greedily while the expected spend fits
+  the remaining credit budget; the rest are deferred and only verified with
+  whatever is left afterwards. Without a known budget everything is planned
+  in value-per-credit order.
+- Dead / catch-all domains cost nothing (resolved by the pre-check).
+- plan() returns the ordered tiers and a report (also written to
+  outputs/verification_plan.json by the agent).
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+MAILBOX_PRIOR = 0.7            # chance a found employee has a mailbox on the guessed domain
+CONFIRMED_MAILBOX_PRIOR = 0.9  # ... once a pattern has been confirmed for the domain
+MIN_COST = 0.01                # keeps free (fully cached) companies at the front
+
+
+def mailbox_prior(patterns, domain: str) -> float:
+    if patterns is not None and patterns.confirmed_pattern(domain):
+        return CONFIRMED_MAILBOX_PRIOR
+    return MAILBOX_PRIOR
+
+
+def estimate_person(candidates: List[Tuple[str, float]], p_mailbox: float,
+                    cached: Callable[[str], Optional[str]] = lambda e: None) -> Tuple[float, float]:
+    """
+    candidates: (email, share) in the order they will be tried. Returns
+    (expected credits, P(a deliverable address is found)). `cached` gives the
+    cached classification of an address, or None.
+    """
+    live, ruled_out, found_cached = [], 0.0, False
+    for email, share in candidates:
+        classification = cached(email)
+        if classification == "Deliverable":
+            found_cached = True
+            break
+        if classification is None:
+            live.append(share)
+        else:
+            ruled_out += share  # known not to be the pattern
+    rest = max(1.0 - ruled_out, MIN_COST)
+    cost, p_found = 0.0, 0.0
+    for share in live:
+        cost += 1.0 - p_found  # paid only if nothing earlier was deliverable
+        p_found += p_mailbox * share / rest
+    return cost, 1.0 if found_cached else min(p_found, 1.0)
+
+
+def estimate_company(people: List[List[Tuple[str, float]]], p_mailbox: float,
+                     cached: Callable[[str], Optional[str]] = lambda e: None) -> Tuple[float, float]:
+    """Employees in verification order; the company stops at its first deliverable address."""
+    cost, p_none = 0.0, 1.0
+    for candidates in people:
+        person_cost, person_p = estimate_person(candidates, p_mailbox, cached)
+        cost += p_none * person_cost
+        p_none *= 1.0 - person_p
+    return cost, 1.0 - p_none
+
+
+class VerificationPlanner:
+    def __init__(self, cache=None):
+        self.cache = cache
+
+    def _cached(self, email: str) -> Optional[str]:
+        return self.cache.peek(email) if self.cache is not None else None
+
+    def plan(self, companies: List[Dict], budget: Optional[float]) -> Dict:
+        """
+        companies: {"company", "score", "people": [[(email, share), ...], ...],
+        "p_mailbox", "probe_cost", "skip"} in input order. Returns
+        {"tiers": [planned indices, deferred indices], "entries": [...], totals}.
+        """
+        entries = []
+        for i, c in enumerate(companies):
+            if c.get("skip"):
+                cost, p = 0.0, 0.0
+            else:
+                cost, p = estimate_company(c["people"], c["p_mailbox"], self._cached)
+            value = float(c.get("score") or 0.0) * p
+            entries.append({"index": i, "company": c["company"], "score": c.get("score"),
+                            "probe_cost": 0.0 if c.get("skip") else c.get("probe_cost", 0.0),
+                            "expected_credits": round(cost, 2), "p_verified": round(p, 3),
+                            "value_per_credit": round(value / max(cost, MIN_COST), 4)})
+
+        # stable: equal value per credit keeps the higher lead score, then the input order
+        ordered = sorted(entries, key=lambda e: (-e["value_per_credit"], -float(e["score"] or 0.0)))
+        planned, deferred, spend = [], [], 0.0
+        for e in ordered:
+            if budget is None or spend + e["expected_credits"] <= budget:
+                spend += e["expected_credits"]
+                e["tier"] = "planned"
+                planned.append(e)
+            else:
+                e["tier"] = "deferred"
+                e["expected_credits"] = round(e["expected_credits"] + e["probe_cost"], 2)
+                deferred.append(e)
+        for rank, e in enumerate(planned + deferred, start=1):
+            e["rank"] = rank
+
+        return {
+            "budget": budget,
+            "expected_credits": round(spend, 2),
+            "expected_verified": round(sum(e["p_verified"] for e in planned), 2),
+            "expected_score_verified": round(sum(float(e["score"] or 0.0) * e["p_verified"] for e in planned), 3),
+            "planned": len(planned),
+            "deferred": len(deferred),
+            "tiers": [[e["index"] for e in planned], [e["index"] for e in deferred]],
+            "entries": [{k: v for k, v in e.items() if k not in ("index", "probe_cost")} for e in planned + deferred],
+        }